@@ -0,0 +1,53 @@
+"""
+Chart Benchmarks for Money Talks
+
+Rendering with the Agg backend (no window), including indicator panes and
+downsampling of long histories.
+"""
+
+import importlib.util
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from harness import Skip, benchmark
+
+from utils.chart_helpers import plot_candlestick, plot_line, plot_with_indicator
+from utils.downsample import lttb_indices
+
+
+def _draw(plot, *args, **kwargs):
+    def run():
+        fig = plot(*args, **kwargs)
+        fig.canvas.draw()
+        plt.close(fig)
+    return run
+
+
+@benchmark
+def line(w):
+    return _draw(plot_line, w.frame)
+
+
+@benchmark
+def candlestick(w):
+    if importlib.util.find_spec("mplfinance") is None:
+        raise Skip("mplfinance not installed")
+    return _draw(plot_candlestick, w.frame.tail(250))
+
+
+@benchmark
+def rsi_chart(w):
+    return _draw(plot_with_indicator, w.frame, "rsi")
+
+
+@benchmark
+def bollinger_chart(w):
+    return _draw(plot_with_indicator, w.frame, "bb")
+
+
+@benchmark
+def lttb(w):
+    close = w.frame["Close"].to_numpy()
+    x = np.arange(len(close), dtype=np.float64)
+    return lambda: lttb_indices(x, close, 1000)
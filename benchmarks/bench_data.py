@@ -0,0 +1,44 @@
+"""
+Data Benchmarks for Money Talks
+
+fetch_multiple orchestration (against the in-memory stub provider),
+calculate_returns, Panel alignment and timeframe resampling.
+"""
+
+from harness import benchmark
+
+from utils.data_helpers import calculate_returns, fetch_multiple
+from utils.panel import Panel
+from utils.timeframes import resample_bars
+
+
+@benchmark
+def fetch_multiple_threads(w):
+    return lambda: fetch_multiple(w.symbols, w.period, w.interval, provider=w.provider)
+
+
+@benchmark
+def fetch_multiple_serial(w):
+    return lambda: fetch_multiple(w.symbols, w.period, w.interval, max_workers=1, provider=w.provider)
+
+
+@benchmark
+def returns_single(w):
+    return lambda: calculate_returns(w.frame)
+
+
+@benchmark
+def returns_universe(w):
+    frames = w.frames
+    return lambda: calculate_returns(frames, method="log")
+
+
+@benchmark
+def panel_from_frames(w):
+    frames = w.frames
+    return lambda: Panel.from_frames(frames)
+
+
+@benchmark
+def resample_weekly(w):
+    return lambda: resample_bars(w.frame, "1wk")
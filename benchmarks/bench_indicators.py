@@ -0,0 +1,56 @@
+"""
+Indicator Benchmarks for Money Talks
+
+The indicator math behind chart_helpers and the scanners, on one ticker
+and on the whole Panel at once, plus the streaming (bar-by-bar) versions.
+"""
+
+from harness import benchmark
+
+from utils import indicators, streaming
+
+
+@benchmark
+def chart_indicators(w):
+    close = w.frame["Close"]
+
+    def run():
+        indicators.sma(close, 20)
+        indicators.ema(close, 20)
+        indicators.bollinger_bands(close, 20, 2.0)
+        indicators.rsi(close, 14)
+    return run
+
+
+@benchmark
+def rsi_panel(w):
+    close = w.panel.close
+    return lambda: indicators.rsi(close)
+
+
+@benchmark
+def macd_panel(w):
+    close = w.panel.close
+    return lambda: indicators.macd(close)
+
+
+@benchmark
+def atr_adx_panel(w):
+    panel = w.panel
+    return lambda: (panel.atr(), panel.adx())
+
+
+@benchmark
+def snapshot(w):
+    return w.panel.snapshot
+
+
+@benchmark
+def streaming_rsi(w):
+    closes = w.frame["Close"].to_numpy().tolist()
+
+    def run():
+        rsi = streaming.RSI(14)
+        for price in closes:
+            rsi.update(price)
+    return run
@@ -0,0 +1,46 @@
+"""
+Scanner Benchmarks for Money Talks
+
+The notebook scanners over the whole universe: support/resistance,
+Fibonacci, swing detection, the declarative scans and rolling risk.
+"""
+
+from harness import benchmark
+
+from utils import patterns, risk, scanner
+
+
+@benchmark
+def swing_points(w):
+    return lambda: patterns.find_swing_points(w.frame)
+
+
+@benchmark
+def sr_scanner(w):
+    panel = w.panel
+    return lambda: patterns.sr_scanner(panel)
+
+
+@benchmark
+def fibonacci_scanner(w):
+    panel = w.panel
+    return lambda: patterns.fibonacci_scanner(panel)
+
+
+@benchmark
+def declarative_scans(w):
+    panel = w.panel
+    return lambda: scanner.run_scans(panel)
+
+
+@benchmark
+def rolling_risk(w):
+    close = w.panel.close
+    benchmark_close = close.iloc[:, 0]
+
+    def run():
+        returns = risk.returns(close)
+        risk.rolling_volatility(returns, 21)
+        risk.rolling_beta(returns, risk.returns(benchmark_close), 63)
+        risk.drawdown(close)
+    return run
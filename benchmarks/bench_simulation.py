@@ -0,0 +1,55 @@
+"""
+Simulation Benchmarks for Money Talks
+
+Vectorized backtests, Monte Carlo projections, option pricing, unpaced
+market replay and order book matching.
+"""
+
+import asyncio
+
+import numpy as np
+
+from harness import benchmark
+
+from utils import indicators, montecarlo, options, orderbook
+from utils.replay import Replay
+from utils.backtest import backtest_signals
+
+
+@benchmark
+def backtest_crossover(w):
+    close = w.panel.close
+    fast, slow = indicators.ema(close, 20), indicators.sma(close, 50)
+    return lambda: backtest_signals(close, fast > slow, fast < slow).stats()
+
+
+@benchmark
+def monte_carlo_retirement(w):
+    return lambda: montecarlo.simulate_wealth(
+        initial=500_000, years=30, withdrawal=20_000, start_age=60, rmd=True,
+        n_paths=20_000, seed=1,
+    ).summary()
+
+
+@benchmark
+def implied_vol_surface(w):
+    strikes = np.linspace(50, 150, 101)
+    expiries = np.linspace(0.05, 2.0, 40)[:, None]
+    prices = options.black_scholes(100.0, strikes, expiries, sigma=0.3)
+    return lambda: options.implied_volatility(prices, 100.0, strikes, expiries)
+
+
+@benchmark
+def market_replay(w):
+    panel = w.panel
+
+    def run():
+        replay = Replay(panel, speed=None)
+        return asyncio.run(replay.run(len))
+    return run
+
+
+@benchmark
+def order_book_events(w):
+    events = orderbook.generate_order_flow(50_000 * w.tickers // 20, seed=w.seed)
+    return lambda: orderbook.OrderBook().process(events)
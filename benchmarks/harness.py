@@ -0,0 +1,238 @@
+"""
+Benchmark Harness for Money Talks
+
+Provides the pieces shared by the ``bench_*.py`` modules and ``run.py``:
+
+- Workload: seeded synthetic OHLCV for N tickers at any period/interval,
+  built once and reused by every benchmark (never timed)
+- StubProvider: serves those frames from memory, so fetch benchmarks
+  measure our code, not a network, and the suite runs fully offline
+- @benchmark: registers a function ``setup(workload) -> run`` where only
+  the returned zero-argument ``run`` is timed
+- measure / compare: best-of-N wall time, tracemalloc peak memory, and a
+  comparison against a stored JSON baseline
+"""
+
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from functools import cached_property
+from pathlib import Path
+from typing import Callable, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import pandas as pd  # noqa: E402
+
+from utils.panel import Panel  # noqa: E402
+from utils.providers import DataProvider, SyntheticProvider  # noqa: E402
+
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+# name -> (tickers, period, interval)
+PRESETS = {
+    "small": (20, "1y", "1d"),
+    "medium": (100, "5y", "1d"),
+    "large": (500, "10y", "1d"),
+    "intraday": (20, "1mo", "1m"),
+}
+
+# Differences below these are noise, whatever the percentage
+MIN_TIME_DELTA = 0.002
+MIN_MEMORY_DELTA_MB = 1.0
+
+
+# ----------------------------------------------------------------------
+# Data
+# ----------------------------------------------------------------------
+
+
+class StubProvider(DataProvider):
+    """In-memory provider returning prebuilt frames (no network, no disk)."""
+
+    name = "stub"
+
+    def __init__(self, frames: dict[str, pd.DataFrame]):
+        self.frames = frames
+
+    def history(self, ticker, interval="1d", period=None, start=None) -> pd.DataFrame:
+        return self.frames[ticker]
+
+
+@dataclass
+class Workload:
+    """Seeded synthetic market data of a configurable size."""
+    tickers: int = 20
+    period: str = "1y"
+    interval: str = "1d"
+    seed: int = 42
+
+    @property
+    def key(self) -> str:
+        """Baseline file name for this size."""
+        return f"{self.tickers}x{self.period}x{self.interval}"
+
+    @cached_property
+    def symbols(self) -> list[str]:
+        return [f"T{i:03d}" for i in range(self.tickers)]
+
+    @cached_property
+    def frames(self) -> dict[str, pd.DataFrame]:
+        """Ticker -> OHLCV DataFrame, as returned by fetch_multiple."""
+        source = SyntheticProvider(seed=self.seed, model="jump")
+        return {t: source.history(t, self.interval, period=self.period) for t in self.symbols}
+
+    @cached_property
+    def frame(self) -> pd.DataFrame:
+        """The first ticker's OHLCV DataFrame."""
+        return self.frames[self.symbols[0]]
+
+    @cached_property
+    def panel(self) -> Panel:
+        return Panel.from_frames(self.frames)
+
+    @cached_property
+    def provider(self) -> StubProvider:
+        return StubProvider(self.frames)
+
+    def describe(self) -> str:
+        bars = len(self.frame)
+        return f"{self.tickers} tickers x {bars:,} {self.interval} bars ({self.period})"
+
+
+# ----------------------------------------------------------------------
+# Registry and measurement
+# ----------------------------------------------------------------------
+
+
+BENCHMARKS: dict[str, Callable[[Workload], Callable[[], object]]] = {}
+
+
+class Skip(Exception):
+    """Raised by a benchmark's setup when it cannot run here (e.g. optional package missing)."""
+
+
+def benchmark(fn: Callable[[Workload], Callable[[], object]]):
+    """
+    Register a benchmark.
+
+    The decorated function receives the Workload, does any setup, and
+    returns the zero-argument callable to time. It is registered as
+    ``<module>.<function>`` with the ``bench_`` prefix dropped.
+
+    Example:
+        >>> @benchmark
+        ... def rsi_panel(w):
+        ...     close = w.panel.close
+        ...     return lambda: rsi(close)
+    """
+    module = fn.__module__.rsplit(".", 1)[-1].removeprefix("bench_")
+    BENCHMARKS[f"{module}.{fn.__name__}"] = fn
+    return fn
+
+
+@dataclass
+class Result:
+    """Timing and memory of one benchmark."""
+    time: float
+    median: float
+    peak_mb: float
+    runs: int = 0
+
+
+def measure(setup: Callable, workload: Workload, repeat: int = 5) -> Result:
+    """
+    Time a benchmark and record its peak traced memory.
+
+    One warm-up call fills lazy caches; then `repeat` timed calls (fastest
+    and median kept) and one more under tracemalloc, which slows Python
+    code too much to time in the same pass.
+    """
+    run = setup(workload)
+    run()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return Result(min(times), statistics.median(times), peak / 2**20, repeat)
+
+
+# ----------------------------------------------------------------------
+# Baselines
+# ----------------------------------------------------------------------
+
+
+def baseline_path(workload: Workload, directory: Path = BASELINE_DIR) -> Path:
+    return directory / f"{workload.key}.json"
+
+
+def load_baseline(workload: Workload, directory: Path = BASELINE_DIR) -> dict[str, Result]:
+    """Stored results for this workload size ({} if none saved yet)."""
+    path = baseline_path(workload, directory)
+    if not path.exists():
+        return {}
+    stored = json.loads(path.read_text())
+    return {name: Result(**values) for name, values in stored["results"].items()}
+
+
+def save_baseline(
+    workload: Workload,
+    results: dict[str, Result],
+    directory: Path = BASELINE_DIR,
+) -> Path:
+    """Merge results into this workload's baseline file."""
+    path = baseline_path(workload, directory)
+    merged = {name: asdict(r) for name, r in load_baseline(workload, directory).items()}
+    merged.update({name: asdict(r) for name, r in results.items()})
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "workload": asdict(workload),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": dict(sorted(merged.items())),
+    }, indent=2) + "\n")
+    return path
+
+
+def compare(
+    result: Result,
+    base: Optional[Result],
+    tolerance: float = 0.25,
+    memory_tolerance: float = 0.25,
+) -> list[str]:
+    """
+    Regressions of a result against its baseline.
+
+    Returns:
+        List of problems ("time +40%", "memory +12.0MB"); empty if ok
+    """
+    if base is None:
+        return []
+    problems = []
+    if result.time > base.time * (1 + tolerance) and result.time - base.time > MIN_TIME_DELTA:
+        problems.append(f"time {result.time / base.time - 1:+.0%}")
+    grew = result.peak_mb - base.peak_mb
+    if result.peak_mb > base.peak_mb * (1 + memory_tolerance) and grew > MIN_MEMORY_DELTA_MB:
+        problems.append(f"memory {grew:+.1f}MB")
+    return problems
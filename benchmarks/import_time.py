@@ -0,0 +1,91 @@
+"""
+Import-Time Benchmark for Money Talks
+
+Checks that ``import utils`` stays cheap. Each scenario runs in a fresh
+interpreter (cold imports, like a new notebook kernel) several times and
+the fastest run is compared against a time budget. Scenarios also list
+heavy modules that must NOT be loaded by that import.
+
+Usage:
+    python benchmarks/import_time.py            # exit code 1 on regression
+    python benchmarks/import_time.py --repeat 10 --scale 2.0
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY = ["numpy", "pandas", "matplotlib", "yfinance", "mplfinance"]
+
+# name -> (statement, budget in seconds, modules that must stay unloaded)
+SCENARIOS = {
+    "import utils": ("import utils", 0.05, HEAVY),
+    "quiz only": ("from utils import Quiz", 0.05, HEAVY),
+    "streaming indicators": ("from utils.streaming import RSI", 0.05, HEAVY),
+    "data helpers": ("from utils import fetch_stock_data", 2.0, ["matplotlib", "yfinance", "mplfinance"]),
+}
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+def measure(statement: str, repeat: int = 5) -> tuple[float, set[str]]:
+    """
+    Time a statement in fresh interpreters.
+
+    Returns:
+        Tuple of (fastest elapsed seconds, top-level modules loaded)
+    """
+    best = float("inf")
+    modules: set[str] = set()
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(statement=statement)],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        result = json.loads(out.stdout.strip().splitlines()[-1])
+        best = min(best, result["elapsed"])
+        modules = {m.split(".")[0] for m in result["modules"]}
+    return best, modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per scenario (fastest wins)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget, for slow machines")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'Scenario':<22} {'Time':>10} {'Budget':>10}  Result")
+    print("-" * 60)
+    for name, (statement, budget, forbidden) in SCENARIOS.items():
+        elapsed, modules = measure(statement, args.repeat)
+        budget *= args.scale
+        loaded = [m for m in forbidden if m in modules]
+        problems = []
+        if elapsed > budget:
+            problems.append("over budget")
+        if loaded:
+            problems.append(f"loaded {', '.join(loaded)}")
+        print(f"{name:<22} {elapsed * 1000:>8.1f}ms {budget * 1000:>8.0f}ms  {'; '.join(problems) or 'ok'}")
+        if problems:
+            failures.append(name)
+
+    if failures:
+        print(f"\nImport-time regression in: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Benchmark Runner for Money Talks
+
+Times every ``bench_*.py`` benchmark on seeded synthetic data (no network)
+and compares time and peak memory with the saved baseline for the same
+workload size. Exits with code 1 on a regression, like import_time.py.
+
+Usage:
+    python benchmarks/run.py                       # small preset, compare
+    python benchmarks/run.py --save                # record a new baseline
+    python benchmarks/run.py --preset large -k scanners
+    python benchmarks/run.py --tickers 500 --period 2y --interval 1d
+    python benchmarks/run.py --preset intraday --imports --json out.json
+"""
+
+import argparse
+import importlib
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+from harness import (
+    BASELINE_DIR, BENCHMARKS, PRESETS, Result, Skip, Workload,
+    compare, load_baseline, measure, save_baseline,
+)
+
+
+HERE = Path(__file__).resolve().parent
+
+
+def discover() -> None:
+    """Import every bench_*.py so their @benchmark functions register."""
+    for path in sorted(HERE.glob("bench_*.py")):
+        importlib.import_module(path.stem)
+
+
+def run_imports(repeat: int, scale: float) -> list[str]:
+    """Run the import-time scenarios from import_time.py; returns failures."""
+    from import_time import SCENARIOS, measure as measure_import
+
+    failures = []
+    print(f"\n{'Import scenario':<34} {'Time':>10} {'Budget':>10}  Result")
+    print("-" * 70)
+    for name, (statement, budget, forbidden) in SCENARIOS.items():
+        elapsed, modules = measure_import(statement, repeat)
+        budget *= scale
+        loaded = [m for m in forbidden if m in modules]
+        problems = (["over budget"] if elapsed > budget else []) + (
+            [f"loaded {', '.join(loaded)}"] if loaded else []
+        )
+        print(f"{name:<34} {elapsed * 1000:>8.1f}ms {budget * 1000:>8.0f}ms  {'; '.join(problems) or 'ok'}")
+        if problems:
+            failures.append(f"imports.{name}")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--preset", choices=PRESETS, default="small", help="workload size")
+    parser.add_argument("--tickers", type=int, help="override the preset's ticker count (1-500)")
+    parser.add_argument("--period", help="override the preset's period (1mo, 1y, 10y, ...)")
+    parser.add_argument("--interval", help="override the preset's bar interval (1m ... 1d)")
+    parser.add_argument("--seed", type=int, default=42, help="synthetic data seed")
+    parser.add_argument("-k", "--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per benchmark (fastest wins)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.25, help="allowed peak-memory growth")
+    parser.add_argument("--save", action="store_true", help="write results as the new baseline")
+    parser.add_argument("--baseline-dir", type=Path, default=BASELINE_DIR, help="where baselines live")
+    parser.add_argument("--json", type=Path, help="also write results to this file")
+    parser.add_argument("--imports", action="store_true", help="also run the import-time scenarios")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply import-time budgets")
+    args = parser.parse_args()
+
+    tickers, period, interval = PRESETS[args.preset]
+    workload = Workload(
+        tickers=args.tickers or tickers,
+        period=args.period or period,
+        interval=args.interval or interval,
+        seed=args.seed,
+    )
+    if not 1 <= workload.tickers <= 500:
+        parser.error("--tickers must be between 1 and 500")
+
+    discover()
+    selected = {name: fn for name, fn in BENCHMARKS.items() if args.filter in name}
+    baseline = {} if args.save else load_baseline(workload, args.baseline_dir)
+
+    print(f"Workload: {workload.describe()}, seed {workload.seed}")
+    if not baseline and not args.save:
+        print(f"No baseline for {workload.key} yet; run with --save to record one")
+    print(f"\n{'Benchmark':<34} {'Time':>10} {'Baseline':>10} {'Peak':>9} {'Baseline':>9}  Result")
+    print("-" * 90)
+
+    results: dict[str, Result] = {}
+    failures = []
+    for name, setup in selected.items():
+        try:
+            result = measure(setup, workload, args.repeat)
+        except Skip as reason:
+            print(f"{name:<34} {'':>41}  skipped ({reason})")
+            continue
+        results[name] = result
+        base = baseline.get(name)
+        problems = compare(result, base, args.tolerance, args.memory_tolerance)
+        base_time = f"{base.time * 1000:>8.1f}ms" if base else f"{'-':>10}"
+        base_peak = f"{base.peak_mb:>7.1f}MB" if base else f"{'-':>9}"
+        status = "; ".join(problems) or ("ok" if base else "new")
+        print(f"{name:<34} {result.time * 1000:>8.1f}ms {base_time} {result.peak_mb:>7.1f}MB {base_peak}  {status}")
+        if problems:
+            failures.append(name)
+
+    if args.imports:
+        failures += run_imports(args.repeat, args.scale)
+
+    if args.save:
+        print(f"\nBaseline saved to {save_baseline(workload, results, args.baseline_dir)}")
+    if args.json:
+        args.json.write_text(json.dumps({
+            "workload": asdict(workload),
+            "results": {name: asdict(r) for name, r in results.items()},
+            "regressions": failures,
+        }, indent=2) + "\n")
+
+    if failures:
+        print(f"\nPerformance regression in: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
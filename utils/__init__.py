@@ -5,41 +5,118 @@ Provides helper functions for:
 - data_helpers: Fetching and processing market data
 - chart_helpers: Standardized visualizations
 - quiz_helpers: Interactive quiz widgets
+- cache: On-disk price history cache used by fetch_stock_data
+- providers: Pluggable data sources (yfinance, local files, synthetic)
+- indicators: Vectorized technical indicators (SMA, EMA, RSI, MACD, ADX, ...)
+- panel: Aligned dates x tickers matrices for universe-wide indicators
+- streaming: O(1)-per-bar indicators for live and intraday updates
+- backtest: Vectorized and event-driven strategy backtesting
+- optimize: Parallel parameter sweeps and walk-forward optimization
+- portfolio: Mean-variance portfolio optimization and efficient frontiers
+- taxlots: Tax-lot ledger with FIFO/LIFO/HIFO/SpecID matching and wash sales
+- downsample: Chart decimation (min/max, LTTB) and OHLC bar resampling
+- render: Headless batch chart rendering with reusable figure templates
+- reference: Cached ticker reference data (sectors, market-cap tiers, fundamentals)
+- store: Memory-mapped columnar store for long daily and intraday histories
+- risk: Panel returns, rolling volatility, drawdowns, Sharpe/Sortino, beta and correlation
+- montecarlo: Vectorized Monte Carlo projections for wealth, retirement accounts and rebalancing
+- options: Black-Scholes pricing, Greeks, implied volatility and multi-leg payoffs
+- timeframes: Session-aligned 15m/1h/1d/1wk bars derived from one cached base series
+- patterns: Linear-time swing points, S/R zones, Fibonacci levels, trendlines and divergences
+- profiling: Opt-in timing of fetch, returns and chart calls; summary table and Chrome trace export
+- scanner: Declarative universe scans with shared, cost-ordered indicator computation
+- replay: Async replay of stored bars at real-time or accelerated speed with backpressure
+- orderbook: Price-time priority order book, synthetic order flow and market-impact execution simulator
+
+Submodules and the helpers listed in __all__ are imported on first use, so
+``import utils`` does not pay for pandas, matplotlib or yfinance until they
+are needed.
 """
 
-from .data_helpers import (
-    get_sp500_tickers,
-    fetch_stock_data,
-    fetch_multiple,
-    calculate_returns,
-)
-
-from .chart_helpers import (
-    plot_candlestick,
-    plot_line,
-    plot_with_volume,
-    plot_with_indicator,
-)
-
-from .quiz_helpers import (
-    multiple_choice,
-    true_false,
-    Quiz,
-)
-
-__all__ = [
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .data_helpers import (
+        get_sp500_tickers,
+        fetch_stock_data,
+        fetch_multiple,
+        calculate_returns,
+    )
+    from .chart_helpers import (
+        plot_candlestick,
+        plot_line,
+        plot_with_volume,
+        plot_with_indicator,
+    )
+    from .quiz_helpers import (
+        multiple_choice,
+        true_false,
+        Quiz,
+    )
+
+# Public name -> submodule that defines it
+_LAZY_ATTRS = {
     # Data helpers
-    "get_sp500_tickers",
-    "fetch_stock_data",
-    "fetch_multiple",
-    "calculate_returns",
+    "get_sp500_tickers": "data_helpers",
+    "fetch_stock_data": "data_helpers",
+    "fetch_multiple": "data_helpers",
+    "calculate_returns": "data_helpers",
     # Chart helpers
-    "plot_candlestick",
-    "plot_line",
-    "plot_with_volume",
-    "plot_with_indicator",
+    "plot_candlestick": "chart_helpers",
+    "plot_line": "chart_helpers",
+    "plot_with_volume": "chart_helpers",
+    "plot_with_indicator": "chart_helpers",
     # Quiz helpers
-    "multiple_choice",
-    "true_false",
-    "Quiz",
-]
+    "multiple_choice": "quiz_helpers",
+    "true_false": "quiz_helpers",
+    "Quiz": "quiz_helpers",
+}
+
+_SUBMODULES = {
+    "data_helpers",
+    "chart_helpers",
+    "quiz_helpers",
+    "cache",
+    "providers",
+    "indicators",
+    "panel",
+    "streaming",
+    "backtest",
+    "optimize",
+    "portfolio",
+    "taxlots",
+    "downsample",
+    "render",
+    "reference",
+    "store",
+    "risk",
+    "montecarlo",
+    "options",
+    "timeframes",
+    "patterns",
+    "profiling",
+    "scanner",
+    "replay",
+    "orderbook",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name: str):
+    """Import submodules and helper functions on first access (PEP 562)."""
+    if name in _LAZY_ATTRS:
+        module = importlib.import_module(f".{_LAZY_ATTRS[name]}", __name__)
+        value = getattr(module, name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Cache so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRS) | _SUBMODULES)
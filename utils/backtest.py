@@ -0,0 +1,594 @@
+"""
+Backtesting Helpers for Money Talks
+
+Provides a reusable backtesting engine for the class 3 strategies, with two modes:
+
+- Vectorized: turn entry/exit signals into positions and compute equity
+  curves and trade logs with array math. Works on one ticker or a whole
+  (dates x tickers) panel at once, so it's the mode to use for sweeps.
+- Event-driven: step through bars, let a strategy submit market, limit,
+  stop and trailing-stop orders, and simulate fills with slippage and
+  commissions.
+
+Both return a BacktestResult with the equity curve, trade log and summary stats.
+
+Conventions: signals are decided on a bar's close and acted on from the next
+bar; slippage and commission are fractions of traded value (0.001 = 0.1%).
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+# ----------------------------------------------------------------------
+# Results
+# ----------------------------------------------------------------------
+
+
+class BacktestResult:
+    """
+    Output of a backtest.
+
+    Attributes:
+        equity: Account value per bar (Series, or DataFrame with one column per ticker)
+        returns: Per-bar returns of the equity curve
+        positions: Position held over each bar
+        trades: DataFrame trade log
+    """
+
+    def __init__(
+        self,
+        equity: Union[pd.Series, pd.DataFrame],
+        positions: Union[pd.Series, pd.DataFrame],
+        trades: pd.DataFrame,
+        periods_per_year: int = 252,
+    ):
+        self.equity = equity
+        self.positions = positions
+        self.trades = trades
+        self.periods_per_year = periods_per_year
+        self.returns = equity.pct_change(fill_method=None).fillna(0.0)
+
+    def stats(self) -> Union[pd.Series, pd.DataFrame]:
+        """
+        Summary statistics.
+
+        Returns:
+            Series (one ticker/portfolio) or DataFrame (one row per ticker) with
+            Total Return %, CAGR %, Volatility %, Sharpe, Max Drawdown %,
+            Trades and Win Rate %
+        """
+        equity = self.equity if isinstance(self.equity, pd.DataFrame) else self.equity.to_frame("Strategy")
+        returns = self.returns if isinstance(self.returns, pd.DataFrame) else self.returns.to_frame("Strategy")
+
+        values = equity.to_numpy(dtype=float)
+        first = np.array([col[~np.isnan(col)][0] if (~np.isnan(col)).any() else np.nan for col in values.T])
+        last = np.array([col[~np.isnan(col)][-1] if (~np.isnan(col)).any() else np.nan for col in values.T])
+        years = len(equity) / self.periods_per_year
+
+        mean = returns.mean().to_numpy()
+        std = returns.std().to_numpy()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = mean / std * math.sqrt(self.periods_per_year)
+            drawdown = (values / np.fmax.accumulate(values, axis=0) - 1).min(axis=0)
+            cagr = (last / first) ** (1 / years) - 1 if years > 0 else np.full_like(last, np.nan)
+
+        table = pd.DataFrame(
+            {
+                "Total Return %": (last / first - 1) * 100,
+                "CAGR %": cagr * 100,
+                "Volatility %": std * math.sqrt(self.periods_per_year) * 100,
+                "Sharpe": sharpe,
+                "Max Drawdown %": np.nan_to_num(drawdown) * 100,
+            },
+            index=equity.columns,
+        )
+
+        trades = self.trades
+        per_ticker = isinstance(self.equity, pd.DataFrame) and "Ticker" in trades
+        if per_ticker and "Return %" in trades and len(trades):
+            grouped = trades.groupby("Ticker")["Return %"]
+            table["Trades"] = grouped.size().reindex(table.index).fillna(0).astype(int)
+            table["Win Rate %"] = (grouped.apply(lambda r: (r > 0).mean() * 100)).reindex(table.index)
+        elif "Return %" in trades and len(trades):
+            table["Trades"] = len(trades)
+            table["Win Rate %"] = (trades["Return %"] > 0).mean() * 100
+        else:
+            table["Trades"] = 0
+            table["Win Rate %"] = np.nan
+
+        return table.iloc[0] if not isinstance(self.equity, pd.DataFrame) else table
+
+    def __repr__(self) -> str:
+        return f"BacktestResult({len(self.equity)} bars, {len(self.trades)} trades)"
+
+
+# ----------------------------------------------------------------------
+# Vectorized mode
+# ----------------------------------------------------------------------
+
+
+def signals_to_positions(
+    entries: Union[pd.Series, pd.DataFrame, np.ndarray],
+    exits: Union[pd.Series, pd.DataFrame, np.ndarray],
+    size: float = 1.0,
+) -> Union[pd.Series, pd.DataFrame, np.ndarray]:
+    """
+    Convert boolean entry/exit signals into a held position, without a loop.
+
+    A position of `size` is opened on an entry and held until the next exit
+    (exits win when both fire on the same bar).
+
+    Example:
+        >>> entries = (rsi > 30) & (rsi.shift(1) <= 30)
+        >>> exits = (rsi < 70) & (rsi.shift(1) >= 70)
+        >>> position = signals_to_positions(entries, exits)
+    """
+    entry = np.asarray(entries, dtype=bool)
+    exit_ = np.asarray(exits, dtype=bool)
+    marks = np.where(exit_, 0.0, np.where(entry, size, np.nan))
+    held = pd.DataFrame(marks if marks.ndim == 2 else marks[:, None]).ffill().fillna(0.0).to_numpy()
+    held = held if marks.ndim == 2 else held[:, 0]
+
+    if isinstance(entries, pd.DataFrame):
+        return pd.DataFrame(held, index=entries.index, columns=entries.columns)
+    if isinstance(entries, pd.Series):
+        return pd.Series(held, index=entries.index)
+    return held
+
+
+def _trade_log(
+    prices: np.ndarray,
+    positions: np.ndarray,
+    costs: float,
+    index: pd.Index,
+    tickers: list,
+) -> pd.DataFrame:
+    """Build a trade log from runs of constant non-zero position in each column."""
+    prev = np.vstack([np.zeros((1, positions.shape[1])), positions[:-1]])
+    changed = positions != prev
+
+    records = []
+    for col in np.flatnonzero(changed.any(axis=0)):
+        # Each change closes the previous run and may open a new one; a run
+        # still open at the end is marked to the last close
+        bounds = np.append(np.flatnonzero(changed[:, col]), len(positions) - 1)
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            size = positions[start, col]
+            if size == 0 or end <= start:
+                continue
+            entry, exit_ = prices[start, col], prices[end, col]
+            gross = size * (exit_ / entry - 1)
+            records.append(
+                (tickers[col], index[start], index[end], size, entry, exit_,
+                 (gross - 2 * abs(size) * costs) * 100, end - start)
+            )
+
+    return pd.DataFrame(
+        records,
+        columns=["Ticker", "Entry Date", "Exit Date", "Size", "Entry", "Exit", "Return %", "Bars"],
+    )
+
+
+def backtest_positions(
+    prices: Union[pd.Series, pd.DataFrame],
+    positions: Union[pd.Series, pd.DataFrame],
+    initial_capital: float = 10_000.0,
+    commission: float = 0.0,
+    slippage: float = 0.0,
+    periods_per_year: int = 252,
+) -> BacktestResult:
+    """
+    Backtest target positions with vectorized math.
+
+    Args:
+        prices: Close prices (Series, or dates x tickers DataFrame)
+        positions: Fraction of capital held long (1), flat (0) or short (-1),
+            decided at each bar's close; same shape as prices
+        initial_capital: Starting capital per ticker
+        commission: Commission as a fraction of traded value
+        slippage: Slippage as a fraction of traded value
+        periods_per_year: Bars per year, for annualized stats
+
+    Returns:
+        BacktestResult (one equity column per ticker for DataFrame input)
+
+    Example:
+        >>> position = signals_to_positions(entries, exits)
+        >>> result = backtest_positions(df["Close"], position, commission=0.001)
+        >>> print(result.stats())
+    """
+    single = isinstance(prices, pd.Series)
+    price_frame = prices.to_frame() if single else prices
+    pos_frame = positions.to_frame() if isinstance(positions, pd.Series) else positions
+
+    p = price_frame.to_numpy(dtype=float)
+    pos = np.nan_to_num(np.asarray(pos_frame, dtype=float))
+    if pos.shape != p.shape:
+        raise ValueError(f"positions shape {pos.shape} does not match prices shape {p.shape}")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bar_returns = np.nan_to_num(p[1:] / p[:-1] - 1)
+    held = pos[:-1]  # position decided at the previous close
+    turnover = np.abs(np.diff(pos, axis=0, prepend=0.0))[:-1]
+    strategy = held * bar_returns - turnover * (commission + slippage)
+
+    growth = np.vstack([np.ones((1, p.shape[1])), np.cumprod(1 + strategy, axis=0)])
+    equity = pd.DataFrame(growth * initial_capital, index=price_frame.index, columns=price_frame.columns)
+    held_frame = pd.DataFrame(pos, index=price_frame.index, columns=price_frame.columns)
+
+    trades = _trade_log(p, pos, commission + slippage, price_frame.index, list(price_frame.columns))
+
+    if single:
+        name = prices.name if prices.name is not None else "Strategy"
+        equity = equity.iloc[:, 0].rename(name)
+        held_frame = held_frame.iloc[:, 0].rename(name)
+        trades["Ticker"] = name
+    return BacktestResult(equity, held_frame, trades, periods_per_year)
+
+
+def backtest_signals(
+    prices: Union[pd.Series, pd.DataFrame],
+    entries,
+    exits,
+    **kwargs,
+) -> BacktestResult:
+    """
+    Shortcut for backtest_positions(prices, signals_to_positions(entries, exits)).
+
+    Example:
+        >>> close = panel.close                      # 500 tickers x 10 years
+        >>> fast, slow = ema(close, 20), sma(close, 50)
+        >>> result = backtest_signals(close, fast > slow, fast < slow)
+        >>> result.stats().sort_values("Sharpe").tail()
+    """
+    return backtest_positions(prices, signals_to_positions(entries, exits), **kwargs)
+
+
+# ----------------------------------------------------------------------
+# Event-driven mode
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class Order:
+    """An order waiting to be filled. Positive quantity buys, negative sells."""
+
+    ticker: str
+    quantity: int
+    kind: str = "market"  # market, limit, stop, trailing_stop
+    limit: Optional[float] = None
+    stop: Optional[float] = None
+    trail_pct: Optional[float] = None
+    high_water: Optional[float] = None
+    id: int = 0
+
+
+@dataclass
+class Fill:
+    """An executed trade; pnl is the realized gain before commission."""
+
+    date: pd.Timestamp
+    ticker: str
+    quantity: int
+    price: float
+    commission: float
+    pnl: float = 0.0
+
+
+class Bars:
+    """
+    Read-only view of the current bar and history, with no look-ahead.
+
+    Example:
+        >>> bars.close("AAPL")                 # today's close
+        >>> bars.history("AAPL", "Close", 20)  # last 20 closes, ending today
+    """
+
+    def __init__(self, arrays: dict[str, np.ndarray], tickers: dict[str, int], row: int, date):
+        self._arrays = arrays
+        self._tickers = tickers
+        self.row = row
+        self.date = date
+
+    @property
+    def tickers(self) -> list[str]:
+        return list(self._tickers)
+
+    def get(self, ticker: str, field: str = "Close") -> float:
+        return float(self._arrays[field][self.row, self._tickers[ticker]])
+
+    def close(self, ticker: str) -> float:
+        return self.get(ticker, "Close")
+
+    def history(self, ticker: str, field: str = "Close", n: Optional[int] = None) -> np.ndarray:
+        start = 0 if n is None else max(0, self.row + 1 - n)
+        return self._arrays[field][start:self.row + 1, self._tickers[ticker]]
+
+    def __getitem__(self, ticker: str) -> dict:
+        col = self._tickers[ticker]
+        return {f: float(a[self.row, col]) for f, a in self._arrays.items()}
+
+
+class Broker:
+    """
+    Account state and order entry available to strategies.
+
+    Orders submitted during a bar are filled from the next bar onward.
+    """
+
+    def __init__(self, cash: float, commission: float, slippage: float, allow_short: bool):
+        self.cash = cash
+        self.commission = commission
+        self.slippage = slippage
+        self.allow_short = allow_short
+        self.positions: dict[str, int] = {}
+        self.avg_cost: dict[str, float] = {}
+        self.orders: list[Order] = []
+        self.fills: list[Fill] = []
+        self.rejected: list[Order] = []
+        self._next_id = 1
+        self._equity = cash
+
+    # Order entry
+
+    def submit(self, order: Order) -> Order:
+        order.id = self._next_id
+        self._next_id += 1
+        self.orders.append(order)
+        return order
+
+    def buy(self, ticker: str, quantity: int, limit: Optional[float] = None,
+            stop: Optional[float] = None) -> Order:
+        """Buy shares at market, or with a limit/stop price."""
+        kind = "limit" if limit is not None else "stop" if stop is not None else "market"
+        return self.submit(Order(ticker, int(quantity), kind, limit=limit, stop=stop))
+
+    def sell(self, ticker: str, quantity: int, limit: Optional[float] = None,
+             stop: Optional[float] = None) -> Order:
+        """Sell shares at market, or with a limit/stop price."""
+        kind = "limit" if limit is not None else "stop" if stop is not None else "market"
+        return self.submit(Order(ticker, -int(quantity), kind, limit=limit, stop=stop))
+
+    def trailing_stop(self, ticker: str, quantity: int, trail_pct: float, reference: float) -> Order:
+        """Sell `quantity` shares if price falls trail_pct below its high since submission."""
+        return self.submit(Order(ticker, -int(quantity), "trailing_stop",
+                                 trail_pct=trail_pct, high_water=reference))
+
+    def order_target_percent(self, ticker: str, percent: float, price: float) -> Optional[Order]:
+        """Buy or sell at market to make the position `percent` of current equity."""
+        target = int(self._equity * percent / price)
+        delta = target - self.position(ticker)
+        if delta == 0:
+            return None
+        return self.submit(Order(ticker, delta))
+
+    def cancel(self, ticker: Optional[str] = None) -> None:
+        """Cancel open orders (for one ticker, or all)."""
+        self.orders = [o for o in self.orders if ticker is not None and o.ticker != ticker]
+
+    # Account state
+
+    def position(self, ticker: str) -> int:
+        return self.positions.get(ticker, 0)
+
+    @property
+    def equity(self) -> float:
+        """Account value at the last close."""
+        return self._equity
+
+    # Simulation internals
+
+    def _execute(self, order: Order, price: float, date) -> None:
+        qty = order.quantity
+        held = self.position(order.ticker)
+        if qty < 0 and not self.allow_short:
+            qty = -min(-qty, max(held, 0))
+        if qty > 0:
+            price *= 1 + self.slippage
+            affordable = int(self.cash / (price * (1 + self.commission)))
+            qty = min(qty, affordable)
+        else:
+            price *= 1 - self.slippage
+        if qty == 0:
+            self.rejected.append(order)
+            return
+
+        fee = abs(qty) * price * self.commission
+        self.cash -= qty * price + fee
+
+        pnl = 0.0
+        avg = self.avg_cost.get(order.ticker, 0.0)
+        new = held + qty
+        if held != 0 and np.sign(qty) != np.sign(held):
+            closed = min(abs(qty), abs(held))
+            pnl = closed * (price - avg) * np.sign(held)
+            if new != 0 and np.sign(new) != np.sign(held):
+                avg = price  # flipped through zero
+        elif new != 0:
+            avg = (avg * held + price * qty) / new
+        self.positions[order.ticker] = new
+        self.avg_cost[order.ticker] = avg if new != 0 else 0.0
+        self.fills.append(Fill(date, order.ticker, qty, price, fee, pnl))
+
+    def _process(self, bars: Bars) -> None:
+        """Try to fill each open order against the current bar."""
+        remaining = []
+        for order in self.orders:
+            bar = bars[order.ticker]
+            o, h, lo = bar["Open"], bar["High"], bar["Low"]
+            if np.isnan(o):
+                remaining.append(order)
+                continue
+
+            price = None
+            buy = order.quantity > 0
+            if order.kind == "market":
+                price = o
+            elif order.kind == "limit":
+                if buy and lo <= order.limit:
+                    price = min(o, order.limit)
+                elif not buy and h >= order.limit:
+                    price = max(o, order.limit)
+            elif order.kind == "stop":
+                if buy and h >= order.stop:
+                    price = max(o, order.stop)
+                elif not buy and lo <= order.stop:
+                    price = min(o, order.stop)
+            elif order.kind == "trailing_stop":
+                stop = order.high_water * (1 - order.trail_pct)
+                if lo <= stop:
+                    price = min(o, stop)
+                else:
+                    order.high_water = max(order.high_water, h)
+
+            if price is None:
+                remaining.append(order)
+            else:
+                self._execute(order, price, bars.date)
+        self.orders = remaining
+
+    def _mark(self, bars: Bars) -> float:
+        value = self.cash
+        for ticker, qty in self.positions.items():
+            if qty:
+                close = bars.close(ticker)
+                if not np.isnan(close):
+                    value += qty * close
+        self._equity = value
+        return value
+
+
+class Strategy:
+    """
+    Base class for event-driven strategies.
+
+    Override on_bar (and optionally on_start). A plain function with the
+    on_bar signature can be used instead of a subclass.
+    """
+
+    def on_start(self, broker: Broker) -> None:
+        pass
+
+    def on_bar(self, broker: Broker, bars: Bars) -> None:
+        raise NotImplementedError
+
+
+class Backtester:
+    """
+    Event-driven backtester.
+
+    Args:
+        data: Dict mapping ticker to OHLCV DataFrame; a single DataFrame is
+            available to the strategy under the name 'Strategy'
+        strategy: Strategy instance, or function ``on_bar(broker, bars)``
+        initial_capital: Starting cash
+        commission: Commission as a fraction of traded value
+        slippage: Slippage as a fraction of price, applied against the trader
+        allow_short: Allow selling more shares than held
+        periods_per_year: Bars per year, for annualized stats
+
+    Example:
+        >>> def trend(broker, bars):
+        ...     closes = bars.history("AAPL", "Close", 50)
+        ...     if len(closes) < 50:
+        ...         return
+        ...     above = closes[-1] > closes.mean()
+        ...     if above and not broker.position("AAPL"):
+        ...         broker.order_target_percent("AAPL", 1.0, closes[-1])
+        ...     elif not above and broker.position("AAPL"):
+        ...         broker.sell("AAPL", broker.position("AAPL"))
+        >>> result = Backtester({"AAPL": df}, trend, commission=0.001).run()
+        >>> print(result.stats())
+    """
+
+    def __init__(
+        self,
+        data: Union[pd.DataFrame, dict[str, pd.DataFrame]],
+        strategy: Union[Strategy, Callable[[Broker, Bars], None]],
+        initial_capital: float = 10_000.0,
+        commission: float = 0.0,
+        slippage: float = 0.0,
+        allow_short: bool = False,
+        periods_per_year: int = 252,
+    ):
+        if isinstance(data, pd.DataFrame):
+            data = {"Strategy": data}
+        self.data = data
+        self.strategy = strategy
+        self.initial_capital = initial_capital
+        self.commission = commission
+        self.slippage = slippage
+        self.allow_short = allow_short
+        self.periods_per_year = periods_per_year
+
+    def run(self) -> BacktestResult:
+        """Run the simulation and return the results."""
+        from .panel import Panel
+
+        panel = Panel.from_frames(self.data, fields=("Open", "High", "Low", "Close", "Volume"))
+        arrays = {f: m.to_numpy() for f, m in panel.fields.items()}
+        columns = {t: i for i, t in enumerate(panel.tickers)}
+
+        broker = Broker(self.initial_capital, self.commission, self.slippage, self.allow_short)
+        on_bar = self.strategy.on_bar if isinstance(self.strategy, Strategy) else self.strategy
+        if isinstance(self.strategy, Strategy):
+            self.strategy.on_start(broker)
+
+        equity = np.empty(len(panel.index))
+        held = np.zeros((len(panel.index), len(columns)))
+        for row, date in enumerate(panel.index):
+            bars = Bars(arrays, columns, row, date)
+            broker._process(bars)
+            equity[row] = broker._mark(bars)
+            on_bar(broker, bars)
+            for ticker, qty in broker.positions.items():
+                held[row, columns[ticker]] = qty
+
+        fills = pd.DataFrame(
+            [(f.date, f.ticker, f.quantity, f.price, f.commission, f.pnl) for f in broker.fills],
+            columns=["Date", "Ticker", "Quantity", "Price", "Commission", "PnL"],
+        )
+        trades = _round_trips(fills)
+        return BacktestResult(
+            pd.Series(equity, index=panel.index, name="Equity"),
+            pd.DataFrame(held, index=panel.index, columns=panel.tickers),
+            trades,
+            self.periods_per_year,
+        )
+
+
+def _round_trips(fills: pd.DataFrame) -> pd.DataFrame:
+    """
+    Summarize fills into trades: one row per position opened and closed.
+
+    A fill that flips the position (long to short or back) closes the old
+    trade and opens a new one, with its commission split pro rata.
+    """
+    records = []
+    for ticker, group in fills.groupby("Ticker", sort=False):
+        position, cost, opened, entry_value = 0, 0.0, None, 0.0
+        for row in group.itertuples(index=False):
+            quantity, commission, pnl = row.Quantity, row.Commission, row.PnL
+            if position and np.sign(quantity) != np.sign(position) and abs(quantity) > abs(position):
+                share = abs(position) / abs(quantity)
+                cost += commission * share - pnl
+                records.append((ticker, opened, row.Date, -cost,
+                                -cost / entry_value * 100 if entry_value else np.nan))
+                quantity += position
+                commission, pnl, position = commission * (1 - share), 0.0, 0
+            if position == 0:
+                opened, entry_value, cost = row.Date, 0.0, 0.0
+            if position == 0 or np.sign(quantity) == np.sign(position):
+                entry_value += abs(quantity) * row.Price
+            cost += commission - pnl
+            position += quantity
+            if position == 0:
+                pnl = -cost
+                records.append((ticker, opened, row.Date, pnl,
+                                pnl / entry_value * 100 if entry_value else np.nan))
+    return pd.DataFrame(records, columns=["Ticker", "Entry Date", "Exit Date", "PnL", "Return %"])
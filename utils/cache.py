@@ -0,0 +1,420 @@
+"""
+Cache Helpers for Money Talks
+
+Provides a local on-disk cache for OHLCV price history so notebooks don't
+re-download the same data every time a cell is re-run.
+
+Each ticker + interval pair is stored as one columnar file under
+``data/cache/`` (Parquet when pyarrow is installed, pickle otherwise) with a
+small JSON sidecar recording how far back the data goes and when it was last
+refreshed. Stale entries only fetch the missing tail of dates.
+"""
+
+import json
+import os
+import threading
+import time
+from datetime import timedelta
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Callable, Optional
+
+import pandas as pd
+
+from .profiling import record
+
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get(
+        "MONEY_TALKS_CACHE_DIR",
+        Path(__file__).parent.parent / "data" / "cache",
+    )
+)
+
+# Intraday bars go stale much faster than daily ones
+INTRADAY_INTERVALS = {"1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h"}
+
+# Signature of the function used to fill the cache:
+#   fetch(ticker, interval, period=None, start=None) -> DataFrame
+Fetcher = Callable[..., pd.DataFrame]
+
+
+def period_start(period: str, now: pd.Timestamp) -> Optional[pd.Timestamp]:
+    """
+    Convert a yfinance-style period string to the earliest timestamp it covers.
+
+    Args:
+        period: Time period - 1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max
+        now: Reference "current" timestamp
+
+    Returns:
+        Start timestamp, or None for 'max' (all available history)
+
+    Example:
+        >>> period_start("6mo", pd.Timestamp("2024-07-01"))
+        Timestamp('2024-01-01 00:00:00')
+    """
+    period = period.lower()
+    if period == "max":
+        return None
+    if period == "ytd":
+        return now.normalize().replace(month=1, day=1)
+
+    units = {
+        "d": lambda n: pd.DateOffset(days=n),
+        "wk": lambda n: pd.DateOffset(weeks=n),
+        "mo": lambda n: pd.DateOffset(months=n),
+        "y": lambda n: pd.DateOffset(years=n),
+    }
+    for suffix, offset in units.items():
+        number = period[: -len(suffix)]
+        if period.endswith(suffix) and number.isdigit():
+            return now - offset(int(number))
+
+    raise ValueError(f"Unknown period: {period}. Use e.g. '5d', '6mo', '1y', 'ytd' or 'max'.")
+
+
+class OHLCVCache:
+    """
+    On-disk cache of price history keyed by ticker and interval.
+
+    Hits are served straight from disk. Entries older than ``ttl`` are
+    refreshed by fetching only the bars after the last cached date, and the
+    store is trimmed by age (``max_age``) and total size (``max_bytes``),
+    evicting the least recently used entries first.
+
+    Example:
+        >>> cache = OHLCVCache(ttl=timedelta(hours=6))
+        >>> df = cache.get("AAPL", "1y", "1d", fetch=my_fetcher)
+        >>> cache.evict()
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        ttl: timedelta = timedelta(hours=12),
+        intraday_ttl: timedelta = timedelta(minutes=5),
+        max_age: Optional[timedelta] = timedelta(days=30),
+        max_bytes: Optional[int] = 500 * 1024 * 1024,
+        offline: bool = False,
+    ):
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.ttl = ttl
+        self.intraday_ttl = intraday_ttl
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.suffix = ".parquet" if find_spec("pyarrow") else ".pkl"
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Paths and raw I/O
+    # ------------------------------------------------------------------
+
+    def _key(self, ticker: str, interval: str) -> str:
+        return f"{ticker.upper().replace('/', '-')}_{interval}"
+
+    def _lock(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _data_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.suffix}"
+
+    def _meta_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def _keys(self) -> list[str]:
+        """
+        Keys of cached entries: JSON files with a data file next to them.
+
+        Other modules keep their own JSON in the same directory (e.g.
+        reference_<provider>.json), so a bare .json is not an entry.
+        """
+        if not self.cache_dir.exists():
+            return []
+        return [p.stem for p in self.cache_dir.glob("*.json") if self._data_path(p.stem).exists()]
+
+    def _read_meta(self, key: str) -> Optional[dict]:
+        path = self._meta_path(key)
+        if not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def read(self, ticker: str, interval: str = "1d") -> Optional[pd.DataFrame]:
+        """Return the full cached history for a ticker, or None if not cached."""
+        key = self._key(ticker, interval)
+        path = self._data_path(key)
+        if not path.exists() or self._read_meta(key) is None:
+            return None
+        try:
+            df = pd.read_parquet(path) if self.suffix == ".parquet" else pd.read_pickle(path)
+        except Exception:
+            return None
+        # Mark as recently used for LRU eviction
+        os.utime(path)
+        return df
+
+    def write(
+        self,
+        ticker: str,
+        interval: str,
+        df: pd.DataFrame,
+        covers: Optional[pd.Timestamp] = None,
+    ) -> None:
+        """
+        Store price history for a ticker, replacing any existing entry.
+
+        Args:
+            ticker: Stock symbol
+            interval: Data interval
+            df: DataFrame with a DatetimeIndex
+            covers: Earliest date this history is complete from (None = 'max')
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        key = self._key(ticker, interval)
+        path = self._data_path(key)
+
+        # Write to a temp file and rename so readers never see a partial file
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}")
+        if self.suffix == ".parquet":
+            df.to_parquet(tmp)
+        else:
+            df.to_pickle(tmp)
+        os.replace(tmp, path)
+
+        meta = {
+            "ticker": ticker.upper(),
+            "interval": interval,
+            "covers": "max" if covers is None else covers.isoformat(),
+            "updated": time.time(),
+            "rows": len(df),
+        }
+        self._meta_path(key).write_text(json.dumps(meta))
+
+    # ------------------------------------------------------------------
+    # Cache lookup
+    # ------------------------------------------------------------------
+
+    def get(
+        self,
+        ticker: str,
+        period: str = "1y",
+        interval: str = "1d",
+        fetch: Optional[Fetcher] = None,
+        refresh: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Get price history, serving from disk when possible.
+
+        Args:
+            ticker: Stock symbol (e.g., 'AAPL')
+            period: Time period - 1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max
+            interval: Data interval - 1m, 5m, 1h, 1d, 1wk, ...
+            fetch: Function called as ``fetch(ticker, interval, period=..., start=...)``
+                to download missing data
+            refresh: If True, fetch the missing tail even if the entry is fresh
+
+        Returns:
+            DataFrame sliced to the requested period
+
+        Raises:
+            LookupError: In offline mode when the ticker is not cached
+        """
+        key = self._key(ticker, interval)
+        with self._lock(key):
+            cached = self.read(ticker, interval)
+            meta = self._read_meta(key)
+
+            if self.offline or fetch is None:
+                if cached is None:
+                    raise LookupError(
+                        f"{ticker} ({interval}) is not in the offline cache at {self.cache_dir}"
+                    )
+                record(cache_hits=1)
+                return self._slice(cached, period)
+
+            # Coverage is tracked in UTC so it compares across tz-naive/aware data
+            wanted = period_start(period, pd.Timestamp.now(tz="UTC"))
+
+            if cached is not None and meta is not None and self._covers(meta, wanted):
+                ttl = self.intraday_ttl if interval in INTRADAY_INTERVALS else self.ttl
+                if refresh or time.time() - meta["updated"] > ttl.total_seconds():
+                    record(cache_refreshes=1)
+                    cached = self._refresh_tail(ticker, interval, cached, meta, fetch)
+                else:
+                    record(cache_hits=1)
+                return self._slice(cached, period)
+
+            # Miss (or cached history doesn't reach back far enough)
+            record(cache_misses=1)
+            df = fetch(ticker, interval, period=period)
+            if df.empty:
+                return df
+            if cached is not None and not cached.empty:
+                df = self._merge(cached, df)
+            self.write(ticker, interval, df, covers=wanted)
+            self.evict()
+            return self._slice(df, period)
+
+    def _refresh_tail(
+        self,
+        ticker: str,
+        interval: str,
+        cached: pd.DataFrame,
+        meta: dict,
+        fetch: Fetcher,
+    ) -> pd.DataFrame:
+        """Fetch only bars from the last cached date onward and merge them in."""
+        if cached.empty:
+            return cached
+        # Re-fetch the last bar too, since it may have been incomplete
+        last = cached.index[-1]
+        start = last if interval in INTRADAY_INTERVALS else last.normalize()
+        tail = fetch(ticker, interval, start=start)
+        merged = self._merge(cached, tail) if not tail.empty else cached
+        covers = None if meta["covers"] == "max" else pd.Timestamp(meta["covers"])
+        self.write(ticker, interval, merged, covers=covers)
+        return merged
+
+    # ------------------------------------------------------------------
+    # Eviction
+    # ------------------------------------------------------------------
+
+    def evict(self) -> list[str]:
+        """
+        Remove expired entries, then least recently used ones until under max_bytes.
+
+        Returns:
+            List of evicted cache keys
+        """
+        entries = []
+        for key in self._keys():
+            meta = self._read_meta(key)
+            if meta is None:
+                continue
+            stat = self._data_path(key).stat()
+            entries.append((stat.st_mtime, stat.st_size, meta["updated"], key))
+
+        evicted = []
+        now = time.time()
+        if self.max_age is not None:
+            for entry in list(entries):
+                if now - entry[2] > self.max_age.total_seconds():
+                    entries.remove(entry)
+                    evicted.append(entry[3])
+
+        if self.max_bytes is not None:
+            entries.sort()  # oldest access first
+            total = sum(size for _, size, _, _ in entries)
+            while entries and total > self.max_bytes:
+                _, size, _, key = entries.pop(0)
+                total -= size
+                evicted.append(key)
+
+        for key in evicted:
+            self._remove(key)
+        return evicted
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        for key in self._keys():
+            self._remove(key)
+
+    def size_bytes(self) -> int:
+        """Total size of cached data files in bytes."""
+        if not self.cache_dir.exists():
+            return 0
+        return sum(p.stat().st_size for p in self.cache_dir.glob(f"*{self.suffix}"))
+
+    def _remove(self, key: str) -> None:
+        for path in (self._data_path(key), self._meta_path(key)):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _now(df: Optional[pd.DataFrame]) -> pd.Timestamp:
+        tz = getattr(df.index, "tz", None) if df is not None else None
+        return pd.Timestamp.now(tz=tz)
+
+    @staticmethod
+    def _covers(meta: dict, wanted: Optional[pd.Timestamp]) -> bool:
+        if meta["covers"] == "max":
+            return True
+        return wanted is not None and pd.Timestamp(meta["covers"]) <= wanted
+
+    @staticmethod
+    def _localize(df: pd.DataFrame, tz) -> pd.DataFrame:
+        df = df.tz_localize(tz, ambiguous="NaT", nonexistent="shift_forward")
+        return df[df.index.notna()]
+
+    @staticmethod
+    def _merge(old: pd.DataFrame, new: pd.DataFrame) -> pd.DataFrame:
+        old_tz, new_tz = old.index.tz, new.index.tz
+        if old_tz is not None and new_tz is not None:
+            new = new.tz_convert(old_tz)
+        elif old_tz is not None or new_tz is not None:
+            # Naive bars are exchange wall-clock times (e.g. from yf.download
+            # without ignore_tz=False); localize them to the aware side's zone
+            if old_tz is None:
+                old = OHLCVCache._localize(old, new_tz)
+            else:
+                new = OHLCVCache._localize(new, old_tz)
+        merged = pd.concat([old, new])
+        merged = merged[~merged.index.duplicated(keep="last")]
+        return merged.sort_index()
+
+    @staticmethod
+    def _slice(df: pd.DataFrame, period: str) -> pd.DataFrame:
+        if df.empty:
+            return df
+        period = period.lower()
+        # '1d' / '5d' mean trading sessions, not calendar days
+        if period.endswith("d") and period[:-1].isdigit():
+            sessions = df.index.normalize().unique()
+            return df[df.index.normalize() >= sessions[-int(period[:-1]):][0]]
+        start = period_start(period, OHLCVCache._now(df))
+        return df if start is None else df[df.index >= start]
+
+
+_default_cache: Optional[OHLCVCache] = None
+
+
+def get_cache() -> OHLCVCache:
+    """
+    Get the shared cache used by ``fetch_stock_data``.
+
+    Set ``MONEY_TALKS_OFFLINE=1`` to serve only from a pre-seeded cache.
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = OHLCVCache(offline=os.environ.get("MONEY_TALKS_OFFLINE") == "1")
+    return _default_cache
+
+
+def configure_cache(**kwargs) -> OHLCVCache:
+    """
+    Replace the shared cache with one built from the given settings.
+
+    Args:
+        **kwargs: Arguments for OHLCVCache (cache_dir, ttl, max_bytes, offline, ...)
+
+    Returns:
+        The new shared OHLCVCache
+
+    Example:
+        >>> configure_cache(offline=True)  # run entirely from data/cache/
+    """
+    global _default_cache
+    _default_cache = OHLCVCache(**kwargs)
+    return _default_cache
@@ -4,11 +4,16 @@ Chart Helpers for Money Talks
 Provides standardized visualization functions for stock market data.
 """
 
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from typing import Optional, Literal
 
+from . import indicators
+from .downsample import decimate, points_for_width, resample_ohlc
+from .profiling import instrument
+
 
 # Default style settings
 STYLE = {
@@ -21,10 +26,35 @@ STYLE = {
 
 
 def _apply_style():
-    """Apply consistent styling to plots."""
-    plt.rcParams.update(STYLE)
+    """Apply consistent styling to plots (skipped when already in effect)."""
+    if any(plt.rcParams[key] != value for key, value in STYLE.items()):
+        plt.rcParams.update(STYLE)
+
+
+def _point_limit(figsize: tuple, max_points: Optional[int]) -> Optional[int]:
+    """
+    Points worth drawing on a figure: None means two per pixel column of
+    the figure's width, 0 means draw everything.
+    """
+    if max_points is None:
+        return points_for_width(figsize[0], plt.rcParams["figure.dpi"])
+    return max_points or None
+
 
+def _thin(data, figsize: tuple, max_points: Optional[int], column: Optional[str] = None):
+    """Decimate a series or frame to the figure's resolution."""
+    limit = _point_limit(figsize, max_points)
+    return decimate(data, limit, column=column) if limit else data
 
+
+def _bar_width(index: pd.Index) -> float:
+    """Bar width in days: 80% of the typical spacing between bars."""
+    if len(index) < 2 or not isinstance(index, pd.DatetimeIndex):
+        return 0.8
+    return 0.8 * float(np.median(np.diff(mdates.date2num(index))))
+
+
+@instrument(size=False)
 def plot_line(
     df: pd.DataFrame,
     column: str = "Close",
@@ -32,6 +62,7 @@ def plot_line(
     ylabel: str = "Price ($)",
     figsize: tuple = (12, 6),
     color: str = "#2E86AB",
+    max_points: Optional[int] = None,
 ) -> plt.Figure:
     """
     Create a simple line chart of stock prices.
@@ -43,6 +74,9 @@ def plot_line(
         ylabel: Y-axis label
         figsize: Figure size as (width, height)
         color: Line color
+        max_points: Points to draw; by default long histories are reduced to
+            the figure's pixel width (min/max per pixel, visually lossless).
+            Use 0 to draw every row.
 
     Returns:
         matplotlib Figure
@@ -55,7 +89,8 @@ def plot_line(
     _apply_style()
     fig, ax = plt.subplots(figsize=figsize)
 
-    ax.plot(df.index, df[column], color=color, linewidth=1.5)
+    values = _thin(df[column], figsize, max_points)
+    ax.plot(values.index, values, color=color, linewidth=1.5)
     ax.set_title(title, fontsize=14, fontweight="bold")
     ax.set_ylabel(ylabel)
     ax.set_xlabel("Date")
@@ -69,11 +104,13 @@ def plot_line(
     return fig
 
 
+@instrument(size=False)
 def plot_candlestick(
     df: pd.DataFrame,
     title: str = "",
     figsize: tuple = (12, 6),
     style: str = "yahoo",
+    max_bars: Optional[int] = None,
 ) -> None:
     """
     Create a candlestick chart using mplfinance.
@@ -83,6 +120,8 @@ def plot_candlestick(
         title: Chart title
         figsize: Figure size
         style: mplfinance style ('yahoo', 'charles', 'mike', 'nightclouds', etc.)
+        max_bars: Most candles to draw; longer histories are merged into wider
+            candles (default: one candle per 4 pixels of figure width, 0 = all)
 
     Example:
         >>> df = fetch_stock_data("AAPL", period="3mo")
@@ -94,6 +133,11 @@ def plot_candlestick(
         print("mplfinance not installed. Run: pip install mplfinance")
         return
 
+    if max_bars is None:
+        max_bars = points_for_width(figsize[0], plt.rcParams["figure.dpi"]) // 8
+    if max_bars:
+        df = resample_ohlc(df, max_bars)
+
     mpf.plot(
         df,
         type="candle",
@@ -106,11 +150,13 @@ def plot_candlestick(
     )
 
 
+@instrument(size=False)
 def plot_with_volume(
     df: pd.DataFrame,
     column: str = "Close",
     title: str = "",
     figsize: tuple = (12, 8),
+    max_points: Optional[int] = None,
 ) -> plt.Figure:
     """
     Create a price chart with volume bars below.
@@ -120,6 +166,8 @@ def plot_with_volume(
         column: Price column to plot
         title: Chart title
         figsize: Figure size
+        max_points: Points to draw for the price line (default: figure
+            resolution, 0 = all); volume bars are merged to a quarter as many
 
     Returns:
         matplotlib Figure
@@ -135,14 +183,18 @@ def plot_with_volume(
     )
 
     # Price chart
-    ax1.plot(df.index, df[column], color="#2E86AB", linewidth=1.5)
+    price = _thin(df[column], figsize, max_points)
+    ax1.plot(price.index, price, color="#2E86AB", linewidth=1.5)
     ax1.set_ylabel("Price ($)")
     ax1.set_title(title, fontsize=14, fontweight="bold")
 
     # Volume chart
-    colors = ["#27AE60" if c >= o else "#E74C3C"
-              for c, o in zip(df["Close"], df["Open"])]
-    ax2.bar(df.index, df["Volume"], color=colors, alpha=0.7)
+    limit = _point_limit(figsize, max_points)
+    bars = df[["Open", "Close", "Volume"]]
+    if limit:
+        bars = resample_ohlc(bars, limit // 4)
+    colors = np.where(bars["Close"].to_numpy() >= bars["Open"].to_numpy(), "#27AE60", "#E74C3C")
+    ax2.bar(bars.index, bars["Volume"], width=_bar_width(bars.index), color=colors, alpha=0.7)
     ax2.set_ylabel("Volume")
     ax2.set_xlabel("Date")
 
@@ -154,11 +206,13 @@ def plot_with_volume(
     return fig
 
 
+@instrument(size=False)
 def plot_with_indicator(
     df: pd.DataFrame,
     indicator: str,
     title: str = "",
     figsize: tuple = (12, 8),
+    max_points: Optional[int] = None,
     **indicator_params,
 ) -> plt.Figure:
     """
@@ -169,6 +223,8 @@ def plot_with_indicator(
         indicator: One of 'sma', 'ema', 'bb' (Bollinger Bands), 'rsi'
         title: Chart title
         figsize: Figure size
+        max_points: Points to draw per line (default: figure resolution, 0 = all);
+            indicators are always computed on the full history
         **indicator_params: Additional parameters for indicator calculation
 
     Returns:
@@ -184,11 +240,11 @@ def plot_with_indicator(
     indicator = indicator.lower()
 
     if indicator in ["sma", "ema"]:
-        return _plot_moving_average(df, indicator, title, figsize, **indicator_params)
+        return _plot_moving_average(df, indicator, title, figsize, max_points, **indicator_params)
     elif indicator == "bb":
-        return _plot_bollinger_bands(df, title, figsize, **indicator_params)
+        return _plot_bollinger_bands(df, title, figsize, max_points, **indicator_params)
     elif indicator == "rsi":
-        return _plot_rsi(df, title, figsize, **indicator_params)
+        return _plot_rsi(df, title, figsize, max_points, **indicator_params)
     else:
         raise ValueError(f"Unknown indicator: {indicator}. Use 'sma', 'ema', 'bb', or 'rsi'")
 
@@ -198,6 +254,7 @@ def _plot_moving_average(
     ma_type: str,
     title: str,
     figsize: tuple,
+    max_points: Optional[int] = None,
     window: int = 20,
 ) -> plt.Figure:
     """Plot price with moving average."""
@@ -205,15 +262,16 @@ def _plot_moving_average(
 
     # Calculate MA
     if ma_type == "sma":
-        ma = df["Close"].rolling(window=window).mean()
+        ma = indicators.sma(df["Close"], window)
         ma_label = f"SMA({window})"
     else:  # ema
-        ma = df["Close"].ewm(span=window, adjust=False).mean()
+        ma = indicators.ema(df["Close"], window)
         ma_label = f"EMA({window})"
 
-    # Plot
-    ax.plot(df.index, df["Close"], color="#2E86AB", linewidth=1.5, label="Close")
-    ax.plot(df.index, ma, color="#E74C3C", linewidth=1.5, label=ma_label)
+    # Plot; rows are thinned together, picked by the close price
+    lines = _thin(pd.DataFrame({"Close": df["Close"], "MA": ma}), figsize, max_points, "Close")
+    ax.plot(lines.index, lines["Close"], color="#2E86AB", linewidth=1.5, label="Close")
+    ax.plot(lines.index, lines["MA"], color="#E74C3C", linewidth=1.5, label=ma_label)
 
     ax.set_title(title or f"Price with {ma_label}", fontsize=14, fontweight="bold")
     ax.set_ylabel("Price ($)")
@@ -229,6 +287,7 @@ def _plot_bollinger_bands(
     df: pd.DataFrame,
     title: str,
     figsize: tuple,
+    max_points: Optional[int] = None,
     window: int = 20,
     num_std: float = 2.0,
 ) -> plt.Figure:
@@ -236,15 +295,15 @@ def _plot_bollinger_bands(
     fig, ax = plt.subplots(figsize=figsize)
 
     # Calculate Bollinger Bands
-    sma = df["Close"].rolling(window=window).mean()
-    std = df["Close"].rolling(window=window).std()
-    upper = sma + (std * num_std)
-    lower = sma - (std * num_std)
+    sma, upper, lower = indicators.bollinger_bands(df["Close"], window, num_std)
 
     # Plot
-    ax.plot(df.index, df["Close"], color="#2E86AB", linewidth=1.5, label="Close")
-    ax.plot(df.index, sma, color="#E74C3C", linewidth=1, label=f"SMA({window})")
-    ax.fill_between(df.index, lower, upper, alpha=0.2, color="#E74C3C", label="Bollinger Bands")
+    bands = pd.DataFrame({"Close": df["Close"], "SMA": sma, "Upper": upper, "Lower": lower})
+    bands = _thin(bands, figsize, max_points, "Close")
+    ax.plot(bands.index, bands["Close"], color="#2E86AB", linewidth=1.5, label="Close")
+    ax.plot(bands.index, bands["SMA"], color="#E74C3C", linewidth=1, label=f"SMA({window})")
+    ax.fill_between(bands.index, bands["Lower"], bands["Upper"], alpha=0.2, color="#E74C3C",
+                    label="Bollinger Bands")
 
     ax.set_title(title or f"Bollinger Bands ({window}, {num_std})", fontsize=14, fontweight="bold")
     ax.set_ylabel("Price ($)")
@@ -260,31 +319,30 @@ def _plot_rsi(
     df: pd.DataFrame,
     title: str,
     figsize: tuple,
+    max_points: Optional[int] = None,
     window: int = 14,
+    smoothing: str = "sma",
 ) -> plt.Figure:
-    """Plot price with RSI indicator."""
+    """Plot price with RSI indicator ('sma' or 'wilder' smoothing)."""
     fig, (ax1, ax2) = plt.subplots(
         2, 1, figsize=figsize, gridspec_kw={"height_ratios": [2, 1]}, sharex=True
     )
 
     # Calculate RSI
-    delta = df["Close"].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
+    rsi = _thin(indicators.rsi(df["Close"], window, smoothing=smoothing), figsize, max_points)
+    close = _thin(df["Close"], figsize, max_points)
 
     # Price chart
-    ax1.plot(df.index, df["Close"], color="#2E86AB", linewidth=1.5)
+    ax1.plot(close.index, close, color="#2E86AB", linewidth=1.5)
     ax1.set_ylabel("Price ($)")
     ax1.set_title(title or f"Price with RSI({window})", fontsize=14, fontweight="bold")
 
     # RSI chart
-    ax2.plot(df.index, rsi, color="#9B59B6", linewidth=1.5)
+    ax2.plot(rsi.index, rsi, color="#9B59B6", linewidth=1.5)
     ax2.axhline(70, color="#E74C3C", linestyle="--", alpha=0.7, label="Overbought (70)")
     ax2.axhline(30, color="#27AE60", linestyle="--", alpha=0.7, label="Oversold (30)")
-    ax2.fill_between(df.index, 70, 100, alpha=0.1, color="#E74C3C")
-    ax2.fill_between(df.index, 0, 30, alpha=0.1, color="#27AE60")
+    ax2.axhspan(70, 100, alpha=0.1, color="#E74C3C")
+    ax2.axhspan(0, 30, alpha=0.1, color="#27AE60")
     ax2.set_ylabel("RSI")
     ax2.set_ylim(0, 100)
     ax2.legend(loc="upper right")
@@ -296,12 +354,14 @@ def _plot_rsi(
     return fig
 
 
+@instrument(size=False)
 def compare_stocks(
     data: dict[str, pd.DataFrame],
     column: str = "Close",
     normalize: bool = True,
     title: str = "Stock Comparison",
     figsize: tuple = (12, 6),
+    max_points: Optional[int] = None,
 ) -> plt.Figure:
     """
     Compare multiple stocks on the same chart.
@@ -312,6 +372,7 @@ def compare_stocks(
         normalize: If True, normalize to percentage change from start
         title: Chart title
         figsize: Figure size
+        max_points: Points to draw per stock (default: figure resolution, 0 = all)
 
     Returns:
         matplotlib Figure
@@ -328,7 +389,8 @@ def compare_stocks(
         values = df[column]
         if normalize:
             values = (values / values.iloc[0] - 1) * 100  # Percentage change
-        ax.plot(df.index, values, linewidth=1.5, label=ticker)
+        values = _thin(values, figsize, max_points)
+        ax.plot(values.index, values, linewidth=1.5, label=ticker)
 
     ax.set_title(title, fontsize=14, fontweight="bold")
     ax.set_ylabel("% Change" if normalize else "Price ($)")
@@ -1,13 +1,22 @@
 """
 Data Helpers for Money Talks
 
-Provides functions for fetching and processing S&P 500 stock data using yfinance.
+Provides functions for fetching and processing S&P 500 stock data. Data comes
+from yfinance by default; see utils.providers for offline backends.
 """
 
+import threading
+import time
+from functools import lru_cache
 import pandas as pd
-import yfinance as yf
-from pathlib import Path
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Optional, Union
+
+from .cache import get_cache, period_start
+from .profiling import instrument
+from .providers import DataProvider, get_provider
+from .reference import get_reference
 
 
 def get_sp500_tickers() -> list[str]:
@@ -21,43 +30,62 @@ def get_sp500_tickers() -> list[str]:
         >>> tickers = get_sp500_tickers()
         >>> print(f"Found {len(tickers)} S&P 500 stocks")
     """
-    # Try to load from local CSV first
-    data_path = Path(__file__).parent.parent / "data" / "sp500_symbols.csv"
-
-    if data_path.exists():
-        df = pd.read_csv(data_path)
-        return df["Symbol"].tolist()
+    # Try the local symbol table first (read once per session)
+    reference = get_reference()
+    if reference.symbols_path.exists():
+        return reference.tickers()
 
-    # Fallback: fetch from Wikipedia
+    # Fallback: scrape Wikipedia once per session
     try:
-        tables = pd.read_html(
-            "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
-        )
-        df = tables[0]
-        return df["Symbol"].str.replace(".", "-", regex=False).tolist()
+        return list(_scrape_sp500_tickers())
     except Exception:
-        # Ultimate fallback: return major stocks
-        return [
-            "AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "META", "TSLA", "BRK-B",
-            "UNH", "JNJ", "JPM", "V", "PG", "XOM", "HD", "MA", "CVX", "MRK",
-            "ABBV", "LLY", "PEP", "KO", "COST", "AVGO", "WMT", "MCD", "CSCO",
-            "TMO", "ABT", "ACN", "DHR", "NEE", "NKE", "DIS", "VZ", "ADBE",
-            "TXN", "PM", "CMCSA", "INTC", "WFC", "COP", "BMY", "UPS", "RTX"
-        ]
+        # Ultimate fallback: return major stocks (not cached, so a later call retries)
+        return list(_FALLBACK_TICKERS)
+
+
+_FALLBACK_TICKERS = (
+    "AAPL", "MSFT", "GOOGL", "AMZN", "NVDA", "META", "TSLA", "BRK-B",
+    "UNH", "JNJ", "JPM", "V", "PG", "XOM", "HD", "MA", "CVX", "MRK",
+    "ABBV", "LLY", "PEP", "KO", "COST", "AVGO", "WMT", "MCD", "CSCO",
+    "TMO", "ABT", "ACN", "DHR", "NEE", "NKE", "DIS", "VZ", "ADBE",
+    "TXN", "PM", "CMCSA", "INTC", "WFC", "COP", "BMY", "UPS", "RTX"
+)
 
 
+@lru_cache(maxsize=1)
+def _scrape_sp500_tickers() -> tuple[str, ...]:
+    """S&P 500 symbols from Wikipedia; raises on failure so errors aren't cached."""
+    tables = pd.read_html(
+        "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
+    )
+    df = tables[0]
+    return tuple(df["Symbol"].str.replace(".", "-", regex=False))
+
+
+@instrument
 def fetch_stock_data(
     ticker: str,
     period: str = "1y",
-    interval: str = "1d"
+    interval: str = "1d",
+    use_cache: bool = True,
+    refresh: bool = False,
+    provider: Union[str, DataProvider, None] = None,
 ) -> pd.DataFrame:
     """
     Fetch historical stock data for a single ticker.
 
+    Data is cached on disk under ``data/cache/`` so re-running a cell reads
+    from disk instead of the network; stale entries only download the bars
+    added since the last fetch. See ``utils.cache`` for TTL and eviction settings.
+
     Args:
         ticker: Stock symbol (e.g., 'AAPL')
         period: Time period - 1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max
         interval: Data interval - 1m, 2m, 5m, 15m, 30m, 60m, 90m, 1h, 1d, 5d, 1wk, 1mo, 3mo
+        use_cache: If False, always fetch from the provider and skip the cache
+        refresh: If True, fetch any new bars even if the cached copy is still fresh
+        provider: Data source name ('yfinance', 'local', 'synthetic') or a
+            DataProvider; defaults to the session provider (see utils.providers)
 
     Returns:
         DataFrame with columns: Open, High, Low, Close, Volume, Dividends, Stock Splits
@@ -66,62 +94,297 @@ def fetch_stock_data(
         >>> df = fetch_stock_data("AAPL", period="6mo")
         >>> print(df.tail())
     """
-    stock = yf.Ticker(ticker)
-    df = stock.history(period=period, interval=interval)
-    return df
+    source = get_provider(provider)
+    if not use_cache or not source.cacheable:
+        return source.history(ticker, interval, period=period)
+    return get_cache().get(ticker, period, interval, fetch=source.history, refresh=refresh)
+
+
+@dataclass
+class FetchFailure:
+    """A ticker that could not be fetched, with the last error seen."""
+
+    ticker: str
+    error: str
+    attempts: int
+
+
+@dataclass
+class FetchReport:
+    """Summary of a batch fetch: which tickers succeeded and which failed."""
+
+    succeeded: list[str] = field(default_factory=list)
+    failures: list[FetchFailure] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """True if every ticker was fetched."""
+        return not self.failures
+
+    def __str__(self) -> str:
+        lines = [
+            f"Fetched {len(self.succeeded)}/{len(self.succeeded) + len(self.failures)} "
+            f"tickers in {self.elapsed:.1f}s"
+        ]
+        for failure in self.failures:
+            lines.append(f"  {failure.ticker}: {failure.error} ({failure.attempts} attempts)")
+        return "\n".join(lines)
+
+
+class _RateLimiter:
+    """Thread-safe limiter spacing request starts at most `rate` per second."""
+
+    def __init__(self, rate: Optional[float]):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class _EmptyResult(Exception):
+    """Raised when a data source returns no rows (not worth retrying)."""
+
+
+class _TaskError(Exception):
+    """Final failure of a task after all retries."""
+
+    def __init__(self, message: str, attempts: int):
+        super().__init__(message)
+        self.message = message
+        self.attempts = attempts
+
+
+def _call_with_timeout(fn: Callable, timeout: Optional[float]):
+    """Run fn() and raise TimeoutError if it takes longer than timeout seconds."""
+    if timeout is None:
+        return fn()
+
+    outcome = {}
+
+    def target():
+        try:
+            outcome["value"] = fn()
+        except BaseException as e:  # re-raised in the calling thread
+            outcome["error"] = e
+
+    # A stuck request can't be killed, so run it in a daemon thread and abandon it
+    worker = threading.Thread(target=target, daemon=True)
+    worker.start()
+    worker.join(timeout)
+    if worker.is_alive():
+        raise TimeoutError(f"timed out after {timeout}s")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["value"]
+
+
+def _run_tasks(
+    tasks: dict[str, Callable],
+    max_workers: int,
+    timeout: Optional[float],
+    retries: int,
+    backoff: float,
+    rate_limit: Optional[float],
+) -> tuple[dict, list[FetchFailure]]:
+    """
+    Run named zero-argument tasks on a bounded thread pool with retries.
+
+    Each task is attempted up to ``retries + 1`` times, sleeping
+    ``backoff * 2**attempt`` seconds between attempts. Tasks raising
+    _EmptyResult fail immediately without retrying.
+    """
+    limiter = _RateLimiter(rate_limit)
+
+    def attempt(task: Callable):
+        for n in range(retries + 1):
+            limiter.wait()
+            try:
+                return _call_with_timeout(task, timeout)
+            except _EmptyResult as e:
+                raise _TaskError(str(e), n + 1)
+            except Exception as e:
+                if n == retries:
+                    raise _TaskError(f"{type(e).__name__}: {e}", n + 1)
+                time.sleep(backoff * 2 ** n)
+
+    results, failures = {}, []
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = {pool.submit(attempt, task): name for name, task in tasks.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except _TaskError as e:
+                failures.append(FetchFailure(name, e.message, e.attempts))
+    return results, failures
+
+
+def _bulk_download(
+    source: DataProvider, tickers: list[str], period: str, interval: str
+) -> dict[str, pd.DataFrame]:
+    """Download several tickers in one round trip and seed the cache."""
+    frames = source.download_many(tickers, period, interval)
+    if source.cacheable:
+        cache = get_cache()
+        covers = period_start(period, pd.Timestamp.now(tz="UTC"))
+        for ticker, df in frames.items():
+            cache.write(ticker, interval, df, covers=covers)
+    return frames
 
 
+@instrument
 def fetch_multiple(
     tickers: list[str],
     period: str = "1y",
-    interval: str = "1d"
-) -> dict[str, pd.DataFrame]:
+    interval: str = "1d",
+    max_workers: int = 8,
+    timeout: Optional[float] = 30.0,
+    retries: int = 2,
+    backoff: float = 0.5,
+    rate_limit: Optional[float] = None,
+    bulk: bool = False,
+    batch_size: int = 100,
+    fetcher: Optional[Callable[[str, str, str], pd.DataFrame]] = None,
+    provider: Union[str, DataProvider, None] = None,
+    return_report: bool = False,
+):
     """
-    Fetch historical data for multiple tickers.
+    Fetch historical data for multiple tickers in parallel.
+
+    Tickers are fetched on a pool of ``max_workers`` threads, so total time is
+    bounded by the concurrency limit rather than the number of tickers. Failed
+    requests are retried with exponential backoff.
 
     Args:
         tickers: List of stock symbols
         period: Time period
         interval: Data interval
+        max_workers: Number of concurrent requests (1 fetches serially)
+        timeout: Seconds to wait for a single request before giving up on it
+        retries: Extra attempts per ticker after a failure
+        backoff: Initial delay in seconds between retries (doubles each attempt)
+        rate_limit: Maximum requests started per second (None for no limit)
+        bulk: Use the provider's multi-ticker download (yfinance's yf.download),
+            one round trip per batch
+        batch_size: Tickers per round trip when bulk=True
+        fetcher: Function called as ``fetcher(ticker, period, interval)``;
+            defaults to fetch_stock_data. Useful for fake sources in tests.
+        provider: Data source passed to fetch_stock_data (see utils.providers)
+        return_report: If True, also return a FetchReport of successes and failures
 
     Returns:
-        Dictionary mapping ticker to DataFrame
+        Dictionary mapping ticker to DataFrame, in the order given; or a
+        ``(data, report)`` tuple when return_report=True
 
     Example:
         >>> data = fetch_multiple(["AAPL", "MSFT", "GOOGL"])
         >>> for ticker, df in data.items():
         ...     print(f"{ticker}: {len(df)} rows")
+
+        >>> data, report = fetch_multiple(get_sp500_tickers(), max_workers=16,
+        ...                               return_report=True)
+        >>> print(report)
     """
-    result = {}
-    for ticker in tickers:
-        try:
-            result[ticker] = fetch_stock_data(ticker, period, interval)
-        except Exception as e:
-            print(f"Warning: Could not fetch {ticker}: {e}")
+    started = time.monotonic()
+    source = get_provider(provider)
+    fetch = fetcher or (
+        lambda ticker, period, interval: fetch_stock_data(
+            ticker, period, interval, provider=source
+        )
+    )
+
+    def single(ticker: str) -> Callable:
+        def task():
+            df = fetch(ticker, period, interval)
+            if df is None or df.empty:
+                raise _EmptyResult("no data returned")
+            return df
+        return task
+
+    def batch(chunk: list[str]) -> Callable:
+        return lambda: _bulk_download(source, chunk, period, interval)
+
+    options = dict(
+        max_workers=max_workers,
+        timeout=timeout,
+        retries=retries,
+        backoff=backoff,
+        rate_limit=rate_limit,
+    )
+
+    if bulk and fetcher is None and hasattr(source, "download_many"):
+        chunks = {
+            str(i): tickers[i:i + batch_size] for i in range(0, len(tickers), batch_size)
+        }
+        batches, batch_failures = _run_tasks(
+            {name: batch(chunk) for name, chunk in chunks.items()}, **options
+        )
+        found = {t: df for frames in batches.values() for t, df in frames.items()}
+        failures = [
+            FetchFailure(t, f.error, f.attempts)
+            for f in batch_failures for t in chunks[f.ticker]
+        ]
+        failed = {f.ticker for f in failures}
+        failures += [
+            FetchFailure(t, "no data returned", 1)
+            for t in tickers if t not in found and t not in failed
+        ]
+    else:
+        found, failures = _run_tasks({t: single(t) for t in tickers}, **options)
+
+    result = {t: found[t] for t in tickers if t in found}
+    order = {t: i for i, t in enumerate(tickers)}
+    failures.sort(key=lambda f: order.get(f.ticker, 0))
+    report = FetchReport(list(result), failures, time.monotonic() - started)
+
+    if return_report:
+        return result, report
+    if failures:
+        names = ", ".join(f.ticker for f in failures)
+        print(f"Warning: Could not fetch {len(failures)} ticker(s): {names}")
     return result
 
 
+@instrument
 def calculate_returns(
-    df: pd.DataFrame,
+    df,
     column: str = "Close",
     method: str = "simple"
-) -> pd.Series:
+):
     """
     Calculate returns from price data.
 
     Args:
-        df: DataFrame with price data
+        df: DataFrame with price data, or many tickers at once: the dict
+            returned by fetch_multiple, a Panel, or a dates x tickers
+            DataFrame of prices
         column: Column to use for calculation
         method: 'simple' for percentage returns, 'log' for log returns
 
     Returns:
-        Series of returns
+        Series of returns, or a dates x tickers DataFrame for many tickers
 
     Example:
         >>> df = fetch_stock_data("AAPL")
         >>> returns = calculate_returns(df)
         >>> print(f"Average daily return: {returns.mean():.4f}")
+        >>> panel_returns = calculate_returns(fetch_multiple(["AAPL", "MSFT"]))
     """
+    if not isinstance(df, pd.DataFrame) or column not in df.columns:
+        from .risk import returns
+
+        return returns(df, method, column)
+
     prices = df[column]
 
     if method == "simple":
@@ -133,12 +396,16 @@ def calculate_returns(
         raise ValueError(f"Unknown method: {method}. Use 'simple' or 'log'.")
 
 
-def get_stock_info(ticker: str) -> dict:
+@instrument
+def get_stock_info(
+    ticker: str, provider: Union[str, DataProvider, None] = None
+) -> dict:
     """
     Get detailed information about a stock.
 
     Args:
         ticker: Stock symbol
+        provider: Data source (see utils.providers); defaults to the session provider
 
     Returns:
         Dictionary with stock information (name, sector, market cap, etc.)
@@ -148,16 +415,18 @@ def get_stock_info(ticker: str) -> dict:
         >>> print(f"Company: {info.get('longName')}")
         >>> print(f"Sector: {info.get('sector')}")
     """
-    stock = yf.Ticker(ticker)
-    return stock.info
+    return get_provider(provider).info(ticker)
 
 
-def get_market_cap_tier(ticker: str) -> str:
+def get_market_cap_tier(
+    ticker: str, provider: Union[str, DataProvider, None] = None
+) -> str:
     """
     Classify a stock by market capitalization.
 
     Args:
         ticker: Stock symbol
+        provider: Data source (see utils.providers); defaults to the session provider
 
     Returns:
         One of: 'Mega Cap', 'Large Cap', 'Mid Cap', 'Small Cap', 'Micro Cap'
@@ -166,19 +435,7 @@ def get_market_cap_tier(ticker: str) -> str:
         >>> tier = get_market_cap_tier("AAPL")
         >>> print(f"AAPL is a {tier} stock")
     """
-    info = get_stock_info(ticker)
-    market_cap = info.get("marketCap", 0)
-
-    if market_cap >= 200_000_000_000:  # $200B+
-        return "Mega Cap"
-    elif market_cap >= 10_000_000_000:  # $10B+
-        return "Large Cap"
-    elif market_cap >= 2_000_000_000:  # $2B+
-        return "Mid Cap"
-    elif market_cap >= 300_000_000:  # $300M+
-        return "Small Cap"
-    else:
-        return "Micro Cap"
+    return get_reference().tier(ticker, provider)
 
 
 # Convenience function for Colab setup
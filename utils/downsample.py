@@ -0,0 +1,200 @@
+"""
+Downsampling Helpers for Money Talks
+
+Provides decimation for charts of long or intraday histories. A figure only
+has so many pixels across; drawing 500,000 points into 1,200 pixel columns
+costs render time without changing the picture. These helpers pick the
+points (or aggregate the bars) worth drawing, so render time depends on the
+figure width rather than the data length.
+
+- minmax: keep the lowest and highest point of each pixel-wide bucket;
+  spikes and gaps survive exactly, so line charts look the same
+- lttb: Largest-Triangle-Three-Buckets, a smooth shape-preserving pick
+  for a fixed number of points
+- resample_ohlc: merge consecutive bars into wider candles
+"""
+
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_DPI = 100
+METHODS = ("minmax", "lttb")
+
+
+def points_for_width(width_inches: float, dpi: float = DEFAULT_DPI) -> int:
+    """Number of points a min/max line needs for a figure this wide (2 per pixel column)."""
+    return int(2 * width_inches * dpi)
+
+
+def _bucket_edges(n: int, n_buckets: int) -> np.ndarray:
+    """Start positions of ``n_buckets`` near-equal runs covering range(n)."""
+    return np.linspace(0, n, n_buckets + 1).astype(np.int64)[:-1]
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Positions to keep: the minimum and maximum of each bucket, plus the
+    first and last points, in their original order.
+
+    Args:
+        y: 1-D values
+        n_out: Target number of points (about two per bucket)
+
+    Returns:
+        Sorted integer positions into y
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= n_out or n_out < 4:
+        return np.arange(n)
+
+    n_buckets = (n_out - 2) // 2
+    starts = _bucket_edges(n - 2, n_buckets) + 1
+
+    # NaN-safe per-bucket argmin/argmax via reduceat on the values
+    filled_lo = np.where(np.isnan(y), np.inf, y)
+    filled_hi = np.where(np.isnan(y), -np.inf, y)
+    lo_vals = np.minimum.reduceat(filled_lo[1:-1], starts - 1)
+    hi_vals = np.maximum.reduceat(filled_hi[1:-1], starts - 1)
+
+    # Map each inner point to its bucket and find where it hits the extremes
+    bucket = np.repeat(np.arange(n_buckets), np.diff(np.append(starts, n - 1)))
+    inner = np.arange(1, n - 1)
+    is_lo = filled_lo[1:-1] == lo_vals[bucket]
+    is_hi = filled_hi[1:-1] == hi_vals[bucket]
+    # First hit per bucket only
+    first_lo = inner[is_lo][np.unique(bucket[is_lo], return_index=True)[1]]
+    first_hi = inner[is_hi][np.unique(bucket[is_hi], return_index=True)[1]]
+
+    return np.unique(np.concatenate([[0], first_lo, first_hi, [n - 1]]))
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Picks one point per bucket: the one forming the largest triangle with the
+    point picked in the previous bucket and the average of the next bucket.
+
+    Args:
+        x: 1-D x values (numbers; convert dates with .asi8 or mdates.date2num)
+        y: 1-D y values
+        n_out: Number of points to keep (including first and last)
+
+    Returns:
+        Sorted integer positions
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    edges = np.append(_bucket_edges(n - 2, n_out - 2) + 1, n - 1)
+    # Bucket averages for the "next bucket" corner, computed in one pass
+    sums_x = np.add.reduceat(x[1:-1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(np.nan_to_num(y[1:-1]), edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x / counts, x[-1])
+    avg_y = np.append(sums_y / counts, y[-1])
+
+    picked = np.empty(n_out, dtype=np.int64)
+    picked[0], picked[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        bx, by = x[lo:hi], y[lo:hi]
+        area = np.abs((x[a] - avg_x[i + 1]) * (by - y[a]) - (x[a] - bx) * (avg_y[i + 1] - y[a]))
+        a = lo + int(np.nanargmax(area)) if not np.isnan(area).all() else lo
+        picked[i + 1] = a
+    return picked
+
+
+def decimate(
+    data: Union[pd.Series, pd.DataFrame],
+    max_points: int,
+    method: str = "minmax",
+    column: Optional[str] = None,
+) -> Union[pd.Series, pd.DataFrame]:
+    """
+    Reduce a series (or the rows of a DataFrame) to about ``max_points``.
+
+    Args:
+        data: Series, or DataFrame whose rows are kept or dropped together
+        max_points: Target number of points
+        method: 'minmax' (default, keeps every spike) or 'lttb'
+        column: DataFrame column that drives the point selection
+            (default: every column; the kept positions are merged)
+
+    Returns:
+        Same type as data with a subset of its rows
+
+    Example:
+        >>> df = fetch_stock_data("AAPL", period="max")
+        >>> small = decimate(df["Close"], 2400)
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown downsampling method: {method}. Use {', '.join(METHODS)}")
+    if len(data) <= max_points:
+        return data
+
+    if isinstance(data, pd.Series):
+        columns = [data.to_numpy()]
+    elif column is not None:
+        columns = [data[column].to_numpy()]
+    else:
+        columns = [data[c].to_numpy() for c in data.columns]
+    per_column = max(max_points // len(columns), 4)
+
+    if method == "minmax":
+        keep = [minmax_indices(y, per_column) for y in columns]
+    else:
+        x = np.arange(len(data), dtype=np.float64)
+        keep = [lttb_indices(x, y, per_column) for y in columns]
+    positions = keep[0] if len(keep) == 1 else np.unique(np.concatenate(keep))
+    return data.iloc[positions]
+
+
+def resample_ohlc(df: pd.DataFrame, max_bars: int) -> pd.DataFrame:
+    """
+    Merge consecutive bars so at most ``max_bars`` remain.
+
+    Each new bar takes the first Open, highest High, lowest Low, last Close
+    and summed Volume of the bars it covers, and is stamped with the first
+    bar's date. Other columns keep their last value.
+
+    Args:
+        df: OHLC(V) DataFrame
+        max_bars: Maximum number of bars to return
+
+    Returns:
+        OHLC(V) DataFrame with at most max_bars rows
+
+    Example:
+        >>> minute = fetch_stock_data("SPY", period="5d", interval="1m")
+        >>> plot_candlestick(resample_ohlc(minute, 200))
+    """
+    n = len(df)
+    if n <= max_bars:
+        return df
+
+    group = -(-n // max_bars)   # bars per candle, rounded up
+    starts = np.arange(0, n, group)
+    ends = np.append(starts[1:], n) - 1
+    out = {}
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if col == "Open":
+            out[col] = values[starts]
+        elif col == "High":
+            out[col] = np.fmax.reduceat(values.astype(np.float64), starts)
+        elif col == "Low":
+            out[col] = np.fmin.reduceat(values.astype(np.float64), starts)
+        elif col == "Volume":
+            out[col] = np.add.reduceat(np.nan_to_num(values.astype(np.float64)), starts)
+        else:
+            out[col] = values[ends]
+    return pd.DataFrame(out, index=df.index[starts])
@@ -0,0 +1,490 @@
+"""
+Technical Indicators for Money Talks
+
+Provides vectorized implementations of the indicators taught in the course,
+shared by the chart helpers and the notebooks.
+
+Every function takes NumPy arrays, pandas Series or DataFrames and returns
+the same kind of object (with the input's index). Inputs may be 1-D (one
+ticker) or 2-D with time down the rows and one column per ticker, so a whole
+universe is computed in a single call. Element-wise math is done in NumPy;
+recursive smoothing and rolling windows use pandas' compiled window kernels,
+which handle the leading NaNs of late-listed tickers correctly.
+
+Conventions follow the class 2 lessons: EMAs use ``adjust=False``, RSI, ATR
+and ADX default to Wilder's smoothing, and Bollinger Bands use the sample
+standard deviation.
+"""
+
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+ArrayLike = Union[np.ndarray, pd.Series, pd.DataFrame]
+
+
+# ----------------------------------------------------------------------
+# Array plumbing
+# ----------------------------------------------------------------------
+
+
+def _values(x: ArrayLike) -> np.ndarray:
+    """Convert input to a float64 NumPy array without copying when possible."""
+    return np.asarray(x, dtype=np.float64)
+
+
+def _wrap(values: np.ndarray, like: ArrayLike) -> ArrayLike:
+    """Return values as the same container type (and index) as `like`."""
+    if isinstance(like, pd.DataFrame):
+        return pd.DataFrame(values, index=like.index, columns=like.columns)
+    if isinstance(like, pd.Series):
+        return pd.Series(values, index=like.index, name=like.name)
+    return values
+
+
+def _frame(a: np.ndarray) -> pd.DataFrame:
+    """View a 1-D or 2-D array as a DataFrame with time down the rows."""
+    return pd.DataFrame(a if a.ndim == 2 else a[:, None], copy=False)
+
+
+def _unframe(df: pd.DataFrame, ndim: int) -> np.ndarray:
+    arr = df.to_numpy()
+    return arr[:, 0] if ndim == 1 else arr
+
+
+def _rolling(a: np.ndarray, window: int, how: str, **kwargs) -> np.ndarray:
+    roller = _frame(a).rolling(window, min_periods=window)
+    return _unframe(getattr(roller, how)(**kwargs), a.ndim)
+
+
+def _ewm(a: np.ndarray, alpha: float, min_periods: int = 0) -> np.ndarray:
+    smoothed = _frame(a).ewm(alpha=alpha, adjust=False, min_periods=min_periods).mean()
+    return _unframe(smoothed, a.ndim)
+
+
+def _shift(a: np.ndarray, periods: int = 1) -> np.ndarray:
+    out = np.full_like(a, np.nan)
+    if periods < len(a):
+        out[periods:] = a[:-periods]
+    return out
+
+
+def _group_cumsum(a: np.ndarray, sessions: Optional[np.ndarray]) -> np.ndarray:
+    """Cumulative sum down the rows, restarting wherever the session label changes."""
+    total = np.cumsum(a, axis=0)
+    if sessions is None:
+        return total
+    sessions = np.asarray(sessions)
+    starts = np.r_[True, sessions[1:] != sessions[:-1]]
+    first = np.maximum.accumulate(np.where(starts, np.arange(len(a)), 0))
+    return total - (total - a)[first]
+
+
+def _safe_divide(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return num / den
+
+
+# ----------------------------------------------------------------------
+# Trend
+# ----------------------------------------------------------------------
+
+
+def sma(close: ArrayLike, window: int = 20) -> ArrayLike:
+    """
+    Simple moving average.
+
+    Args:
+        close: Prices (1-D, or 2-D dates x tickers)
+        window: Number of bars to average
+
+    Returns:
+        Moving average, NaN for the first window - 1 bars
+
+    Example:
+        >>> df["SMA_50"] = sma(df["Close"], 50)
+    """
+    return _wrap(_rolling(_values(close), window, "mean"), close)
+
+
+def ema(close: ArrayLike, span: int = 20) -> ArrayLike:
+    """
+    Exponential moving average with alpha = 2 / (span + 1).
+
+    Example:
+        >>> df["EMA_20"] = ema(df["Close"], 20)
+    """
+    return _wrap(_ewm(_values(close), 2.0 / (span + 1)), close)
+
+
+def rma(values: ArrayLike, period: int = 14, min_periods: int = 0) -> ArrayLike:
+    """
+    Wilder's moving average (an EMA with alpha = 1 / period).
+
+    Used by RSI, ATR and ADX.
+    """
+    return _wrap(_ewm(_values(values), 1.0 / period, min_periods), values)
+
+
+def macd(
+    close: ArrayLike, fast: int = 12, slow: int = 26, signal: int = 9
+) -> tuple[ArrayLike, ArrayLike, ArrayLike]:
+    """
+    Moving Average Convergence Divergence.
+
+    Returns:
+        (macd_line, signal_line, histogram)
+
+    Example:
+        >>> line, signal, hist = macd(df["Close"])
+    """
+    c = _values(close)
+    line = _ewm(c, 2.0 / (fast + 1)) - _ewm(c, 2.0 / (slow + 1))
+    sig = _ewm(line, 2.0 / (signal + 1))
+    return _wrap(line, close), _wrap(sig, close), _wrap(line - sig, close)
+
+
+def _directional(
+    h: np.ndarray, lo: np.ndarray, c: np.ndarray, period: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    up = h - _shift(h)
+    down = _shift(lo) - lo
+    plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+    minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+    missing = np.isnan(c)
+    plus_dm[missing] = np.nan
+    minus_dm[missing] = np.nan
+
+    alpha = 1.0 / period
+    tr = _ewm(_true_range(h, lo, c), alpha)
+    plus_di = 100 * _safe_divide(_ewm(plus_dm, alpha), tr)
+    minus_di = 100 * _safe_divide(_ewm(minus_dm, alpha), tr)
+    dx = 100 * _safe_divide(np.abs(plus_di - minus_di), plus_di + minus_di)
+    return plus_di, minus_di, _ewm(dx, alpha)
+
+
+def adx(
+    high: ArrayLike, low: ArrayLike, close: ArrayLike, period: int = 14
+) -> tuple[ArrayLike, ArrayLike, ArrayLike]:
+    """
+    Average Directional Index with Wilder's smoothing.
+
+    Returns:
+        (plus_di, minus_di, adx)
+
+    Example:
+        >>> plus_di, minus_di, strength = adx(df["High"], df["Low"], df["Close"])
+    """
+    results = _directional(_values(high), _values(low), _values(close), period)
+    return tuple(_wrap(r, close) for r in results)
+
+
+# ----------------------------------------------------------------------
+# Momentum
+# ----------------------------------------------------------------------
+
+
+def rsi(close: ArrayLike, period: int = 14, smoothing: str = "wilder") -> ArrayLike:
+    """
+    Relative Strength Index.
+
+    Args:
+        close: Prices
+        period: Lookback period
+        smoothing: 'wilder' (as taught in class 2) or 'sma' for a simple
+            rolling average of gains and losses
+
+    Returns:
+        RSI between 0 and 100
+
+    Example:
+        >>> df["RSI"] = rsi(df["Close"])
+    """
+    c = _values(close)
+    delta = c - _shift(c)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    gain[np.isnan(c)] = np.nan
+    loss[np.isnan(c)] = np.nan
+
+    if smoothing == "wilder":
+        avg_gain = _ewm(gain, 1.0 / period, min_periods=period)
+        avg_loss = _ewm(loss, 1.0 / period, min_periods=period)
+    elif smoothing == "sma":
+        avg_gain = _rolling(gain, period, "mean")
+        avg_loss = _rolling(loss, period, "mean")
+    else:
+        raise ValueError(f"Unknown smoothing: {smoothing}. Use 'wilder' or 'sma'.")
+
+    rs = _safe_divide(avg_gain, avg_loss)
+    return _wrap(100 - 100 / (1 + rs), close)
+
+
+def stochastic(
+    high: ArrayLike,
+    low: ArrayLike,
+    close: ArrayLike,
+    k_period: int = 14,
+    d_period: int = 3,
+    slow: bool = True,
+) -> tuple[ArrayLike, ArrayLike]:
+    """
+    Stochastic Oscillator.
+
+    Args:
+        k_period: %K lookback period
+        d_period: %D smoothing period
+        slow: If True, return the slow stochastic (%K smoothed once more)
+
+    Returns:
+        (percent_k, percent_d)
+    """
+    h, lo, c = _values(high), _values(low), _values(close)
+    lowest = _rolling(lo, k_period, "min")
+    highest = _rolling(h, k_period, "max")
+    k = 100 * _safe_divide(c - lowest, highest - lowest)
+    d = _rolling(k, d_period, "mean")
+    if slow:
+        k, d = d, _rolling(d, d_period, "mean")
+    return _wrap(k, close), _wrap(d, close)
+
+
+def roc(close: ArrayLike, period: int = 14) -> ArrayLike:
+    """
+    Rate of Change in percent over `period` bars.
+
+    Example:
+        >>> df["ROC_20"] = roc(df["Close"], 20)
+    """
+    c = _values(close)
+    return _wrap((_safe_divide(c, _shift(c, period)) - 1) * 100, close)
+
+
+def cci(
+    high: ArrayLike, low: ArrayLike, close: ArrayLike, period: int = 20
+) -> ArrayLike:
+    """
+    Commodity Channel Index using the mean absolute deviation of typical price.
+
+    The deviation is computed over sliding-window views, so no Python-level
+    ``rolling().apply`` is involved.
+    """
+    tp = (_values(high) + _values(low) + _values(close)) / 3
+    out = np.full_like(tp, np.nan)
+    if len(tp) >= period:
+        windows = sliding_window_view(tp, period, axis=0)
+        mean = windows.mean(axis=-1)
+        mean_dev = np.abs(windows - mean[..., None]).mean(axis=-1)
+        out[period - 1:] = _safe_divide(tp[period - 1:] - mean, 0.015 * mean_dev)
+    return _wrap(out, close)
+
+
+# ----------------------------------------------------------------------
+# Volatility
+# ----------------------------------------------------------------------
+
+
+def bollinger_bands(
+    close: ArrayLike, window: int = 20, num_std: float = 2.0
+) -> tuple[ArrayLike, ArrayLike, ArrayLike]:
+    """
+    Bollinger Bands.
+
+    Returns:
+        (middle, upper, lower)
+
+    Example:
+        >>> middle, upper, lower = bollinger_bands(df["Close"], 20, 2.0)
+    """
+    c = _values(close)
+    middle = _rolling(c, window, "mean")
+    std = _rolling(c, window, "std")
+    return (
+        _wrap(middle, close),
+        _wrap(middle + num_std * std, close),
+        _wrap(middle - num_std * std, close),
+    )
+
+
+def _true_range(h: np.ndarray, lo: np.ndarray, c: np.ndarray) -> np.ndarray:
+    prev = _shift(c)
+    return np.maximum(h - lo, np.maximum(np.abs(h - prev), np.abs(lo - prev)))
+
+
+def true_range(high: ArrayLike, low: ArrayLike, close: ArrayLike) -> ArrayLike:
+    """True Range: the largest of high-low and the gaps from the prior close."""
+    return _wrap(_true_range(_values(high), _values(low), _values(close)), close)
+
+
+def atr(
+    high: ArrayLike,
+    low: ArrayLike,
+    close: ArrayLike,
+    period: int = 14,
+    smoothing: str = "wilder",
+) -> ArrayLike:
+    """
+    Average True Range.
+
+    Args:
+        period: Smoothing period
+        smoothing: 'wilder' (as taught in class 2) or 'sma'
+
+    Example:
+        >>> df["ATR"] = atr(df["High"], df["Low"], df["Close"])
+    """
+    tr = _true_range(_values(high), _values(low), _values(close))
+    if smoothing == "wilder":
+        out = _ewm(tr, 1.0 / period, min_periods=period)
+    elif smoothing == "sma":
+        out = _rolling(tr, period, "mean")
+    else:
+        raise ValueError(f"Unknown smoothing: {smoothing}. Use 'wilder' or 'sma'.")
+    return _wrap(out, close)
+
+
+# ----------------------------------------------------------------------
+# Volume
+# ----------------------------------------------------------------------
+
+
+def obv(close: ArrayLike, volume: ArrayLike) -> ArrayLike:
+    """
+    On-Balance Volume, starting from 0 at the first bar.
+
+    Example:
+        >>> df["OBV"] = obv(df["Close"], df["Volume"])
+    """
+    c, v = _values(close), _values(volume)
+    direction = np.nan_to_num(np.sign(c - _shift(c)))
+    out = np.cumsum(np.nan_to_num(direction * v), axis=0)
+    out[np.isnan(c)] = np.nan
+    return _wrap(out, close)
+
+
+def vwap(
+    high: ArrayLike,
+    low: ArrayLike,
+    close: ArrayLike,
+    volume: ArrayLike,
+    sessions: Optional[ArrayLike] = None,
+) -> ArrayLike:
+    """
+    Volume-Weighted Average Price of the typical price.
+
+    Args:
+        sessions: Optional label per bar (e.g. the trading date); the running
+            totals restart whenever the label changes. Without it VWAP is
+            cumulative over the whole series.
+
+    Example:
+        >>> intraday = fetch_stock_data("AAPL", period="5d", interval="5m")
+        >>> intraday["VWAP"] = vwap(intraday["High"], intraday["Low"],
+        ...                         intraday["Close"], intraday["Volume"],
+        ...                         sessions=intraday.index.date)
+    """
+    tp = (_values(high) + _values(low) + _values(close)) / 3
+    v = _values(volume)
+    missing = np.isnan(tp) | np.isnan(v)
+    tp, v = np.where(missing, 0.0, tp), np.where(missing, 0.0, v)
+    labels = None if sessions is None else np.asarray(sessions)
+    out = _safe_divide(_group_cumsum(tp * v, labels), _group_cumsum(v, labels))
+    out[missing] = np.nan
+    return _wrap(out, close)
+
+
+# ----------------------------------------------------------------------
+# Levels
+# ----------------------------------------------------------------------
+
+
+def pivot_points(high, low, close) -> dict:
+    """
+    Classic floor-trader pivot points.
+
+    Works element-wise on scalars, arrays or Series. To get today's levels
+    from yesterday's bar, pass the previous bar (e.g. ``df.shift(1)``).
+
+    Returns:
+        Dict with keys PP, R1, R2, R3, S1, S2, S3
+
+    Example:
+        >>> levels = pivot_points(prev["High"], prev["Low"], prev["Close"])
+        >>> print(f"R1: ${levels['R1']:.2f}")
+    """
+    pp = (high + low + close) / 3
+    return {
+        "PP": pp,
+        "R1": 2 * pp - low,
+        "R2": pp + (high - low),
+        "R3": high + 2 * (pp - low),
+        "S1": 2 * pp - high,
+        "S2": pp - (high - low),
+        "S3": low - 2 * (high - pp),
+    }
+
+
+# ----------------------------------------------------------------------
+# DataFrame convenience
+# ----------------------------------------------------------------------
+
+
+def add_all_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add the full course indicator set to an OHLCV DataFrame.
+
+    Adds: SMA_20, SMA_50, SMA_200, EMA_10, EMA_20, MACD, MACD_Signal,
+    MACD_Hist, RSI, Stoch_K, Stoch_D, ROC, CCI, BB_Middle, BB_Upper,
+    BB_Lower, BB_Width, BB_Percent, ATR, +DI, -DI, ADX, OBV, VWAP, Vol_SMA,
+    Rel_Vol. VWAP restarts each session for intraday data.
+
+    Args:
+        df: DataFrame with Open, High, Low, Close, Volume columns
+
+    Returns:
+        Copy of df with indicator columns added
+
+    Example:
+        >>> df = add_all_indicators(fetch_stock_data("AAPL"))
+        >>> print(df[["Close", "RSI", "ADX"]].tail())
+    """
+    out = df.copy()
+    h, lo, c, v = (_values(df[col]) for col in ("High", "Low", "Close", "Volume"))
+
+    columns = {}
+    for window in (20, 50, 200):
+        columns[f"SMA_{window}"] = _rolling(c, window, "mean")
+    for span in (10, 20):
+        columns[f"EMA_{span}"] = _ewm(c, 2.0 / (span + 1))
+
+    line, signal, hist = macd(c)
+    columns.update(MACD=line, MACD_Signal=signal, MACD_Hist=hist)
+    columns["RSI"] = rsi(c)
+    columns["Stoch_K"], columns["Stoch_D"] = stochastic(h, lo, c)
+    columns["ROC"] = roc(c)
+    columns["CCI"] = cci(h, lo, c)
+
+    middle, upper, lower = bollinger_bands(c)
+    columns.update(BB_Middle=middle, BB_Upper=upper, BB_Lower=lower)
+    columns["BB_Width"] = _safe_divide(upper - lower, middle)
+    columns["BB_Percent"] = _safe_divide(c - lower, upper - lower)
+
+    columns["ATR"] = atr(h, lo, c)
+    columns["+DI"], columns["-DI"], columns["ADX"] = _directional(h, lo, c, 14)
+    columns["OBV"] = obv(c, v)
+
+    intraday = isinstance(df.index, pd.DatetimeIndex) and (
+        df.index != df.index.normalize()
+    ).any()
+    sessions = df.index.normalize() if intraday else None
+    columns["VWAP"] = vwap(h, lo, c, v, sessions)
+
+    columns["Vol_SMA"] = _rolling(v, 20, "mean")
+    columns["Rel_Vol"] = _safe_divide(v, columns["Vol_SMA"])
+
+    for name, values in columns.items():
+        out[name] = values
+    return out
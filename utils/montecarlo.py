@@ -0,0 +1,444 @@
+"""
+Monte Carlo Helpers for Money Talks
+
+Provides a vectorized Monte Carlo engine for long-horizon projections:
+wealth accumulation with contributions and tax drag, retirement withdrawals
+and required minimum distributions, and multi-asset portfolios with
+rebalancing.
+
+Every path is simulated at once as a (paths x years) matrix, stepping
+through the years with NumPy operations on whole columns, so 100,000 paths
+over 40 years take about a second. Paths are processed in chunks to cap
+memory, and random numbers are drawn per fixed block of paths from a
+seeded SeedSequence, so a given seed gives the same paths whatever the
+chunk size. Scenarios run with the same seed see the same market, which
+makes comparisons (Roth vs Traditional, 60/40 vs 80/20) paired and far
+less noisy.
+"""
+
+import math
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+
+RETURN_MODELS = ("normal", "lognormal", "bootstrap")
+
+# Paths per random-number block; chunks are whole blocks so results do not
+# depend on the chunk size
+_BLOCK = 4096
+
+RMD_START_AGE = 73
+
+# IRS Uniform Lifetime Table (2022+): age -> distribution period
+UNIFORM_LIFETIME = {
+    72: 27.4, 73: 26.5, 74: 25.5, 75: 24.6, 76: 23.7, 77: 22.9, 78: 22.0, 79: 21.1,
+    80: 20.2, 81: 19.4, 82: 18.5, 83: 17.7, 84: 16.8, 85: 16.0, 86: 15.2, 87: 14.4,
+    88: 13.7, 89: 12.9, 90: 12.2, 91: 11.5, 92: 10.8, 93: 10.1, 94: 9.5, 95: 8.9,
+    96: 8.4, 97: 7.8, 98: 7.3, 99: 6.8, 100: 6.4, 101: 6.0, 102: 5.6, 103: 5.2,
+    104: 4.9, 105: 4.6, 106: 4.3, 107: 4.1, 108: 3.9, 109: 3.7, 110: 3.5, 111: 3.4,
+    112: 3.3, 113: 3.1, 114: 3.0, 115: 2.9, 116: 2.8, 117: 2.7, 118: 2.5, 119: 2.3,
+    120: 2.0,
+}
+
+
+def annual_returns(prices: pd.Series) -> np.ndarray:
+    """
+    Calendar-year returns of a price series, for bootstrap simulations.
+
+    Args:
+        prices: Daily (or any frequency) prices with a DatetimeIndex
+
+    Returns:
+        Array of yearly simple returns (partial first/last years included)
+
+    Example:
+        >>> spy = fetch_stock_data("SPY", period="max")
+        >>> history = annual_returns(spy["Close"])
+    """
+    yearly = prices.groupby(prices.index.year).last()
+    first = prices.iloc[0]
+    return np.diff(np.r_[first, yearly.to_numpy()]) / np.r_[first, yearly.to_numpy()[:-1]]
+
+
+def _blocks(n_paths: int, seed) -> list[tuple[int, int, np.random.SeedSequence]]:
+    """(start, size, seed) for each fixed-size block of paths."""
+    sizes = [min(_BLOCK, n_paths - start) for start in range(0, n_paths, _BLOCK)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    return [(i * _BLOCK, size, s) for i, (size, s) in enumerate(zip(sizes, seeds))]
+
+
+def _chunks(n_paths: int, seed, chunk_size: int):
+    """Yield (start, stop, [seed per block]) covering all paths, whole blocks at a time."""
+    blocks = _blocks(n_paths, seed)
+    per_chunk = max(1, chunk_size // _BLOCK)
+    for i in range(0, len(blocks), per_chunk):
+        group = blocks[i:i + per_chunk]
+        yield group[0][0], group[-1][0] + group[-1][1], group
+
+
+def _draw(
+    seeds: list,
+    steps: int,
+    mean: float,
+    volatility: float,
+    model: str,
+    history: Optional[np.ndarray],
+    block_size: int,
+) -> np.ndarray:
+    """(paths x steps) simple returns for a group of blocks."""
+    out = []
+    for _, size, seed in seeds:
+        rng = np.random.default_rng(seed)
+        if model == "normal":
+            out.append(rng.normal(mean, volatility, (size, steps)))
+        elif model == "lognormal":
+            # Match the arithmetic mean and volatility of the simple returns
+            sigma2 = math.log(1 + volatility ** 2 / (1 + mean) ** 2)
+            mu = math.log(1 + mean) - sigma2 / 2
+            out.append(np.expm1(rng.normal(mu, math.sqrt(sigma2), (size, steps))))
+        else:
+            n_blocks = -(-steps // block_size)
+            starts = rng.integers(0, len(history) - block_size + 1, (size, n_blocks))
+            idx = (starts[:, :, None] + np.arange(block_size)).reshape(size, -1)[:, :steps]
+            out.append(history[idx])
+    return np.concatenate(out) if len(out) > 1 else out[0]
+
+
+def _check_model(model: str, history, block_size: int) -> Optional[np.ndarray]:
+    if model not in RETURN_MODELS:
+        raise ValueError(f"Unknown return model: {model}. Use {', '.join(RETURN_MODELS)}")
+    if model != "bootstrap":
+        return None
+    if history is None:
+        raise ValueError("model='bootstrap' needs a history of returns to resample")
+    history = np.asarray(history, dtype=np.float64)
+    history = history[~np.isnan(history)]
+    if len(history) < block_size:
+        raise ValueError(f"History has {len(history)} returns, fewer than block_size={block_size}")
+    return history
+
+
+def simulate_returns(
+    n_paths: int,
+    years: int,
+    mean: float = 0.07,
+    volatility: float = 0.15,
+    model: str = "lognormal",
+    history: Union[np.ndarray, pd.Series, None] = None,
+    block_size: int = 1,
+    seed: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Draw a (paths x years) matrix of annual returns.
+
+    Args:
+        n_paths: Number of simulated paths
+        years: Years per path
+        mean: Expected annual return (normal and lognormal models)
+        volatility: Annual standard deviation of returns
+        model: 'lognormal' (default; returns never fall below -100%),
+            'normal', or 'bootstrap' (resample ``history``)
+        history: Past annual returns to resample in bootstrap mode
+        block_size: Consecutive years drawn together when bootstrapping,
+            to keep runs of good and bad years
+        seed: Seed for reproducible paths
+
+    Returns:
+        Array of simple returns, shape (n_paths, years)
+
+    Example:
+        >>> r = simulate_returns(10_000, 30, seed=42)
+        >>> r.mean(), r.std()
+        (0.07..., 0.15...)
+    """
+    history = _check_model(model, history, block_size)
+    blocks = _blocks(n_paths, seed)
+    return _draw(blocks, years, mean, volatility, model, history, block_size)
+
+
+class SimulationResult:
+    """
+    Outcome of a Monte Carlo projection.
+
+    Attributes:
+        balances: (paths x periods+1) account value at the start of each
+            period, plus the final value
+        withdrawn: Total gross withdrawals per path
+        taxes: Total taxes paid per path (withdrawal tax plus tax drag)
+        contributed: Total contributions (the same for every path)
+        depleted: Period in which each path ran out of money (-1 if never)
+    """
+
+    def __init__(
+        self,
+        balances: np.ndarray,
+        withdrawn: np.ndarray,
+        taxes: np.ndarray,
+        contributed: float,
+        depleted: np.ndarray,
+        index_name: str = "Year",
+        periods_per_year: int = 1,
+    ):
+        self.balances = balances
+        self.withdrawn = withdrawn
+        self.taxes = taxes
+        self.contributed = contributed
+        self.depleted = depleted
+        self.index_name = index_name
+        self.periods_per_year = periods_per_year
+
+    @property
+    def n_paths(self) -> int:
+        return self.balances.shape[0]
+
+    @property
+    def final(self) -> np.ndarray:
+        """Ending balance of every path."""
+        return self.balances[:, -1]
+
+    @property
+    def success_rate(self) -> float:
+        """Fraction of paths that never ran out of money."""
+        return float((self.depleted < 0).mean())
+
+    def percentiles(self, q: Sequence[float] = (5, 25, 50, 75, 95)) -> pd.DataFrame:
+        """
+        Balance percentiles across paths for every period.
+
+        Args:
+            q: Percentiles to report (0-100)
+
+        Returns:
+            DataFrame indexed by period with one 'P<q>' column per percentile
+
+        Example:
+            >>> fan = result.percentiles()
+            >>> plt.fill_between(fan.index, fan["P5"], fan["P95"], alpha=0.2)
+            >>> plt.plot(fan.index, fan["P50"])
+        """
+        values = np.percentile(self.balances, q, axis=0).T
+        index = pd.RangeIndex(self.balances.shape[1], name=self.index_name)
+        return pd.DataFrame(values, index=index, columns=[f"P{p:g}" for p in q])
+
+    def summary(self) -> pd.Series:
+        """
+        Headline statistics.
+
+        Returns:
+            Series with Paths, Median Final, Mean Final, P5 Final, P95 Final,
+            Success Rate %, Total Contributed, Median Withdrawn and Median Taxes
+        """
+        final = self.final
+        return pd.Series({
+            "Paths": self.n_paths,
+            "Median Final": float(np.median(final)),
+            "Mean Final": float(final.mean()),
+            "P5 Final": float(np.percentile(final, 5)),
+            "P95 Final": float(np.percentile(final, 95)),
+            "Success Rate %": self.success_rate * 100,
+            "Total Contributed": self.contributed,
+            "Median Withdrawn": float(np.median(self.withdrawn)),
+            "Median Taxes": float(np.median(self.taxes)),
+        })
+
+    def __repr__(self) -> str:
+        return (
+            f"SimulationResult({self.n_paths} paths x {self.balances.shape[1] - 1} "
+            f"{self.index_name.lower()}s, median final {np.median(self.final):,.0f})"
+        )
+
+
+def simulate_wealth(
+    initial: float = 0.0,
+    years: int = 30,
+    contribution: float = 0.0,
+    contribution_growth: float = 0.0,
+    contribution_years: Optional[int] = None,
+    withdrawal: float = 0.0,
+    withdrawal_start: int = 0,
+    withdrawal_growth: float = 0.0,
+    tax_drag: float = 0.0,
+    withdrawal_tax: float = 0.0,
+    start_age: Optional[int] = None,
+    rmd: bool = False,
+    mean: float = 0.07,
+    volatility: float = 0.15,
+    model: str = "lognormal",
+    history: Union[np.ndarray, pd.Series, None] = None,
+    block_size: int = 1,
+    n_paths: int = 10_000,
+    seed: Optional[int] = None,
+    chunk_size: int = 100_000,
+) -> SimulationResult:
+    """
+    Monte Carlo projection of one account over many years.
+
+    Each year, in order: the contribution is added, the withdrawal (or the
+    RMD, if larger) is taken out and taxed, then the year's return minus
+    any tax drag is applied. Balances never go below zero.
+
+    Args:
+        initial: Starting balance
+        years: Years to project
+        contribution: Contribution in the first year
+        contribution_growth: Yearly growth of the contribution (e.g. 0.03)
+        contribution_years: Years of contributions (default: every year)
+        withdrawal: Yearly withdrawal once withdrawals begin
+        withdrawal_start: Year (0-based) in which withdrawals begin
+        withdrawal_growth: Yearly growth of the withdrawal (inflation)
+        tax_drag: Return lost to taxes each year in a taxable account
+        withdrawal_tax: Tax rate on withdrawals (Traditional IRA/401k)
+        start_age: Age in year 0; needed for RMDs
+        rmd: Take at least the required minimum distribution from age 73
+        mean: Expected annual return
+        volatility: Annual standard deviation of returns
+        model: 'lognormal', 'normal' or 'bootstrap' (see simulate_returns)
+        history: Past annual returns for bootstrap mode
+        block_size: Years per bootstrap block
+        n_paths: Number of simulated paths
+        seed: Seed for reproducible paths
+        chunk_size: Paths simulated at once (caps memory)
+
+    Returns:
+        SimulationResult
+
+    Example:
+        >>> roth = simulate_wealth(contribution=7000, years=30, seed=1)
+        >>> trad = simulate_wealth(contribution=7000 / (1 - 0.24), years=30, seed=1)
+        >>> (roth.final > trad.final * (1 - 0.22)).mean()   # paired comparison
+    """
+    history = _check_model(model, history, block_size)
+    if rmd and start_age is None:
+        raise ValueError("rmd=True needs start_age to know when RMDs begin")
+
+    t = np.arange(years)
+    n_contrib = years if contribution_years is None else min(contribution_years, years)
+    contributions = np.where(t < n_contrib, contribution * (1 + contribution_growth) ** t, 0.0)
+    withdrawals = np.where(
+        t >= withdrawal_start, withdrawal * (1 + withdrawal_growth) ** (t - withdrawal_start), 0.0
+    )
+    divisors = None
+    if rmd:
+        ages = start_age + t
+        divisors = np.array([
+            UNIFORM_LIFETIME[min(age, 120)] if age >= RMD_START_AGE else np.inf for age in ages
+        ])
+
+    balances = np.empty((n_paths, years + 1))
+    withdrawn = np.zeros(n_paths)
+    taxes = np.zeros(n_paths)
+    depleted = np.full(n_paths, -1, dtype=np.int64)
+
+    for start, stop, seeds in _chunks(n_paths, seed, chunk_size):
+        returns = _draw(seeds, years, mean, volatility, model, history, block_size)
+        returns -= tax_drag
+        balance = np.full(stop - start, float(initial))
+        out = balances[start:stop]
+        out[:, 0] = balance
+        gone = depleted[start:stop]
+        for year in range(years):
+            balance += contributions[year]
+            if withdrawals[year] or divisors is not None:
+                wanted = withdrawals[year]
+                if divisors is not None:
+                    wanted = np.maximum(wanted, balance / divisors[year])
+                gross = np.minimum(balance, wanted)
+                balance -= gross
+                withdrawn[start:stop] += gross
+                taxes[start:stop] += gross * withdrawal_tax
+            if tax_drag:
+                taxes[start:stop] += balance * tax_drag
+            balance *= 1 + returns[:, year]
+            np.maximum(balance, 0.0, out=balance)
+            gone[(balance <= 0) & (gone < 0)] = year
+            out[:, year + 1] = balance
+
+    return SimulationResult(balances, withdrawn, taxes, float(contributions.sum()), depleted)
+
+
+def simulate_portfolio(
+    weights: Sequence[float],
+    mean: Sequence[float],
+    volatility: Sequence[float],
+    correlation: Optional[np.ndarray] = None,
+    years: int = 10,
+    periods_per_year: int = 12,
+    rebalance_every: Optional[int] = None,
+    band: Optional[float] = None,
+    initial: float = 100_000,
+    n_paths: int = 10_000,
+    seed: Optional[int] = None,
+    chunk_size: int = 100_000,
+) -> SimulationResult:
+    """
+    Monte Carlo of a multi-asset portfolio under a rebalancing rule.
+
+    Asset returns are drawn each period from a multivariate normal with the
+    given annual means, volatilities and correlations. Holdings drift with
+    returns and are reset to the target weights every ``rebalance_every``
+    periods, and/or whenever any weight drifts more than ``band`` from its
+    target.
+
+    Args:
+        weights: Target weights (sum to 1)
+        mean: Expected annual return per asset
+        volatility: Annual volatility per asset
+        correlation: Asset correlation matrix (default: uncorrelated)
+        years: Years to simulate
+        periods_per_year: Steps per year (12 = monthly)
+        rebalance_every: Periods between calendar rebalances (None = never)
+        band: Drift threshold for rebalancing, e.g. 0.05 for +/-5 points
+        initial: Starting portfolio value
+        n_paths: Number of simulated paths
+        seed: Seed for reproducible paths
+        chunk_size: Paths simulated at once (caps memory)
+
+    Returns:
+        SimulationResult indexed by period
+
+    Example:
+        >>> args = dict(weights=[0.6, 0.4], mean=[0.10, 0.04], volatility=[0.15, 0.05], seed=42)
+        >>> never = simulate_portfolio(**args)
+        >>> annual = simulate_portfolio(**args, rebalance_every=12)
+        >>> pd.DataFrame({"Never": never.summary(), "Annual": annual.summary()})
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    n_assets = len(weights)
+    mu = np.asarray(mean, dtype=np.float64) / periods_per_year
+    sigma = np.asarray(volatility, dtype=np.float64) / math.sqrt(periods_per_year)
+    corr = np.eye(n_assets) if correlation is None else np.asarray(correlation, dtype=np.float64)
+    chol = np.linalg.cholesky(corr) * sigma[:, None]
+    steps = years * periods_per_year
+
+    balances = np.empty((n_paths, steps + 1))
+    depleted = np.full(n_paths, -1, dtype=np.int64)
+    for start, stop, seeds in _chunks(n_paths, seed, chunk_size):
+        z = np.concatenate([
+            np.random.default_rng(s).standard_normal((size, steps, n_assets)) for _, size, s in seeds
+        ])
+        returns = mu + z @ chol.T
+        holdings = np.outer(np.full(stop - start, float(initial)), weights)
+        out = balances[start:stop]
+        out[:, 0] = initial
+        for step in range(steps):
+            holdings *= 1 + returns[:, step]
+            np.maximum(holdings, 0.0, out=holdings)
+            total = holdings.sum(axis=1)
+            out[:, step + 1] = total
+            calendar = rebalance_every is not None and (step + 1) % rebalance_every == 0
+            if calendar:
+                holdings = np.outer(total, weights)
+            elif band is not None:
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    drift = np.abs(holdings / total[:, None] - weights).max(axis=1) > band
+                holdings[drift] = np.outer(total[drift], weights)
+        gone = depleted[start:stop]
+        empty = out[:, 1:] <= 0
+        gone[empty.any(axis=1)] = empty.argmax(axis=1)[empty.any(axis=1)]
+
+    return SimulationResult(
+        balances, np.zeros(n_paths), np.zeros(n_paths), 0.0, depleted,
+        index_name="Period", periods_per_year=periods_per_year,
+    )
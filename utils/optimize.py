@@ -0,0 +1,392 @@
+"""
+Parameter Optimization Helpers for Money Talks
+
+Provides a parallel parameter-sweep runner and walk-forward optimizer for
+strategies.
+
+A strategy is a top-level function taking one ticker's price arrays plus
+keyword parameters and returning a position array (1 = long, 0 = flat,
+-1 = short, decided at each bar's close):
+
+    def ema_cross(bars, fast=20, slow=50):
+        close = bars["Close"]
+        return (ema(close, fast) > sma(close, slow)).astype(float)
+
+The sweep fans (parameter set x ticker) tasks out over a process pool.
+Price arrays are placed once in shared memory that workers attach to, so
+tasks only carry a few indexes instead of pickled DataFrames. Finished
+results can be appended to a checkpoint file so an interrupted run resumes
+where it stopped.
+"""
+
+import hashlib
+import itertools
+import json
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .panel import Panel
+
+
+FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+# Worker-process state set up by _init_worker
+_worker: dict = {}
+
+
+def parameter_grid(**params) -> list[dict]:
+    """
+    Every combination of the given parameter values.
+
+    Example:
+        >>> parameter_grid(fast=[10, 20], slow=[50, 100])
+        [{'fast': 10, 'slow': 50}, {'fast': 10, 'slow': 100},
+         {'fast': 20, 'slow': 50}, {'fast': 20, 'slow': 100}]
+    """
+    names = list(params)
+    return [dict(zip(names, values)) for values in itertools.product(*params.values())]
+
+
+def walk_forward_splits(
+    n_bars: int,
+    train: int,
+    test: int,
+    step: Optional[int] = None,
+    anchored: bool = False,
+) -> list[tuple[slice, slice]]:
+    """
+    Rolling (or anchored) train/test windows over a history.
+
+    Args:
+        n_bars: Length of the history
+        train: Bars in each training window
+        test: Bars in each out-of-sample test window
+        step: Bars to move forward between splits (default: test)
+        anchored: If True, every training window starts at bar 0
+
+    Returns:
+        List of (train_slice, test_slice)
+
+    Example:
+        >>> walk_forward_splits(1000, train=500, test=100)[:2]
+        [(slice(0, 500), slice(500, 600)), (slice(100, 600), slice(600, 700))]
+    """
+    step = step or test
+    splits = []
+    start = 0
+    while start + train + test <= n_bars:
+        train_start = 0 if anchored else start
+        splits.append((slice(train_start, start + train), slice(start + train, start + train + test)))
+        start += step
+    return splits
+
+
+# ----------------------------------------------------------------------
+# Metrics
+# ----------------------------------------------------------------------
+
+
+def position_metrics(
+    close: np.ndarray,
+    positions: np.ndarray,
+    window: slice = slice(None),
+    costs: float = 0.0,
+    periods_per_year: int = 252,
+) -> dict:
+    """
+    Performance of a position series over a window of bars.
+
+    Positions are decided at each close and earn the next bar's return, the
+    same convention as utils.backtest.
+
+    Returns:
+        Dict with total_return, sharpe, max_drawdown and trades
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bar_returns = np.nan_to_num(close[1:] / close[:-1] - 1)
+    pos = np.nan_to_num(np.asarray(positions, dtype=float))
+    turnover = np.abs(np.diff(pos, prepend=0.0))[:-1]
+    strategy = pos[:-1] * bar_returns - turnover * costs
+
+    # Bar i's return is earned between close i and close i + 1
+    start, stop, _ = window.indices(len(close))
+    r = strategy[start:max(start, stop - 1)]
+    if len(r) == 0:
+        return {"total_return": 0.0, "sharpe": np.nan, "max_drawdown": 0.0, "trades": 0}
+
+    growth = np.cumprod(1 + r)
+    std = r.std(ddof=1) if len(r) > 1 else 0.0
+    return {
+        "total_return": float(growth[-1] - 1),
+        "sharpe": float(r.mean() / std * math.sqrt(periods_per_year)) if std > 0 else np.nan,
+        "max_drawdown": float((growth / np.maximum.accumulate(growth) - 1).min()),
+        "trades": int(np.count_nonzero(np.diff(pos[start:stop]) > 0)),
+    }
+
+
+# ----------------------------------------------------------------------
+# Workers
+# ----------------------------------------------------------------------
+
+
+def _init_worker(shm_name, shape, dtype, fields, strategy, windows, costs, periods_per_year):
+    """Attach to the shared price block once per worker process."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker.update(
+        shm=shm,  # keep a reference so the buffer stays mapped
+        prices=np.ndarray(shape, dtype=dtype, buffer=shm.buf),
+        fields=fields,
+        strategy=strategy,
+        windows=windows,
+        costs=costs,
+        periods_per_year=periods_per_year,
+    )
+
+
+def _run_batch(batch: list[tuple[int, dict, int]]) -> list[dict]:
+    """Evaluate (param_id, params, ticker column) tasks against shared prices."""
+    prices = _worker["prices"]
+    fields = _worker["fields"]
+    close_row = fields.index("Close")
+    rows = []
+    for param_id, params, col in batch:
+        bars = {f: prices[i, :, col] for i, f in enumerate(fields)}
+        valid = ~np.isnan(bars["Close"])
+        first = int(np.argmax(valid)) if valid.any() else len(valid)
+        # Strategies see only the ticker's listed history
+        bars = {f: a[first:] for f, a in bars.items()}
+        try:
+            positions = np.asarray(_worker["strategy"](bars, **params), dtype=float)
+            error = None
+        except Exception as e:
+            positions, error = None, f"{type(e).__name__}: {e}"
+
+        for name, window in _worker["windows"].items():
+            row = {"param_id": param_id, "column": col, "window": name}
+            if error is not None:
+                row["error"] = error
+            else:
+                start, stop, _ = window.indices(prices.shape[1])
+                shifted = slice(max(start - first, 0), max(stop - first, 0))
+                row.update(position_metrics(
+                    prices[close_row, first:, col], positions, shifted,
+                    _worker["costs"], _worker["periods_per_year"],
+                ))
+            rows.append(row)
+    return rows
+
+
+# ----------------------------------------------------------------------
+# Sweep runner
+# ----------------------------------------------------------------------
+
+
+def _config_hash(strategy: Callable, windows: dict, costs: float, periods_per_year: int) -> str:
+    """Fingerprint of everything besides params and ticker that shapes a result."""
+    config = {
+        "strategy": f"{strategy.__module__}.{strategy.__qualname__}",
+        "windows": {name: [w.start, w.stop, w.step] for name, w in windows.items()},
+        "costs": costs,
+        "periods_per_year": periods_per_year,
+    }
+    return hashlib.sha1(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()[:12]
+
+
+def _task_key(params: dict, ticker: str, config: str) -> str:
+    return json.dumps([params, ticker, config], sort_keys=True, default=str)
+
+
+def sweep(
+    strategy: Callable,
+    data: Union[Panel, dict[str, pd.DataFrame]],
+    grid: Union[list[dict], dict],
+    n_jobs: Optional[int] = None,
+    splits: Optional[list[tuple[slice, slice]]] = None,
+    checkpoint: Optional[Union[str, Path]] = None,
+    costs: float = 0.0,
+    periods_per_year: int = 252,
+    batch_size: int = 16,
+) -> pd.DataFrame:
+    """
+    Evaluate a strategy for every parameter set on every ticker, in parallel.
+
+    Args:
+        strategy: Top-level function ``strategy(bars, **params) -> positions``
+            where bars maps field name to a 1-D NumPy array
+        data: Panel or dict mapping ticker to OHLCV DataFrame
+        grid: List of parameter dicts, or a dict of lists (see parameter_grid)
+        n_jobs: Worker processes (default: all cores; 1 runs in-process)
+        splits: Optional walk-forward (train, test) slices; metrics are then
+            reported per window as 'train_0', 'test_0', ... instead of 'full'
+        checkpoint: JSONL file to append results to; completed tasks found
+            there for the same strategy, splits and costs are skipped, so an
+            interrupted sweep can be resumed
+        costs: Commission plus slippage as a fraction of traded value
+        periods_per_year: Bars per year, for annualized Sharpe
+        batch_size: Tasks sent to a worker at a time
+
+    Returns:
+        DataFrame with one row per (parameter set, ticker, window): the
+        parameters, ticker, window, total_return, sharpe, max_drawdown, trades
+
+    Example:
+        >>> results = sweep(ema_cross, panel,
+        ...                 parameter_grid(fast=[5, 10, 20], slow=[50, 100, 200]))
+        >>> results.groupby(["fast", "slow"])["sharpe"].mean().sort_values()
+    """
+    panel = data if isinstance(data, Panel) else Panel.from_frames(data)
+    grid = parameter_grid(**grid) if isinstance(grid, dict) else list(grid)
+    fields = tuple(f for f in FIELDS if f in panel.fields)
+
+    windows = {"full": slice(None)}
+    if splits:
+        windows = {}
+        for i, (train, test) in enumerate(splits):
+            windows[f"train_{i}"] = train
+            windows[f"test_{i}"] = test
+
+    # Resume from checkpoint; keys include the config, so rows from a run
+    # with another strategy, splits or costs are not reused
+    config = _config_hash(strategy, windows, costs, periods_per_year)
+    done: dict[str, list[dict]] = {}
+    if checkpoint is not None and Path(checkpoint).exists():
+        for line in Path(checkpoint).read_text().splitlines():
+            if line.strip():
+                record = json.loads(line)
+                done.setdefault(record["key"], []).extend(record["rows"])
+
+    tasks = []
+    for param_id, params in enumerate(grid):
+        for col, ticker in enumerate(panel.tickers):
+            if _task_key(params, ticker, config) not in done:
+                tasks.append((param_id, params, col))
+    batches = [tasks[i:i + batch_size] for i in range(0, len(tasks), batch_size)]
+
+    # Stack fields into one (fields x dates x tickers) block in shared memory
+    stacked = np.stack([panel[f].to_numpy(dtype=np.float64) for f in fields])
+    shm = shared_memory.SharedMemory(create=True, size=max(stacked.nbytes, 1))
+    try:
+        shared = np.ndarray(stacked.shape, dtype=stacked.dtype, buffer=shm.buf)
+        shared[:] = stacked
+        del stacked
+        initargs = (shm.name, shared.shape, shared.dtype, fields, strategy,
+                    windows, costs, periods_per_year)
+
+        out = open(checkpoint, "a") if checkpoint is not None else None
+        try:
+            def record(rows: list[dict]) -> None:
+                by_task: dict[tuple, list[dict]] = {}
+                for row in rows:
+                    by_task.setdefault((row["param_id"], row["column"]), []).append(row)
+                for (param_id, col), task_rows in by_task.items():
+                    key = _task_key(grid[param_id], panel.tickers[col], config)
+                    clean = [{k: v for k, v in r.items() if k not in ("param_id", "column")}
+                             for r in task_rows]
+                    done[key] = clean
+                    if out is not None:
+                        out.write(json.dumps({"key": key, "rows": clean}, default=str) + "\n")
+                if out is not None:
+                    out.flush()
+
+            workers = n_jobs or os.cpu_count() or 1
+            if workers == 1 or len(batches) <= 1:
+                _init_worker(*initargs)
+                try:
+                    for batch in batches:
+                        record(_run_batch(batch))
+                finally:
+                    _worker.clear()
+            else:
+                with ProcessPoolExecutor(
+                    max_workers=workers, initializer=_init_worker, initargs=initargs
+                ) as pool:
+                    futures = [pool.submit(_run_batch, batch) for batch in batches]
+                    for future in as_completed(futures):
+                        record(future.result())
+        finally:
+            if out is not None:
+                out.close()
+    finally:
+        shm.close()
+        shm.unlink()
+
+    rows = []
+    for params in grid:
+        for ticker in panel.tickers:
+            for row in done.get(_task_key(params, ticker, config), []):
+                rows.append({**params, "ticker": ticker, **row})
+    return pd.DataFrame(rows)
+
+
+def walk_forward(
+    strategy: Callable,
+    data: Union[Panel, dict[str, pd.DataFrame]],
+    grid: Union[list[dict], dict],
+    train: int,
+    test: int,
+    step: Optional[int] = None,
+    anchored: bool = False,
+    metric: str = "sharpe",
+    **sweep_kwargs,
+) -> pd.DataFrame:
+    """
+    Walk-forward optimization: pick the best parameters on each training
+    window and report how they did on the following out-of-sample window.
+
+    Args:
+        strategy: Strategy function (see sweep)
+        data: Panel or dict of DataFrames
+        grid: Parameter grid
+        train: Training window length in bars
+        test: Test window length in bars
+        step: Bars between splits (default: test)
+        anchored: Expanding rather than rolling training windows
+        metric: Metric to maximize on the training window
+        **sweep_kwargs: Passed to sweep (n_jobs, checkpoint, costs, ...)
+
+    Returns:
+        DataFrame with one row per (ticker, split): the chosen parameters,
+        the in-sample metric and the out-of-sample metrics
+
+    Example:
+        >>> wf = walk_forward(ema_cross, panel, {"fast": [10, 20], "slow": [50, 100]},
+        ...                   train=504, test=126)
+        >>> wf.groupby("ticker")["test_total_return"].sum()
+    """
+    panel = data if isinstance(data, Panel) else Panel.from_frames(data)
+    splits = walk_forward_splits(len(panel.index), train, test, step, anchored)
+    if not splits:
+        raise ValueError(f"History of {len(panel.index)} bars is too short for train={train}, test={test}")
+
+    results = sweep(strategy, panel, grid, splits=splits, **sweep_kwargs)
+    if "error" in results:
+        results = results[results["error"].isna()]
+    param_names = list(parameter_grid(**grid)[0] if isinstance(grid, dict) else grid[0])
+
+    rows = []
+    for i, (train_slice, test_slice) in enumerate(splits):
+        in_sample = results[results["window"] == f"train_{i}"].dropna(subset=[metric])
+        out_sample = results[results["window"] == f"test_{i}"]
+        if in_sample.empty:
+            continue
+        best = in_sample.loc[in_sample.groupby("ticker")[metric].idxmax()]
+        merged = best.merge(out_sample, on=["ticker", *param_names], suffixes=("_train", "_test"))
+        for _, r in merged.iterrows():
+            rows.append({
+                "ticker": r["ticker"],
+                "split": i,
+                "test_start": panel.index[test_slice.start],
+                **{p: r[p] for p in param_names},
+                f"train_{metric}": r[f"{metric}_train"],
+                "test_total_return": r["total_return_test"],
+                "test_sharpe": r["sharpe_test"],
+                "test_max_drawdown": r["max_drawdown_test"],
+            })
+    return pd.DataFrame(rows)
@@ -0,0 +1,521 @@
+"""
+Options Helpers for Money Talks
+
+Provides array-based Black-Scholes pricing, Greeks and implied volatility
+for whole option chains, plus payoff grids for multi-leg strategies.
+
+Every function broadcasts over NumPy arrays, so one call prices every strike
+and expiry of a chain (or of hundreds of chains stacked together) at a few
+million options per second. Implied volatility is solved for all options at
+once with Newton steps, falling back to bisection wherever Newton would
+leave the bracket.
+
+Conventions follow the class 3 options lessons: one contract covers 100
+shares, theta is per calendar day, and vega and rho are per 1 percentage
+point change in volatility and rates.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+
+ArrayLike = Union[float, np.ndarray, pd.Series]
+OptionType = Union[str, Sequence[str], np.ndarray, pd.Series]
+
+CONTRACT_SIZE = 100
+DAYS_PER_YEAR = 365
+
+# Implied volatility search range
+IV_LOW, IV_HIGH = 1e-4, 5.0
+
+
+# ----------------------------------------------------------------------
+# Normal distribution
+# ----------------------------------------------------------------------
+
+
+def norm_cdf(x: ArrayLike) -> np.ndarray:
+    """
+    Standard normal CDF without SciPy (absolute error below 1e-15).
+
+    Uses Hart's rational approximation (as given by West, 2005).
+    """
+    x = np.asarray(x, dtype=np.float64)
+    z = np.abs(x)
+    e = np.exp(-0.5 * z * z)
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        num = (((((0.0352624965998911 * z + 0.700383064443688) * z + 6.37396220353165) * z
+                 + 33.912866078383) * z + 112.079291497871) * z + 221.213596169931) * z + 220.206867912376
+        den = ((((((0.0883883476483184 * z + 1.75566716318264) * z + 16.064177579207) * z
+                  + 86.7807322029461) * z + 296.564248779674) * z + 637.333633378831) * z
+               + 793.826512519948) * z + 440.413735824752
+        near = e * num / den
+        tail = e / (z + 1 / (z + 2 / (z + 3 / (z + 4 / (z + 0.65))))) / 2.506628274631
+    lower = np.where(z < 7.07106781186547, near, tail)
+    lower = np.where(z > 37, 0.0, lower)
+    return np.where(x > 0, 1 - lower, lower)
+
+
+def norm_pdf(x: ArrayLike) -> np.ndarray:
+    """Standard normal density."""
+    x = np.asarray(x, dtype=np.float64)
+    return np.exp(-0.5 * x * x) / np.sqrt(2 * np.pi)
+
+
+def _is_call(option_type: OptionType) -> np.ndarray:
+    """Boolean array: True for calls, False for puts."""
+    kinds = np.asarray(option_type)
+    if kinds.dtype == bool:
+        return kinds
+    # Compare first letters only; casting to one character is a cheap C loop
+    first = kinds.astype("U1")
+    calls = (first == "c") | (first == "C")
+    if not (calls | (first == "p") | (first == "P")).all():
+        raise ValueError(f"Unknown option type in {np.unique(kinds).tolist()}. Use 'call' or 'put'.")
+    return calls
+
+
+def _d1_d2(S, K, T, r, sigma, q):
+    sqrt_t = np.sqrt(T)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = (np.log(S / K) + (r - q + 0.5 * sigma * sigma) * T) / (sigma * sqrt_t)
+    return d1, d1 - sigma * sqrt_t
+
+
+# ----------------------------------------------------------------------
+# Pricing and Greeks
+# ----------------------------------------------------------------------
+
+
+def black_scholes(
+    S: ArrayLike,
+    K: ArrayLike,
+    T: ArrayLike,
+    r: ArrayLike = 0.04,
+    sigma: ArrayLike = 0.25,
+    option_type: OptionType = "call",
+    q: ArrayLike = 0.0,
+) -> np.ndarray:
+    """
+    Black-Scholes price of European options (per share).
+
+    All arguments broadcast against each other, so pass arrays of strikes,
+    expiries or volatilities to price a whole chain in one call.
+
+    Args:
+        S: Underlying price
+        K: Strike price
+        T: Time to expiry in years (e.g. days / 365)
+        r: Risk-free rate, continuously compounded
+        sigma: Volatility (0.25 = 25%)
+        option_type: 'call', 'put', or an array of them
+        q: Continuous dividend yield
+
+    Returns:
+        Option prices; intrinsic value where T <= 0
+
+    Example:
+        >>> strikes = np.arange(150, 201, 5)
+        >>> black_scholes(175, strikes, 30 / 365, 0.04, 0.28, "call")
+    """
+    S, K, T, r, sigma, q = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (S, K, T, r, sigma, q))
+    )
+    return _price(S, K, T, r, sigma, _is_call(option_type), q)[0]
+
+
+def _price(S, K, T, r, sigma, call, q) -> tuple[np.ndarray, np.ndarray]:
+    """Black-Scholes price and vega (per unit of volatility) from one d1/d2 pass."""
+    d1, d2 = _d1_d2(S, K, T, r, sigma, q)
+    disc_s = S * np.exp(-q * T)
+    disc_k = K * np.exp(-r * T)
+    # N(-x) = 1 - N(x): one CDF evaluation per d serves calls and puts
+    n1, n2 = norm_cdf(np.where(call, d1, -d1)), norm_cdf(np.where(call, d2, -d2))
+    price = np.where(call, disc_s * n1 - disc_k * n2, disc_k * n2 - disc_s * n1)
+    intrinsic = np.where(call, np.maximum(S - K, 0.0), np.maximum(K - S, 0.0))
+    vega = disc_s * norm_pdf(d1) * np.sqrt(T)
+    return np.where(T > 0, price, intrinsic), vega
+
+
+def greeks(
+    S: ArrayLike,
+    K: ArrayLike,
+    T: ArrayLike,
+    r: ArrayLike = 0.04,
+    sigma: ArrayLike = 0.25,
+    option_type: OptionType = "call",
+    q: ArrayLike = 0.0,
+) -> dict[str, np.ndarray]:
+    """
+    Black-Scholes Greeks (per share).
+
+    Args:
+        Same as black_scholes()
+
+    Returns:
+        Dict of arrays: delta, gamma, theta (per calendar day), vega
+        (per 1 vol point) and rho (per 1 rate point)
+
+    Example:
+        >>> g = greeks(175, 180, 30 / 365, 0.04, 0.28, "call")
+        >>> print(f"Delta {g['delta']:.2f}, Theta ${g['theta'] * 100:.2f}/day per contract")
+    """
+    S, K, T, r, sigma, q = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (S, K, T, r, sigma, q))
+    )
+    call = _is_call(option_type)
+    d1, d2 = _d1_d2(S, K, T, r, sigma, q)
+    sqrt_t = np.sqrt(T)
+    div = np.exp(-q * T)
+    disc = np.exp(-r * T)
+    pdf = norm_pdf(d1)
+    cdf_d1, cdf_d2 = norm_cdf(d1), norm_cdf(d2)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gamma = div * pdf / (S * sigma * sqrt_t)
+        decay = -S * div * pdf * sigma / (2 * sqrt_t)
+    theta = np.where(
+        call,
+        decay - r * K * disc * cdf_d2 + q * S * div * cdf_d1,
+        decay + r * K * disc * (1 - cdf_d2) - q * S * div * (1 - cdf_d1),
+    )
+    return {
+        "delta": np.where(call, div * cdf_d1, div * (cdf_d1 - 1)),
+        "gamma": gamma,
+        "theta": theta / DAYS_PER_YEAR,
+        "vega": S * div * pdf * sqrt_t / 100,
+        "rho": np.where(call, K * T * disc * cdf_d2, -K * T * disc * (1 - cdf_d2)) / 100,
+    }
+
+
+def implied_volatility(
+    price: ArrayLike,
+    S: ArrayLike,
+    K: ArrayLike,
+    T: ArrayLike,
+    r: ArrayLike = 0.04,
+    option_type: OptionType = "call",
+    q: ArrayLike = 0.0,
+    tol: float = 1e-8,
+    max_iter: int = 50,
+) -> np.ndarray:
+    """
+    Solve for the volatility that reproduces market prices.
+
+    Every option is solved at once: each iteration takes a Newton step
+    where it stays inside the current [low, high] bracket and bisects
+    where it would not, so deep in- or out-of-the-money options (tiny
+    vega) still converge.
+
+    Args:
+        price: Market option prices (e.g. bid/ask mid)
+        S, K, T, r, option_type, q: As in black_scholes()
+        tol: Relative tolerance: stop once each price is matched to within
+            this fraction of its time value (or the bracket has shrunk to
+            this fraction of sigma)
+        max_iter: Maximum iterations
+
+    Returns:
+        Implied volatilities; NaN where the price is outside the
+        no-arbitrage bounds or the option has expired
+
+    Example:
+        >>> iv = implied_volatility(chain["mid"], 175, chain["strike"], 30 / 365)
+    """
+    price, S, K, T, r, q = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (price, S, K, T, r, q))
+    )
+    call = np.broadcast_to(_is_call(option_type), price.shape)
+    lower = np.where(
+        call,
+        np.maximum(S * np.exp(-q * T) - K * np.exp(-r * T), 0.0),
+        np.maximum(K * np.exp(-r * T) - S * np.exp(-q * T), 0.0),
+    )
+    upper = np.where(call, S * np.exp(-q * T), K * np.exp(-r * T))
+    valid = (T > 0) & (price > lower) & (price < upper)
+    # Volatility only sets the time value, so measure the error against it;
+    # an absolute tolerance would accept the first guess for cheap wings
+    scale = price - lower
+
+    lo = np.full(price.shape, IV_LOW)
+    hi = np.full(price.shape, IV_HIGH)
+    sigma = np.full(price.shape, 0.3)
+    active = valid.copy()
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        idx = np.nonzero(active)
+        args = (S[idx], K[idx], T[idx], r[idx])
+        s = sigma[idx]
+        model, vega = _price(*args, s, call[idx], q[idx])
+        diff = model - price[idx]
+        # Shrink the bracket: price rises with volatility
+        too_high = diff > 0
+        hi[idx] = np.where(too_high, s, hi[idx])
+        lo[idx] = np.where(too_high, lo[idx], s)
+        done = (np.abs(diff) <= tol * scale[idx]) | (hi[idx] - lo[idx] <= tol * s)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Newton on log price: same step near the root, but it keeps
+            # its pace on the steep, convex wings where prices are tiny
+            step = s - np.log(model / price[idx]) * model / vega
+        inside = (step > lo[idx]) & (step < hi[idx]) & np.isfinite(step)
+        sigma[idx] = np.where(done, s, np.where(inside, step, 0.5 * (lo[idx] + hi[idx])))
+        active[idx] = ~done
+    return np.where(valid, sigma, np.nan)
+
+
+# ----------------------------------------------------------------------
+# Chains
+# ----------------------------------------------------------------------
+
+
+def price_chain(
+    chain: pd.DataFrame,
+    spot: float,
+    expiry=None,
+    r: float = 0.04,
+    q: float = 0.0,
+    option_type: Optional[str] = None,
+    now=None,
+) -> pd.DataFrame:
+    """
+    Add mid price, implied volatility and Greeks to an option chain.
+
+    Works on ``yf.Ticker(t).option_chain(expiry).calls`` / ``.puts`` and on
+    several chains concatenated together (one row per contract).
+
+    Args:
+        chain: DataFrame with 'strike' and 'bid'/'ask' (or 'lastPrice')
+            columns, plus optional 'expiration' and 'type' columns
+        spot: Current underlying price
+        expiry: Expiration date for the whole chain (default: the
+            'expiration' column)
+        r: Risk-free rate
+        q: Dividend yield
+        option_type: 'call' or 'put' for the whole chain (default: the
+            'type' column)
+        now: Valuation time (default: now)
+
+    Returns:
+        Copy of chain with mid, dte, iv, delta, gamma, theta, vega and
+        rho columns
+
+    Example:
+        >>> stock = yf.Ticker("AAPL")
+        >>> calls = stock.option_chain(stock.options[0]).calls
+        >>> priced = price_chain(calls, spot=175, expiry=stock.options[0], option_type="call")
+        >>> priced[(priced.delta > 0.2) & (priced.delta < 0.35)]
+    """
+    df = chain.copy()
+    now = pd.Timestamp.now() if now is None else pd.Timestamp(now)
+    expiries = pd.to_datetime(df["expiration"] if expiry is None else pd.Series(expiry, index=df.index))
+    # Options expire at the close (16:00) of the expiration date
+    expiries = expiries.dt.tz_localize(None).dt.normalize() + pd.Timedelta(hours=16)
+    T = np.maximum((expiries - now.tz_localize(None)).dt.total_seconds().to_numpy(), 0) / (DAYS_PER_YEAR * 86400)
+    kinds = df["type"].to_numpy() if option_type is None else option_type
+
+    if {"bid", "ask"} <= set(df.columns):
+        mid = (df["bid"] + df["ask"]) / 2
+        quoted = (df["bid"] > 0) & (df["ask"] > 0)
+        df["mid"] = mid.where(quoted, df.get("lastPrice", mid))
+    else:
+        df["mid"] = df["lastPrice"]
+    df["dte"] = T * DAYS_PER_YEAR
+    df["iv"] = implied_volatility(df["mid"].to_numpy(), spot, df["strike"].to_numpy(), T, r, kinds, q)
+    for name, values in greeks(spot, df["strike"].to_numpy(), T, r, df["iv"].to_numpy(), kinds, q).items():
+        df[name] = values
+    return df
+
+
+def premium_yields(
+    strike: ArrayLike,
+    premium: ArrayLike,
+    spot: ArrayLike,
+    dte: ArrayLike,
+    option_type: OptionType = "call",
+) -> dict[str, np.ndarray]:
+    """
+    Income returns for covered calls (calls) and cash-secured puts (puts).
+
+    Args:
+        strike: Strike prices
+        premium: Premium received per share
+        spot: Underlying price (cost of the shares for covered calls)
+        dte: Days to expiration
+        option_type: 'call' for covered calls, 'put' for cash-secured puts
+
+    Returns:
+        Dict with 'return' (premium / capital at risk), 'annualized' and,
+        for calls, 'if_called' (premium plus gain to the strike), in percent
+
+    Example:
+        >>> y = premium_yields(priced.strike, priced.mid, 175, priced.dte, "call")
+        >>> priced.assign(**y).nlargest(5, "annualized")
+    """
+    strike, premium, spot, dte = (np.asarray(v, dtype=np.float64) for v in (strike, premium, spot, dte))
+    call = _is_call(option_type)
+    capital = np.where(call, spot, strike)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        static = premium / capital
+        annualized = static * DAYS_PER_YEAR / dte
+        if_called = np.where(call, (premium + strike - spot) / spot, np.nan)
+    return {"return": static * 100, "annualized": annualized * 100, "if_called": if_called * 100}
+
+
+# ----------------------------------------------------------------------
+# Multi-leg strategies
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class Leg:
+    """
+    One leg of an options strategy.
+
+    Attributes:
+        kind: 'call', 'put' or 'stock'
+        strike: Strike price (entry price for stock)
+        premium: Premium per share paid (long) or received (short)
+        quantity: Contracts (or 100-share lots for stock); negative = short
+        expiry: Years to expiry, for valuing before expiration
+    """
+
+    kind: str
+    strike: float
+    premium: float = 0.0
+    quantity: float = 1
+    expiry: float = 0.0
+
+
+def payoff(
+    legs: Sequence[Leg],
+    prices: ArrayLike,
+    contract_size: int = CONTRACT_SIZE,
+) -> np.ndarray:
+    """
+    Profit/loss at expiration of a multi-leg position over a price grid.
+
+    Args:
+        legs: Strategy legs
+        prices: Underlying prices at expiration (any shape)
+        contract_size: Shares per contract
+
+    Returns:
+        Dollar P/L with the same shape as prices
+
+    Example:
+        >>> legs = covered_call(cost_basis=170, strike=180, premium=3.50)
+        >>> grid = np.linspace(140, 210, 141)
+        >>> plt.plot(grid, payoff(legs, grid))
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    kinds = np.array([leg.kind for leg in legs])
+    strikes = np.array([leg.strike for leg in legs], dtype=np.float64)
+    premiums = np.array([leg.premium for leg in legs], dtype=np.float64)
+    qty = np.array([leg.quantity for leg in legs], dtype=np.float64)
+
+    p = prices[..., None]
+    value = np.where(
+        kinds == "stock", p - strikes,
+        np.where(kinds == "call", np.maximum(p - strikes, 0.0), np.maximum(strikes - p, 0.0)) - premiums,
+    )
+    return (value * qty).sum(axis=-1) * contract_size
+
+
+def strategy_value(
+    legs: Sequence[Leg],
+    prices: ArrayLike,
+    elapsed: float = 0.0,
+    r: float = 0.04,
+    sigma: float = 0.25,
+    q: float = 0.0,
+    contract_size: int = CONTRACT_SIZE,
+) -> np.ndarray:
+    """
+    Profit/loss of a multi-leg position before expiration.
+
+    Each option leg is marked with Black-Scholes at its remaining time
+    (``leg.expiry - elapsed``), so plotting several ``elapsed`` values shows
+    how the P/L curve converges to the expiry payoff.
+
+    Args:
+        legs: Strategy legs (with expiry set, in years)
+        prices: Underlying prices (any shape)
+        elapsed: Years since the position was opened
+        r: Risk-free rate
+        sigma: Volatility used to mark the options
+        q: Dividend yield
+        contract_size: Shares per contract
+
+    Returns:
+        Dollar P/L with the same shape as prices
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    total = np.zeros(prices.shape)
+    for leg in legs:
+        if leg.kind == "stock":
+            value = prices - leg.strike
+        else:
+            T = max(leg.expiry - elapsed, 0.0)
+            value = black_scholes(prices, leg.strike, T, r, sigma, leg.kind, q) - leg.premium
+        total += value * leg.quantity
+    return total * contract_size
+
+
+def breakevens(legs: Sequence[Leg], prices: ArrayLike) -> np.ndarray:
+    """Underlying prices where the expiry P/L crosses zero, interpolated on the grid."""
+    prices = np.asarray(prices, dtype=np.float64)
+    pnl = payoff(legs, prices)
+    sign = np.sign(pnl)
+    cross = np.nonzero(sign[:-1] * sign[1:] < 0)[0]
+    x0, x1, y0, y1 = prices[cross], prices[cross + 1], pnl[cross], pnl[cross + 1]
+    exact = prices[pnl == 0]
+    return np.unique(np.r_[x0 - y0 * (x1 - x0) / (y1 - y0), exact])
+
+
+def long_call(strike: float, premium: float, contracts: float = 1, expiry: float = 0.0) -> list[Leg]:
+    """Buy calls."""
+    return [Leg("call", strike, premium, contracts, expiry)]
+
+
+def long_put(strike: float, premium: float, contracts: float = 1, expiry: float = 0.0) -> list[Leg]:
+    """Buy puts."""
+    return [Leg("put", strike, premium, contracts, expiry)]
+
+
+def covered_call(
+    cost_basis: float, strike: float, premium: float, contracts: float = 1, expiry: float = 0.0
+) -> list[Leg]:
+    """Own 100 shares per contract and sell calls against them."""
+    return [Leg("stock", cost_basis, 0.0, contracts), Leg("call", strike, premium, -contracts, expiry)]
+
+
+def protective_put(
+    cost_basis: float, strike: float, premium: float, contracts: float = 1, expiry: float = 0.0
+) -> list[Leg]:
+    """Own 100 shares per contract and buy puts to insure them."""
+    return [Leg("stock", cost_basis, 0.0, contracts), Leg("put", strike, premium, contracts, expiry)]
+
+
+def cash_secured_put(strike: float, premium: float, contracts: float = 1, expiry: float = 0.0) -> list[Leg]:
+    """Sell puts with cash set aside to buy the shares."""
+    return [Leg("put", strike, premium, -contracts, expiry)]
+
+
+def vertical_spread(
+    kind: str,
+    long_strike: float,
+    long_premium: float,
+    short_strike: float,
+    short_premium: float,
+    contracts: float = 1,
+    expiry: float = 0.0,
+) -> list[Leg]:
+    """Buy one strike and sell another of the same type (bull/bear call or put spreads)."""
+    return [
+        Leg(kind, long_strike, long_premium, contracts, expiry),
+        Leg(kind, short_strike, short_premium, -contracts, expiry),
+    ]
@@ -0,0 +1,625 @@
+"""
+Order Book Helpers for Money Talks
+
+Provides a limit order book matching engine and an execution simulator for
+the order-execution and day-trading lessons, replacing the "walk a list of
+(price, size) tuples" arithmetic with a real queue.
+
+- OrderBook: price-time priority matching. Prices are integer ticks; each
+  side keeps its price levels in a bisect-sorted list with the best level
+  at the end (O(log n) to find, O(1) to pop), and each level is a FIFO
+  queue. Cancels are O(1): the order is marked dead and skipped when the
+  queue reaches it.
+- Order flow: ``generate_order_flow`` builds seeded synthetic add/cancel/
+  market event arrays; ``OrderBook.process`` replays them.
+- Impact: ``square_root_impact`` (cost grows with sqrt(order / volume)),
+  ``impact_curve`` for walking the book, and ``simulate_execution`` for
+  slicing a parent order over historical bars (TWAP, VWAP or POV).
+
+Example:
+    >>> book = OrderBook.from_levels(asks=[(150.00, 500), (150.02, 800), (150.05, 1200)])
+    >>> fill = book.market("buy", 1000)
+    >>> round(fill.average_price, 4), round(fill.slippage, 4)
+    (150.01, 0.01)
+"""
+
+from bisect import bisect_left, insort
+from collections import deque
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+BUY, SELL = 1, -1
+
+# Event type codes used by process() and generate_order_flow()
+ADD, CANCEL, MARKET = 0, 1, 2
+
+EVENT_DTYPE = np.dtype([
+    ("type", np.int8),
+    ("side", np.int8),
+    ("price", np.float64),
+    ("quantity", np.int64),
+    ("order_id", np.int64),
+])
+
+
+def _side(side: Union[str, int]) -> int:
+    if side in (BUY, "buy", "BUY", "b"):
+        return BUY
+    if side in (SELL, "sell", "SELL", "s"):
+        return SELL
+    raise ValueError(f"Unknown side: {side}. Use 'buy' or 'sell'")
+
+
+class Order:
+    """A resting or completed limit order. Prices are in ticks."""
+
+    __slots__ = ("id", "side", "tick", "quantity", "remaining", "owner")
+
+    def __init__(self, order_id: int, side: int, tick: int, quantity: int, owner=None):
+        self.id = order_id
+        self.side = side
+        self.tick = tick
+        self.quantity = quantity
+        self.remaining = quantity
+        self.owner = owner
+
+    @property
+    def filled(self) -> int:
+        return self.quantity - self.remaining
+
+    def __repr__(self) -> str:
+        side = "buy" if self.side == BUY else "sell"
+        return f"Order({self.id}, {side} {self.remaining}/{self.quantity} @ {self.tick} ticks)"
+
+
+@dataclass
+class Fill:
+    """Result of a market order (or the aggressive part of a limit order)."""
+    side: str
+    requested: int
+    filled: int = 0
+    cost: float = 0.0
+    reference_price: float = float("nan")
+    levels: int = 0
+    trades: list = field(default_factory=list)
+
+    @property
+    def average_price(self) -> float:
+        return self.cost / self.filled if self.filled else float("nan")
+
+    @property
+    def slippage(self) -> float:
+        """Average price minus the best price before the order (per share, signed so worse > 0)."""
+        sign = 1 if self.side == "buy" else -1
+        return sign * (self.average_price - self.reference_price)
+
+    @property
+    def slippage_bps(self) -> float:
+        return self.slippage / self.reference_price * 1e4
+
+    @property
+    def unfilled(self) -> int:
+        return self.requested - self.filled
+
+
+class OrderBook:
+    """
+    Limit order book with price-time priority.
+
+    Args:
+        tick_size: Minimum price increment; prices are rounded to it
+
+    Example:
+        >>> book = OrderBook(tick_size=0.01)
+        >>> bid = book.limit("buy", 149.98, 300)
+        >>> book.limit("sell", 150.02, 500)
+        >>> book.spread
+        0.04
+        >>> book.cancel(bid.id)
+        True
+    """
+
+    def __init__(self, tick_size: float = 0.01):
+        self.tick_size = tick_size
+        # Per side: sorted level keys (tick * side, best last), tick -> FIFO
+        # queue of orders, tick -> resting quantity
+        self._keys = {BUY: [], SELL: []}
+        self._queues = {BUY: {}, SELL: {}}
+        self._volume = {BUY: {}, SELL: {}}
+        self.orders: dict[int, Order] = {}
+        self.trades: list[tuple] = []          # (taker_side, tick, quantity, maker_id, taker_id)
+        self._ids = count(1)
+
+    # -- prices ----------------------------------------------------------
+
+    def to_tick(self, price: float) -> int:
+        return int(round(price / self.tick_size))
+
+    def to_price(self, tick: int) -> float:
+        return round(tick * self.tick_size, 10)
+
+    def _best(self, side: int) -> Optional[int]:
+        keys = self._keys[side]
+        return keys[-1] * side if keys else None
+
+    @property
+    def best_bid(self) -> Optional[float]:
+        tick = self._best(BUY)
+        return None if tick is None else self.to_price(tick)
+
+    @property
+    def best_ask(self) -> Optional[float]:
+        tick = self._best(SELL)
+        return None if tick is None else self.to_price(tick)
+
+    @property
+    def spread(self) -> Optional[float]:
+        bid, ask = self._best(BUY), self._best(SELL)
+        return None if bid is None or ask is None else self.to_price(ask - bid)
+
+    @property
+    def mid(self) -> Optional[float]:
+        bid, ask = self._best(BUY), self._best(SELL)
+        return None if bid is None or ask is None else (bid + ask) * self.tick_size / 2
+
+    def volume_at(self, price: float, side: Union[str, int]) -> int:
+        return self._volume[_side(side)].get(self.to_tick(price), 0)
+
+    # -- order entry -----------------------------------------------------
+
+    def _remove_level(self, side: int, tick: int) -> None:
+        keys = self._keys[side]
+        key = tick * side
+        if keys and keys[-1] == key:
+            keys.pop()
+        else:
+            del keys[bisect_left(keys, key)]
+        del self._queues[side][tick]
+        del self._volume[side][tick]
+
+    def _match(self, side: int, limit: Optional[int], quantity: int, taker_id: int, fill: Optional[Fill]) -> int:
+        """Take liquidity from the opposite side up to a limit tick; returns the remainder."""
+        other = -side
+        keys, queues, volume = self._keys[other], self._queues[other], self._volume[other]
+        orders, trades = self.orders, self.trades
+        while quantity and keys:
+            tick = keys[-1] * other
+            if limit is not None and (tick - limit) * side > 0:
+                break
+            queue = queues[tick]
+            level_start = quantity
+            while quantity and queue:
+                maker = queue[0]
+                if not maker.remaining:                 # cancelled
+                    queue.popleft()
+                    continue
+                take = maker.remaining if maker.remaining < quantity else quantity
+                maker.remaining -= take
+                quantity -= take
+                trades.append((side, tick, take, maker.id, taker_id))
+                if not maker.remaining:
+                    queue.popleft()
+                    del orders[maker.id]
+            traded = level_start - quantity
+            if fill is not None:
+                fill.filled += traded
+                fill.cost += traded * tick * self.tick_size
+                fill.levels += 1
+            left = volume[tick] - traded
+            if left:
+                volume[tick] = left
+            else:
+                keys.pop()
+                del queues[tick], volume[tick]
+        return quantity
+
+    def _rest(self, order: Order) -> None:
+        side, tick = order.side, order.tick
+        queue = self._queues[side].get(tick)
+        if queue is None:
+            insort(self._keys[side], tick * side)
+            queue = self._queues[side][tick] = deque()
+            self._volume[side][tick] = 0
+        queue.append(order)
+        self._volume[side][tick] += order.remaining
+        self.orders[order.id] = order
+
+    def limit(
+        self,
+        side: Union[str, int],
+        price: float,
+        quantity: int,
+        order_id: Optional[int] = None,
+        owner=None,
+    ) -> Order:
+        """
+        Submit a limit order; the marketable part trades, the rest rests.
+
+        Args:
+            side: 'buy' or 'sell'
+            price: Limit price
+            quantity: Shares
+            order_id: Id to use (default: next sequential id)
+            owner: Any tag (e.g. strategy name) kept on the order
+
+        Returns:
+            The Order (remaining == 0 if it filled completely)
+        """
+        side = _side(side)
+        order = Order(next(self._ids) if order_id is None else order_id, side,
+                      self.to_tick(price), int(quantity), owner)
+        order.remaining = self._match(side, order.tick, order.remaining, order.id, None)
+        if order.remaining:
+            self._rest(order)
+        return order
+
+    def market(self, side: Union[str, int], quantity: int, order_id: Optional[int] = None) -> Fill:
+        """
+        Take liquidity until filled or the book runs out.
+
+        Returns:
+            Fill with average price, slippage versus the best price and
+            the trades made
+        """
+        side = _side(side)
+        best = self._best(-side)
+        fill = Fill("buy" if side == BUY else "sell", int(quantity),
+                    reference_price=float("nan") if best is None else self.to_price(best))
+        first = len(self.trades)
+        self._match(side, None, int(quantity), next(self._ids) if order_id is None else order_id, fill)
+        fill.trades = self.trades[first:]
+        return fill
+
+    def cancel(self, order_id: int) -> bool:
+        """Cancel a resting order in O(1); False if it is unknown or already filled."""
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            return False
+        side, tick = order.side, order.tick
+        left = self._volume[side][tick] - order.remaining
+        order.remaining = 0
+        if left:
+            self._volume[side][tick] = left
+        else:
+            self._remove_level(side, tick)
+        return True
+
+    # -- bulk events -----------------------------------------------------
+
+    def process(self, events: np.ndarray) -> int:
+        """
+        Apply an array of events (EVENT_DTYPE) in order.
+
+        ADD rests or matches a limit order with the given id, CANCEL
+        removes one, MARKET takes liquidity. Returns the number of trades.
+
+        Example:
+            >>> book.process(generate_order_flow(1_000_000))
+        """
+        first = len(self.trades)
+        match, rest, cancel, keys = self._match, self._rest, self.cancel, self._keys
+        ticks = np.rint(events["price"] / self.tick_size).astype(np.int64)
+        for kind, side, tick, quantity, order_id in zip(
+            events["type"].tolist(), events["side"].tolist(), ticks.tolist(),
+            events["quantity"].tolist(), events["order_id"].tolist(),
+        ):
+            if kind == ADD:
+                # Most adds don't cross the spread: skip the matcher for them
+                opposite = keys[-side]
+                if opposite and tick * side + opposite[-1] >= 0:
+                    quantity = match(side, tick, quantity, order_id, None)
+                if quantity:
+                    rest(Order(order_id, side, tick, quantity))
+            elif kind == CANCEL:
+                cancel(order_id)
+            else:
+                match(side, None, quantity, order_id, None)
+        return len(self.trades) - first
+
+    # -- views -----------------------------------------------------------
+
+    def depth(self, levels: int = 5) -> pd.DataFrame:
+        """
+        Top price levels on each side.
+
+        Returns:
+            DataFrame with Bid Size, Bid, Ask, Ask Size columns, best first
+        """
+        def side_levels(side):
+            keys = self._keys[side][::-1][:levels]
+            return [(self.to_price(k * side), self._volume[side][k * side]) for k in keys]
+
+        bids, asks = side_levels(BUY), side_levels(SELL)
+        rows = max(len(bids), len(asks))
+        pad = [(np.nan, 0)] * rows
+        bids, asks = (bids + pad)[:rows], (asks + pad)[:rows]
+        return pd.DataFrame({
+            "Bid Size": [s for _, s in bids],
+            "Bid": [p for p, _ in bids],
+            "Ask": [p for p, _ in asks],
+            "Ask Size": [s for _, s in asks],
+        })
+
+    def trades_frame(self) -> pd.DataFrame:
+        """Every trade so far: Side (of the taker), Price, Quantity, Maker, Taker."""
+        if not self.trades:
+            return pd.DataFrame(columns=["Side", "Price", "Quantity", "Maker", "Taker"])
+        side, tick, quantity, maker, taker = map(np.array, zip(*self.trades))
+        return pd.DataFrame({
+            "Side": np.where(side == BUY, "buy", "sell"),
+            "Price": tick * self.tick_size,
+            "Quantity": quantity,
+            "Maker": maker,
+            "Taker": taker,
+        })
+
+    @classmethod
+    def from_levels(
+        cls,
+        bids: Iterable[tuple[float, int]] = (),
+        asks: Iterable[tuple[float, int]] = (),
+        tick_size: float = 0.01,
+    ) -> "OrderBook":
+        """Build a book from (price, size) levels, like the lessons' order_book lists."""
+        book = cls(tick_size)
+        for price, size in bids:
+            book.limit("buy", price, size)
+        for price, size in asks:
+            book.limit("sell", price, size)
+        return book
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def __repr__(self) -> str:
+        return (f"OrderBook(bid={self.best_bid}, ask={self.best_ask}, "
+                f"{len(self._keys[BUY])}+{len(self._keys[SELL])} levels, {len(self.orders)} orders)")
+
+
+# ----------------------------------------------------------------------
+# Synthetic liquidity and order flow
+# ----------------------------------------------------------------------
+
+
+def synthetic_book(
+    mid: float = 100.0,
+    spread: float = 0.02,
+    levels: int = 20,
+    size: int = 500,
+    growth: float = 0.15,
+    tick_size: float = 0.01,
+) -> OrderBook:
+    """
+    Symmetric book with depth growing away from the touch.
+
+    Args:
+        mid: Mid price
+        spread: Bid-ask spread
+        levels: Price levels per side, one tick apart
+        size: Shares at the touch
+        growth: Fractional size increase per level
+
+    Example:
+        >>> impact_curve(synthetic_book(150.0), [100, 1000, 10_000])
+    """
+    sizes = np.round(size * (1 + growth) ** np.arange(levels)).astype(int)
+    offsets = spread / 2 + np.arange(levels) * tick_size
+    return OrderBook.from_levels(
+        bids=zip(mid - offsets, sizes), asks=zip(mid + offsets, sizes), tick_size=tick_size,
+    )
+
+
+def impact_curve(book: OrderBook, sizes: Iterable[int], side: str = "buy") -> pd.DataFrame:
+    """
+    Cost of market orders of several sizes, without changing the book.
+
+    Walks the cumulative depth of the opposite side with searchsorted, so
+    every size is priced against the same snapshot.
+
+    Returns:
+        DataFrame indexed by Size with Filled, Avg Price, Slippage,
+        Slippage (bps) and Levels
+    """
+    side = _side(side)
+    other = -side
+    keys = book._keys[other][::-1]
+    ticks = np.array(keys, dtype=np.int64) * other
+    depth = np.array([book._volume[other][t] for t in ticks.tolist()], dtype=np.int64)
+    prices = ticks * book.tick_size
+    sizes = np.asarray(list(sizes), dtype=np.int64)
+    if not len(depth):
+        raise ValueError("The book has no liquidity on that side")
+
+    cum_qty = np.cumsum(depth)
+    cum_cost = np.cumsum(depth * prices)
+    filled = np.minimum(sizes, cum_qty[-1])
+    level = np.minimum(np.searchsorted(cum_qty, filled, "left"), len(depth) - 1)
+    before_qty = np.where(level > 0, cum_qty[level - 1], 0)
+    before_cost = np.where(level > 0, cum_cost[level - 1], 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        average = (before_cost + (filled - before_qty) * prices[level]) / filled
+    slippage = side * (average - prices[0])
+    return pd.DataFrame({
+        "Filled": filled,
+        "Avg Price": average,
+        "Slippage": slippage,
+        "Slippage (bps)": slippage / prices[0] * 1e4,
+        "Levels": level + 1,
+    }, index=pd.Index(sizes, name="Size"))
+
+
+def generate_order_flow(
+    n_events: int = 100_000,
+    mid: float = 100.0,
+    tick_size: float = 0.01,
+    cancel_rate: float = 0.4,
+    market_rate: float = 0.1,
+    max_offset: int = 20,
+    mean_size: int = 100,
+    seed: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Seeded synthetic order flow around a fixed mid price.
+
+    Limit prices are 1..max_offset ticks from mid on their own side (with
+    occasional marketable ones), cancels target earlier adds at random,
+    and market orders take liquidity.
+
+    Returns:
+        Structured array with EVENT_DTYPE fields, for OrderBook.process
+    """
+    rng = np.random.default_rng(seed)
+    events = np.zeros(n_events, dtype=EVENT_DTYPE)
+    kind = rng.choice([ADD, CANCEL, MARKET], n_events, p=[1 - cancel_rate - market_rate, cancel_rate, market_rate])
+    kind[0] = ADD
+    side = np.where(rng.random(n_events) < 0.5, BUY, SELL)
+    offset = rng.geometric(0.25, n_events).clip(max=max_offset) - (rng.random(n_events) < 0.05)
+
+    events["type"] = kind
+    events["side"] = side
+    events["price"] = np.round(mid / tick_size - side * offset) * tick_size
+    events["quantity"] = rng.geometric(1 / mean_size, n_events)
+
+    # Adds get ids 1..n; cancels point at a random earlier add
+    adds = np.flatnonzero(kind == ADD)
+    ids = np.zeros(n_events, dtype=np.int64)
+    ids[adds] = np.arange(1, len(adds) + 1)
+    added_before = np.cumsum(kind == ADD)
+    cancels = np.flatnonzero(kind == CANCEL)
+    ids[cancels] = 1 + (rng.random(len(cancels)) * added_before[cancels]).astype(np.int64)
+    markets = np.flatnonzero(kind == MARKET)
+    ids[markets] = len(adds) + 1 + np.arange(len(markets))
+    events["order_id"] = ids
+    return events
+
+
+# ----------------------------------------------------------------------
+# Market impact and execution over bars
+# ----------------------------------------------------------------------
+
+
+def square_root_impact(
+    quantity: Union[float, np.ndarray],
+    daily_volume: Union[float, np.ndarray],
+    volatility: Union[float, np.ndarray],
+    coefficient: float = 1.0,
+) -> Union[float, np.ndarray]:
+    """
+    Square-root market impact: cost ~ coefficient * sigma * sqrt(Q / V).
+
+    Args:
+        quantity: Order size in shares
+        daily_volume: Average daily volume in shares
+        volatility: Daily return volatility (e.g. 0.02 for 2%)
+        coefficient: Scale factor, typically 0.5-1.5
+
+    Returns:
+        Expected impact as a fraction of price (0.001 = 10 bps)
+
+    Example:
+        >>> square_root_impact(50_000, 5_000_000, 0.02)   # 1% of ADV
+        0.002
+    """
+    return coefficient * np.asarray(volatility) * np.sqrt(np.asarray(quantity) / np.asarray(daily_volume))
+
+
+def simulate_execution(
+    df: pd.DataFrame,
+    quantity: int,
+    side: str = "buy",
+    strategy: str = "vwap",
+    participation: float = 0.1,
+    spread_bps: float = 2.0,
+    impact_coefficient: float = 1.0,
+    permanent_fraction: float = 0.25,
+    volatility: Optional[float] = None,
+) -> tuple[pd.DataFrame, dict]:
+    """
+    Work a parent order over historical bars and estimate its fills.
+
+    Each bar's child order pays half the spread plus temporary impact
+    ``coefficient * sigma * sqrt(child / bar volume)`` on the bar's typical
+    price; a fraction of that impact is permanent and carries into later
+    fills. Children are capped at ``participation`` of each bar's volume.
+
+    Args:
+        df: OHLCV bars to execute over (e.g. one day of 1m bars)
+        quantity: Parent order size in shares
+        side: 'buy' or 'sell'
+        strategy: 'twap' (equal slices), 'vwap' (slices by bar volume) or
+            'pov' (participation of every bar until done)
+        participation: Maximum fraction of a bar's volume to take
+        spread_bps: Quoted spread in basis points
+        impact_coefficient: Square-root impact scale
+        permanent_fraction: Share of temporary impact that persists
+        volatility: Per-bar return volatility (default: from the bars)
+
+    Returns:
+        (fills, summary): per-bar DataFrame with Shares, Price, Impact
+        (bps) and Cost columns, and a dict with filled shares, average
+        price, arrival price, VWAP and implementation shortfall in bps
+
+    Example:
+        >>> fills, summary = simulate_execution(minute_bars, 200_000, strategy="vwap")
+        >>> summary["shortfall_bps"]
+    """
+    sign = _side(side)
+    if strategy not in ("twap", "vwap", "pov"):
+        raise ValueError(f"Unknown strategy: {strategy}. Use 'twap', 'vwap' or 'pov'")
+    if df.empty:
+        raise ValueError("No bars to execute over")
+
+    volume = df["Volume"].to_numpy(dtype=np.float64)
+    typical = ((df["High"] + df["Low"] + df["Close"]) / 3).to_numpy(dtype=np.float64)
+    close = df["Close"].to_numpy(dtype=np.float64)
+    if volatility is None:
+        returns = np.diff(np.log(close))
+        volatility = float(np.nanstd(returns)) if len(returns) > 1 else 0.0
+
+    cap = np.floor(volume * participation)
+    if strategy == "twap":
+        target = np.full(len(df), quantity / len(df))
+    elif strategy == "vwap":
+        target = quantity * volume / volume.sum() if volume.sum() else np.full(len(df), quantity / len(df))
+    else:
+        target = cap.copy()
+    # Floor the cumulative schedule so fractional shares carry into later
+    # bars, then cap each bar and stop once the parent is done
+    wanted = np.minimum(np.diff(np.floor(np.cumsum(target) + 1e-9), prepend=0), cap)
+    shares = np.diff(np.minimum(np.cumsum(wanted), quantity), prepend=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        temporary = impact_coefficient * volatility * np.sqrt(np.where(volume > 0, shares / volume, 0.0))
+    permanent = permanent_fraction * np.concatenate([[0.0], np.cumsum(temporary)[:-1]])
+    impact = spread_bps / 2e4 + temporary + permanent
+    price = typical * (1 + sign * impact)
+
+    fills = pd.DataFrame({
+        "Shares": shares,
+        "Price": price,
+        "Impact (bps)": impact * 1e4,
+        "Cost": shares * price,
+    }, index=df.index)
+    fills = fills[fills["Shares"] > 0]
+
+    filled = fills["Shares"].sum()
+    arrival = float(df["Open"].iloc[0])
+    average = fills["Cost"].sum() / filled if filled else float("nan")
+    market_vwap = float((typical * volume).sum() / volume.sum()) if volume.sum() else float("nan")
+    summary = {
+        "requested": int(quantity),
+        "filled": int(filled),
+        "fill_rate": float(filled / quantity) if quantity else float("nan"),
+        "average_price": float(average),
+        "arrival_price": arrival,
+        "vwap": market_vwap,
+        "shortfall_bps": float(sign * (average - arrival) / arrival * 1e4),
+        "vs_vwap_bps": float(sign * (average - market_vwap) / market_vwap * 1e4),
+        "bars": len(fills),
+    }
+    return fills, summary
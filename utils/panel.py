@@ -0,0 +1,243 @@
+"""
+Panel Helpers for Money Talks
+
+Provides a multi-ticker "panel": one aligned (dates x tickers) matrix per
+OHLCV field. Indicators from utils.indicators accept these 2-D matrices
+directly, so one vectorized call computes RSI/EMA/ATR for the whole
+universe instead of looping over hundreds of separate DataFrames.
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from . import indicators
+
+
+FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+
+class Panel:
+    """
+    Aligned price matrices for many tickers.
+
+    Each field is a DataFrame indexed by date with one column per ticker.
+    Tickers missing a date (e.g. listed later) hold NaN there.
+
+    Example:
+        >>> data = fetch_multiple(get_sp500_tickers())
+        >>> panel = Panel.from_frames(data)
+        >>> rsi = panel.rsi()               # dates x tickers
+        >>> oversold = panel.latest(rsi) < 30
+        >>> print(oversold[oversold].index.tolist())
+    """
+
+    def __init__(self, fields: dict[str, pd.DataFrame]):
+        self.fields = fields
+        first = next(iter(fields.values()))
+        self.index = first.index
+        self.tickers = list(first.columns)
+
+    @classmethod
+    def from_frames(
+        cls,
+        data: dict[str, pd.DataFrame],
+        fields: tuple = FIELDS,
+        dtype=np.float64,
+    ) -> "Panel":
+        """
+        Build a panel from the dict returned by fetch_multiple.
+
+        Args:
+            data: Dictionary mapping ticker to OHLCV DataFrame
+            fields: Columns to keep
+            dtype: Storage dtype; np.float32 halves memory for large universes
+
+        Returns:
+            Panel aligned on the union of all dates
+        """
+        tickers = [t for t, df in data.items() if not df.empty]
+        if not tickers:
+            raise ValueError("No non-empty DataFrames to build a panel from")
+
+        index = data[tickers[0]].index
+        for ticker in tickers[1:]:
+            if not data[ticker].index.equals(index):
+                index = index.union(data[ticker].index)
+
+        # Fill preallocated matrices column by column; no per-field concat
+        arrays = {f: np.full((len(index), len(tickers)), np.nan, dtype=dtype) for f in fields}
+        for j, ticker in enumerate(tickers):
+            df = data[ticker]
+            rows = index.get_indexer(df.index)
+            for f in fields:
+                if f in df.columns:
+                    arrays[f][rows, j] = df[f].to_numpy(dtype=dtype)
+
+        return cls({
+            f: pd.DataFrame(arr, index=index, columns=tickers, copy=False)
+            for f, arr in arrays.items()
+        })
+
+    def __getitem__(self, field: str) -> pd.DataFrame:
+        return self.fields[field]
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __repr__(self) -> str:
+        return (
+            f"Panel({len(self.index)} dates x {len(self.tickers)} tickers, "
+            f"fields={list(self.fields)})"
+        )
+
+    @property
+    def open(self) -> pd.DataFrame:
+        return self.fields["Open"]
+
+    @property
+    def high(self) -> pd.DataFrame:
+        return self.fields["High"]
+
+    @property
+    def low(self) -> pd.DataFrame:
+        return self.fields["Low"]
+
+    @property
+    def close(self) -> pd.DataFrame:
+        return self.fields["Close"]
+
+    @property
+    def volume(self) -> pd.DataFrame:
+        return self.fields["Volume"]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the price matrices."""
+        return sum(df.to_numpy().nbytes for df in self.fields.values())
+
+    def ticker(self, symbol: str) -> pd.DataFrame:
+        """Get one ticker back as a regular OHLCV DataFrame."""
+        df = pd.DataFrame({f: m[symbol] for f, m in self.fields.items()})
+        return df.dropna(how="all")
+
+    def select(self, tickers: list[str]) -> "Panel":
+        """Return a panel with only the given tickers."""
+        return Panel({f: m[tickers] for f, m in self.fields.items()})
+
+    @staticmethod
+    def latest(matrix: pd.DataFrame) -> pd.Series:
+        """Last non-NaN value for each ticker (column) of a dates x tickers matrix."""
+        values = matrix.to_numpy()
+        valid = ~np.isnan(values)
+        # Row of the last valid value per column (0 if none)
+        rows = len(values) - 1 - np.argmax(valid[::-1], axis=0)
+        last = values[rows, np.arange(values.shape[1])]
+        last[~valid.any(axis=0)] = np.nan
+        return pd.Series(last, index=matrix.columns)
+
+    def returns(self, method: str = "simple", field: str = "Close") -> pd.DataFrame:
+        """Period returns for every ticker (see utils.risk.returns)."""
+        from .risk import returns
+
+        return returns(self.fields[field], method)
+
+    # ------------------------------------------------------------------
+    # Indicators over the whole universe
+    # ------------------------------------------------------------------
+
+    def sma(self, window: int = 20, field: str = "Close") -> pd.DataFrame:
+        return indicators.sma(self.fields[field], window)
+
+    def ema(self, span: int = 20, field: str = "Close") -> pd.DataFrame:
+        return indicators.ema(self.fields[field], span)
+
+    def rsi(self, period: int = 14, smoothing: str = "wilder") -> pd.DataFrame:
+        return indicators.rsi(self.close, period, smoothing)
+
+    def macd(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        return indicators.macd(self.close, fast, slow, signal)
+
+    def roc(self, period: int = 14) -> pd.DataFrame:
+        return indicators.roc(self.close, period)
+
+    def bollinger_bands(self, window: int = 20, num_std: float = 2.0):
+        return indicators.bollinger_bands(self.close, window, num_std)
+
+    def atr(self, period: int = 14, smoothing: str = "wilder") -> pd.DataFrame:
+        return indicators.atr(self.high, self.low, self.close, period, smoothing)
+
+    def adx(self, period: int = 14):
+        return indicators.adx(self.high, self.low, self.close, period)
+
+    def stochastic(self, k_period: int = 14, d_period: int = 3, slow: bool = True):
+        return indicators.stochastic(self.high, self.low, self.close, k_period, d_period, slow)
+
+    def cci(self, period: int = 20) -> pd.DataFrame:
+        return indicators.cci(self.high, self.low, self.close, period)
+
+    def obv(self) -> pd.DataFrame:
+        return indicators.obv(self.close, self.volume)
+
+    def vwap(self, sessions: Optional[np.ndarray] = None) -> pd.DataFrame:
+        return indicators.vwap(self.high, self.low, self.close, self.volume, sessions)
+
+    def snapshot(self) -> pd.DataFrame:
+        """
+        Latest value of the common scanner indicators for every ticker.
+
+        Returns:
+            DataFrame indexed by ticker with Close, Change_%, RSI, EMA_20,
+            SMA_50, ATR, ADX, ROC, BB_Percent and Rel_Vol columns
+
+        Example:
+            >>> snap = panel.snapshot()
+            >>> snap[(snap.RSI > 50) & (snap.Close > snap.SMA_50)].sort_values("ROC")
+        """
+        close = self.close
+        middle, upper, lower = self.bollinger_bands()
+        volume_avg = indicators.sma(self.volume, 20)
+        columns = {
+            "Close": close,
+            "Change_%": close.pct_change(fill_method=None) * 100,
+            "RSI": self.rsi(),
+            "EMA_20": self.ema(20),
+            "SMA_50": self.sma(50),
+            "ATR": self.atr(),
+            "ADX": self.adx()[2],
+            "ROC": self.roc(),
+            "BB_Percent": (close - lower) / (upper - lower),
+            "Rel_Vol": self.volume / volume_avg,
+        }
+        return pd.DataFrame({name: self.latest(m) for name, m in columns.items()})
+
+
+def fetch_panel(
+    tickers: list[str],
+    period: str = "1y",
+    interval: str = "1d",
+    dtype=np.float64,
+    **fetch_kwargs,
+) -> Panel:
+    """
+    Fetch many tickers and align them into a Panel.
+
+    Args:
+        tickers: List of stock symbols
+        period: Time period
+        interval: Data interval
+        dtype: Storage dtype for the matrices
+        **fetch_kwargs: Passed to fetch_multiple (max_workers, provider, ...)
+
+    Returns:
+        Panel
+
+    Example:
+        >>> panel = fetch_panel(get_sp500_tickers(), provider="synthetic")
+        >>> print(panel.snapshot().nsmallest(10, "RSI"))
+    """
+    from .data_helpers import fetch_multiple
+
+    data = fetch_multiple(tickers, period, interval, **fetch_kwargs)
+    return Panel.from_frames(data, dtype=dtype)
@@ -0,0 +1,721 @@
+"""
+Pattern Helpers for Money Talks
+
+Provides the swing-point, support/resistance, Fibonacci, trendline and
+divergence tools from the class 2 week 4 lessons as linear-time functions.
+
+Swing points are found once and reused. find_swing_points returns a Swings
+object holding the bar positions of every swing high and low, and the zone,
+Fibonacci, trendline and divergence functions all accept it (or a
+DataFrame, in which case they compute it). Local extrema use running
+max/min over fixed windows (van Herk/Gil-Werman), which costs about three
+comparisons per bar for any window size. The same code runs down every
+column of a Panel, so sr_scanner and fibonacci_scanner find swings for the
+whole universe in one vectorized pass.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .indicators import ArrayLike, _values, _wrap
+from .panel import Panel
+
+
+FIB_RETRACEMENT_LEVELS = [0, 0.236, 0.382, 0.5, 0.618, 0.786, 1.0]
+FIB_EXTENSION_LEVELS = [1.0, 1.272, 1.618, 2.0, 2.618]
+
+SIDES = {"high": (np.fmax, -np.inf), "low": (np.fmin, np.inf)}
+
+Universe = Union[dict[str, pd.DataFrame], Panel]
+
+
+# ----------------------------------------------------------------------
+# Running extrema
+# ----------------------------------------------------------------------
+
+
+def _forward_extreme(a: np.ndarray, window: int, side: str) -> np.ndarray:
+    """
+    Max or min of every window a[i:i + window] down axis 0.
+
+    Splits the rows into blocks of `window`, takes running extremes forwards
+    and backwards inside each block, and combines one value from each: any
+    window covers the tail of one block and the head of the next. NaNs are
+    ignored.
+    """
+    op, fill = SIDES[side]
+    n = a.shape[0]
+    count = n - window + 1
+    if count <= 0:
+        return np.empty((0,) + a.shape[1:])
+    blocks = -(-n // window)
+    padded = np.full((blocks * window,) + a.shape[1:], fill)
+    padded[:n] = a
+    shaped = padded.reshape((blocks, window) + a.shape[1:])
+    prefix = op.accumulate(shaped, axis=1).reshape(padded.shape)
+    suffix = op.accumulate(shaped[:, ::-1], axis=1)[:, ::-1].reshape(padded.shape)
+    return op(suffix[:count], prefix[window - 1:window - 1 + count])
+
+
+def _check_side(side: str) -> None:
+    if side not in SIDES:
+        raise ValueError(f"Unknown side: {side}. Use 'high' or 'low'")
+
+
+def rolling_extreme(values: ArrayLike, window: int, side: str = "high") -> ArrayLike:
+    """
+    Trailing rolling max ("high") or min ("low") in O(n) for any window.
+
+    Args:
+        values: Prices (1-D, or 2-D dates x tickers)
+        window: Number of bars
+        side: "high" for the max, "low" for the min
+
+    Returns:
+        Rolling extreme, NaN for the first window - 1 bars
+
+    Example:
+        >>> df["High_20"] = rolling_extreme(df["High"], 20)      # Donchian upper
+    """
+    _check_side(side)
+    a = _values(values)
+    out = np.full(a.shape, np.nan)
+    out[window - 1:] = _forward_extreme(a, window, side)
+    return _wrap(out, values)
+
+
+def swing_mask(values: ArrayLike, order: int = 5, side: str = "high") -> np.ndarray:
+    """
+    Boolean mask of swing highs (or lows).
+
+    A bar is a swing high when it is at least as high as the `order` bars on
+    each side (fewer at the ends of the series), the same rule as
+    ``scipy.signal.argrelextrema(x, np.greater_equal, order)``.
+
+    Args:
+        values: Prices (1-D, or 2-D dates x tickers)
+        order: Bars to compare on each side
+        side: "high" or "low"
+
+    Returns:
+        Boolean array shaped like values
+    """
+    _check_side(side)
+    a = _values(values)
+    fill = SIDES[side][1]
+    padded = np.full((len(a) + 2 * order,) + a.shape[1:], fill)
+    padded[order:order + len(a)] = a
+    return a == _forward_extreme(padded, 2 * order + 1, side)
+
+
+# ----------------------------------------------------------------------
+# Swing points
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class Swings:
+    """Swing highs and lows of one price series, as bar positions."""
+    index: pd.Index
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    high_idx: np.ndarray
+    low_idx: np.ndarray
+    order: int
+
+    @property
+    def highs(self) -> pd.Series:
+        """Swing high prices indexed by date."""
+        return pd.Series(self.high[self.high_idx], index=self.index[self.high_idx], name="High")
+
+    @property
+    def lows(self) -> pd.Series:
+        """Swing low prices indexed by date."""
+        return pd.Series(self.low[self.low_idx], index=self.index[self.low_idx], name="Low")
+
+    @property
+    def current_price(self) -> float:
+        """Last valid close."""
+        valid = np.flatnonzero(~np.isnan(self.close))
+        return float(self.close[valid[-1]]) if len(valid) else np.nan
+
+    def levels(self) -> np.ndarray:
+        """All swing prices (highs and lows) for zone clustering."""
+        return np.concatenate([self.high[self.high_idx], self.low[self.low_idx]])
+
+    def tail(self, bars: int) -> "Swings":
+        """Swings within the last `bars` bars (positions are kept)."""
+        start = max(len(self.index) - bars, 0)
+        return Swings(
+            self.index, self.high, self.low, self.close,
+            self.high_idx[self.high_idx >= start], self.low_idx[self.low_idx >= start],
+            self.order,
+        )
+
+
+def _from_arrays(index, high, low, close, high_mask, low_mask, order) -> Swings:
+    return Swings(
+        index, high, low, close,
+        np.flatnonzero(high_mask), np.flatnonzero(low_mask), order,
+    )
+
+
+def find_swing_points(df: pd.DataFrame, order: int = 5) -> Swings:
+    """
+    Find swing highs and lows (local maxima of High, minima of Low).
+
+    Args:
+        df: OHLC DataFrame
+        order: Number of bars on each side to compare
+
+    Returns:
+        Swings
+
+    Example:
+        >>> swings = find_swing_points(df, order=5)
+        >>> print(swings.highs.tail(5))
+        >>> zones = identify_sr_zones(swings)        # reuses the same swings
+    """
+    high = df["High"].to_numpy(dtype=np.float64)
+    low = df["Low"].to_numpy(dtype=np.float64)
+    close = df["Close"].to_numpy(dtype=np.float64)
+    return _from_arrays(
+        df.index, high, low, close,
+        swing_mask(high, order, "high"), swing_mask(low, order, "low"), order,
+    )
+
+
+def _swings(data: Union[pd.DataFrame, Swings], order: int) -> Swings:
+    return data if isinstance(data, Swings) else find_swing_points(data, order)
+
+
+def find_major_swings(
+    data: Union[pd.DataFrame, Swings],
+    lookback: int = 60,
+    order: int = 10,
+) -> dict:
+    """
+    Find the major swing high and low of the last `lookback` bars.
+
+    The major high is the highest swing high in the window (the window's
+    highest High if it has none), likewise for the low. Direction is "up"
+    when the low came first.
+
+    Args:
+        data: OHLC DataFrame or precomputed Swings
+        lookback: Number of bars to analyze
+        order: Bars on each side for swing detection (DataFrame input only)
+
+    Returns:
+        Dictionary with swing_highs, swing_lows, major_high, major_low
+        ({'date', 'price'}) and direction
+
+    Example:
+        >>> swings = find_major_swings(df, lookback=90)
+        >>> fib = calculate_fibonacci_levels(
+        ...     swings["major_low"]["price"], swings["major_high"]["price"], swings["direction"])
+    """
+    swings = _swings(data, order).tail(lookback)
+    index = swings.index
+    start = max(len(index) - lookback, 0)
+
+    def points(idx, prices):
+        return [{"date": index[i], "price": prices[i]} for i in idx]
+
+    def major(idx, prices, pick):
+        if len(idx):
+            i = idx[pick(prices[idx])]
+        else:
+            i = start + pick(prices[start:])
+        return {"date": index[i], "price": prices[i]}, i
+
+    major_high, high_pos = major(swings.high_idx, swings.high, np.nanargmax)
+    major_low, low_pos = major(swings.low_idx, swings.low, np.nanargmin)
+    return {
+        "swing_highs": points(swings.high_idx, swings.high),
+        "swing_lows": points(swings.low_idx, swings.low),
+        "major_high": major_high,
+        "major_low": major_low,
+        "direction": "up" if low_pos < high_pos else "down",
+    }
+
+
+# ----------------------------------------------------------------------
+# Levels
+# ----------------------------------------------------------------------
+
+
+def calculate_fibonacci_levels(swing_low, swing_high, direction: str = "up") -> dict:
+    """
+    Calculate Fibonacci retracement and extension levels.
+
+    Prices may be floats or NumPy arrays (one entry per ticker).
+
+    Args:
+        swing_low: Lower price point
+        swing_high: Higher price point
+        direction: "up" for an uptrend (retracing down from the high),
+            "down" for a downtrend
+
+    Returns:
+        Dictionary with swing_low, swing_high, range, direction,
+        retracements and extensions (label such as "61.8%" -> price)
+
+    Example:
+        >>> fib = calculate_fibonacci_levels(150, 200)
+        >>> fib["retracements"]["61.8%"]
+        169.1
+    """
+    if direction not in ("up", "down"):
+        raise ValueError(f"Unknown direction: {direction}. Use 'up' or 'down'")
+    price_range = swing_high - swing_low
+    sign = 1 if direction == "up" else -1
+    anchor, base = (swing_high, swing_low) if direction == "up" else (swing_low, swing_high)
+    return {
+        "swing_low": swing_low,
+        "swing_high": swing_high,
+        "range": price_range,
+        "direction": direction,
+        "retracements": {
+            f"{level * 100:.1f}%": anchor - sign * price_range * level
+            for level in FIB_RETRACEMENT_LEVELS
+        },
+        "extensions": {
+            f"{level * 100:.1f}%": base + sign * price_range * level
+            for level in FIB_EXTENSION_LEVELS
+        },
+    }
+
+
+def cluster_levels(
+    levels: np.ndarray,
+    tolerance_pct: float = 2.0,
+    min_touches: int = 2,
+) -> list[dict]:
+    """
+    Group nearby price levels into zones.
+
+    Levels are sorted and each zone takes every level within tolerance_pct
+    above its lowest one. Starting points are found by binary search, so
+    the cost is one sort plus one search per zone.
+
+    Args:
+        levels: Price levels (e.g. swing highs and lows)
+        tolerance_pct: Zone width as a percentage of its lowest level
+        min_touches: Minimum levels for a zone to be kept
+
+    Returns:
+        List of {'level', 'zone_low', 'zone_high', 'touches'} sorted by level
+    """
+    levels = np.sort(np.asarray(levels, dtype=np.float64))
+    levels = levels[~np.isnan(levels)]
+    if not len(levels):
+        return []
+    starts = []
+    i = 0
+    while i < len(levels):
+        starts.append(i)
+        i = int(np.searchsorted(levels, levels[i] * (1 + tolerance_pct / 100), "right"))
+    starts = np.array(starts)
+    ends = np.append(starts[1:], len(levels))
+    touches = ends - starts
+    means = np.add.reduceat(levels, starts) / touches
+    return [
+        {"level": float(means[z]), "zone_low": float(levels[starts[z]]),
+         "zone_high": float(levels[ends[z] - 1]), "touches": int(touches[z])}
+        for z in np.flatnonzero(touches >= min_touches)
+    ]
+
+
+def identify_sr_zones(
+    data: Union[pd.DataFrame, Swings],
+    tolerance_pct: float = 2.0,
+    min_touches: int = 2,
+    order: int = 5,
+) -> dict:
+    """
+    Identify support and resistance zones from swing points.
+
+    Args:
+        data: OHLC DataFrame or precomputed Swings
+        tolerance_pct: Percentage tolerance for grouping levels into zones
+        min_touches: Minimum number of touches to consider a valid zone
+        order: Bars on each side for swing detection (DataFrame input only)
+
+    Returns:
+        Dictionary with support and resistance zone lists (each sorted by
+        level, so the nearest support is last and the nearest resistance
+        first) and current_price
+
+    Example:
+        >>> sr = identify_sr_zones(df)
+        >>> nearest = sr["support"][-1] if sr["support"] else None
+    """
+    swings = _swings(data, order)
+    zones = cluster_levels(swings.levels(), tolerance_pct, min_touches)
+    current_price = swings.current_price
+    return {
+        "support": [z for z in zones if z["level"] < current_price],
+        "resistance": [z for z in zones if z["level"] >= current_price],
+        "current_price": current_price,
+    }
+
+
+# ----------------------------------------------------------------------
+# Trendlines
+# ----------------------------------------------------------------------
+
+
+def fit_trendline(
+    data: Union[pd.DataFrame, Swings],
+    side: str = "low",
+    n_points: int = 3,
+    order: int = 5,
+) -> Optional[dict]:
+    """
+    Least-squares line through the most recent swing lows (or highs).
+
+    The slope is per bar, so the line can be extended bar by bar.
+
+    Args:
+        data: OHLC DataFrame or precomputed Swings
+        side: "low" for an uptrend (support) line, "high" for a downtrend line
+        n_points: Number of most recent swing points to use
+        order: Bars on each side for swing detection (DataFrame input only)
+
+    Returns:
+        Dictionary with slope, intercept (line value at the first point),
+        r_squared, start (bar position), start_date, end_date, points_used
+        and points, or None with fewer than two points
+
+    Example:
+        >>> uptrend = fit_trendline(swings, "low", n_points=4)
+        >>> line = extend_trendline(uptrend, df)
+    """
+    _check_side(side)
+    swings = _swings(data, order)
+    idx = (swings.low_idx if side == "low" else swings.high_idx)[-n_points:]
+    if len(idx) < 2:
+        return None
+    prices = (swings.low if side == "low" else swings.high)[idx]
+
+    x = idx.astype(np.float64)
+    dx = x - x.mean()
+    dy = prices - prices.mean()
+    sxx, sxy, syy = dx @ dx, dx @ dy, dy @ dy
+    slope = sxy / sxx
+    return {
+        "slope": slope,
+        "intercept": prices.mean() + slope * (x[0] - x.mean()),
+        "r_squared": sxy * sxy / (sxx * syy) if syy > 0 else 1.0,
+        "start": int(idx[0]),
+        "start_date": swings.index[idx[0]],
+        "end_date": swings.index[idx[-1]],
+        "points_used": len(idx),
+        "points": pd.Series(prices, index=swings.index[idx], name="Price"),
+    }
+
+
+def extend_trendline(trendline: dict, df: pd.DataFrame) -> pd.Series:
+    """
+    Trendline value at every bar from its first point to the end of df.
+
+    Args:
+        trendline: Result of fit_trendline on the same bars as df
+        df: DataFrame to extend over
+
+    Returns:
+        Series of line values
+    """
+    start = trendline["start"]
+    steps = np.arange(len(df) - start)
+    return pd.Series(
+        trendline["intercept"] + trendline["slope"] * steps,
+        index=df.index[start:], name="Trendline",
+    )
+
+
+def detect_trendline_signals(
+    df: pd.DataFrame,
+    trendline: dict,
+    line_type: str = "uptrend",
+    tolerance_pct: float = 1.0,
+) -> pd.DataFrame:
+    """
+    Detect trendline touches and breaks.
+
+    Args:
+        df: OHLC DataFrame the trendline was fitted on
+        trendline: Result of fit_trendline
+        line_type: "uptrend" (support, compare Lows) or "downtrend"
+            (resistance, compare Highs)
+        tolerance_pct: Percentage distance that counts as a touch
+
+    Returns:
+        DataFrame from the trendline's first point with Trendline, Distance,
+        Touch, Break and Signal columns added
+
+    Example:
+        >>> signals = detect_trendline_signals(df, fit_trendline(df, "low"), "uptrend")
+        >>> print(signals["Signal"].value_counts())
+    """
+    if line_type not in ("uptrend", "downtrend"):
+        raise ValueError(f"Unknown line type: {line_type}. Use 'uptrend' or 'downtrend'")
+    line = extend_trendline(trendline, df)
+    out = df.iloc[trendline["start"]:].copy()
+    out["Trendline"] = line.to_numpy()
+
+    level = line.to_numpy()
+    close = out["Close"].to_numpy(dtype=np.float64)
+    if line_type == "uptrend":
+        distance = (out["Low"].to_numpy(dtype=np.float64) - level) / level * 100
+        broken = close < level
+        inside, outside = "Above Line", "Below Line"
+    else:
+        distance = (level - out["High"].to_numpy(dtype=np.float64)) / level * 100
+        broken = close > level
+        inside, outside = "Below Line", "Above Line"
+    touch = np.abs(distance) < tolerance_pct
+    was_broken = np.r_[False, broken[:-1]]
+
+    signal = np.select(
+        [touch & ~broken, broken & ~was_broken, broken],
+        ["Touch - Potential Bounce", "Break!", outside],
+        default=inside,
+    ).astype(object)
+    if len(signal):
+        signal[0] = "N/A"
+    out["Distance"] = distance
+    out["Touch"] = touch
+    out["Break"] = broken
+    out["Signal"] = signal
+    return out
+
+
+# ----------------------------------------------------------------------
+# Divergences
+# ----------------------------------------------------------------------
+
+
+def find_divergences(
+    data: Union[pd.DataFrame, Swings],
+    indicator: Union[str, ArrayLike],
+    order: int = 7,
+    oversold: Optional[float] = 40.0,
+    overbought: Optional[float] = 60.0,
+) -> tuple[list[dict], list[dict]]:
+    """
+    Find bullish and bearish divergences between price and an oscillator.
+
+    Bullish: a swing low below the previous swing low while the indicator
+    makes a higher low (and is below `oversold`). Bearish: a higher swing
+    high with a lower indicator high (above `overbought`). Consecutive
+    swings are compared as whole arrays.
+
+    Args:
+        data: OHLC DataFrame or precomputed Swings
+        indicator: Indicator values aligned with the bars, or a column name
+            when data is a DataFrame (e.g. "RSI")
+        order: Bars on each side for swing detection (DataFrame input only)
+        oversold: Ceiling for the indicator at bullish divergences (None: any)
+        overbought: Floor for the indicator at bearish divergences (None: any)
+
+    Returns:
+        Tuple of (bullish, bearish) lists of {'date', 'price', 'indicator'}
+
+    Example:
+        >>> df["RSI"] = rsi(df["Close"])
+        >>> bullish, bearish = find_divergences(df, "RSI")
+        >>> bullish, bearish = find_divergences(swings, macd_line, oversold=None, overbought=None)
+    """
+    if isinstance(indicator, str):
+        indicator = data[indicator]
+    values = _values(indicator)
+    swings = _swings(data, order)
+
+    def scan(idx, prices, price_cmp, value_cmp, bound):
+        if len(idx) < 2:
+            return []
+        p, v = prices[idx], values[idx]
+        hit = price_cmp(p[1:], p[:-1]) & value_cmp(v[1:], v[:-1])
+        if bound is not None:
+            hit &= price_cmp(v[1:], bound)
+        return [
+            {"date": swings.index[i], "price": prices[i], "indicator": values[i]}
+            for i in idx[1:][hit]
+        ]
+
+    bullish = scan(swings.low_idx, swings.low, np.less, np.greater, oversold)
+    bearish = scan(swings.high_idx, swings.high, np.greater, np.less, overbought)
+    return bullish, bearish
+
+
+# ----------------------------------------------------------------------
+# Universe scanners
+# ----------------------------------------------------------------------
+
+
+def universe_swings(data: Universe, order: int = 5, min_bars: int = 0) -> dict[str, Swings]:
+    """
+    Swings for every ticker of a fetch_multiple dict or a Panel.
+
+    A Panel is processed as three (dates x tickers) matrices in one
+    vectorized pass; NaN rows before a ticker's listing are ignored.
+
+    Args:
+        data: Dictionary mapping ticker to OHLCV DataFrame, or a Panel
+        order: Bars on each side to compare
+        min_bars: Skip tickers with fewer valid closes
+
+    Returns:
+        Dictionary mapping ticker to Swings
+    """
+    if not isinstance(data, Panel):
+        return {
+            ticker: find_swing_points(df, order)
+            for ticker, df in data.items() if len(df) >= max(min_bars, 1)
+        }
+    high = data.high.to_numpy(dtype=np.float64)
+    low = data.low.to_numpy(dtype=np.float64)
+    close = data.close.to_numpy(dtype=np.float64)
+    high_mask = swing_mask(high, order, "high")
+    low_mask = swing_mask(low, order, "low")
+    bars = (~np.isnan(close)).sum(axis=0)
+    return {
+        ticker: _from_arrays(
+            data.index, high[:, j], low[:, j], close[:, j],
+            high_mask[:, j], low_mask[:, j], order,
+        )
+        for j, ticker in enumerate(data.tickers) if bars[j] >= max(min_bars, 1)
+    }
+
+
+def sr_scanner(
+    data: Universe,
+    proximity_pct: float = 3.0,
+    order: int = 5,
+    tolerance_pct: float = 2.0,
+    min_touches: int = 2,
+    min_bars: int = 50,
+) -> pd.DataFrame:
+    """
+    Scan stocks for proximity to support/resistance levels.
+
+    Args:
+        data: Dictionary mapping ticker to OHLCV DataFrame, or a Panel
+        proximity_pct: Percentage distance to flag as "near" S/R
+        order: Bars on each side for swing detection
+        tolerance_pct: Zone width (see identify_sr_zones)
+        min_touches: Minimum touches per zone
+        min_bars: Skip tickers with shorter histories
+
+    Returns:
+        DataFrame with one row per ticker
+
+    Example:
+        >>> data = fetch_multiple(get_sp500_tickers(), period="6mo")
+        >>> scan = sr_scanner(data)
+        >>> print(scan[scan["Status"].str.startswith("Near Support")])
+    """
+    results = []
+    for ticker, swings in universe_swings(data, order, min_bars).items():
+        sr = identify_sr_zones(swings, tolerance_pct, min_touches)
+        price = sr["current_price"]
+        support = sr["support"][-1] if sr["support"] else None
+        resistance = sr["resistance"][0] if sr["resistance"] else None
+        support_dist = (price - support["level"]) / price * 100 if support else None
+        resistance_dist = (resistance["level"] - price) / price * 100 if resistance else None
+
+        status = "Neutral"
+        if support_dist is not None and support_dist < proximity_pct:
+            status = f"Near Support ({support_dist:.1f}%)"
+        elif resistance_dist is not None and resistance_dist < proximity_pct:
+            status = f"Near Resistance ({resistance_dist:.1f}%)"
+
+        results.append({
+            "Ticker": ticker,
+            "Price": price,
+            "Support": support["level"] if support else None,
+            "Support Dist %": support_dist,
+            "Support Touches": support["touches"] if support else 0,
+            "Resistance": resistance["level"] if resistance else None,
+            "Resist Dist %": resistance_dist,
+            "Resist Touches": resistance["touches"] if resistance else 0,
+            "Status": status,
+        })
+    return pd.DataFrame(results)
+
+
+def fibonacci_scanner(
+    data: Universe,
+    lookback: int = 90,
+    order: int = 10,
+    proximity_pct: float = 2.0,
+    min_bars: int = 60,
+) -> pd.DataFrame:
+    """
+    Scan stocks for Fibonacci retracement setups.
+
+    Each ticker's major swing high and low over the last `lookback` bars
+    anchor its retracement levels; the distances and zones are then
+    computed for all tickers at once.
+
+    Args:
+        data: Dictionary mapping ticker to OHLCV DataFrame, or a Panel
+        lookback: Bars used to find the major swings
+        order: Bars on each side for swing detection
+        proximity_pct: Distance (in percent) that counts as "near" a level
+        min_bars: Skip tickers with shorter histories
+
+    Returns:
+        DataFrame with one row per ticker
+
+    Example:
+        >>> scan = fibonacci_scanner(fetch_panel(tickers, period="6mo"))
+        >>> print(scan[scan["Setup"] == "IN GOLDEN ZONE"])
+    """
+    tickers, lows, highs, ups, prices = [], [], [], [], []
+    for ticker, swings in universe_swings(data, order, min_bars).items():
+        major = find_major_swings(swings, lookback)
+        tickers.append(ticker)
+        lows.append(major["major_low"]["price"])
+        highs.append(major["major_high"]["price"])
+        ups.append(major["direction"] == "up")
+        prices.append(swings.current_price)
+
+    columns = ["Ticker", "Price", "Trend", "38.2% Dist", "50% Dist", "61.8% Dist", "Zone", "Setup"]
+    if not tickers:
+        return pd.DataFrame(columns=columns)
+    lows, highs, ups, prices = map(np.array, (lows, highs, ups, prices))
+    up = calculate_fibonacci_levels(lows, highs, "up")["retracements"]
+    down = calculate_fibonacci_levels(lows, highs, "down")["retracements"]
+    level = {key: np.where(ups, up[key], down[key]) for key in ("38.2%", "50.0%", "61.8%")}
+    dist = {key: (prices - value) / prices * 100 for key, value in level.items()}
+
+    zone_top = np.maximum(level["38.2%"], level["61.8%"])
+    zone_bottom = np.minimum(level["38.2%"], level["61.8%"])
+    zone = np.select(
+        [prices > zone_top, prices >= zone_bottom],
+        ["Above Golden Zone", "IN Golden Zone (38.2%-61.8%)"],
+        default="Below Golden Zone",
+    )
+    near = [np.abs(dist[key]) < proximity_pct for key in ("38.2%", "50.0%", "61.8%")]
+    setup = np.select(
+        [zone == "IN Golden Zone (38.2%-61.8%)"] + near,
+        ["IN GOLDEN ZONE", "Near 38.2%", "Near 50%", "Near 61.8%"],
+        default="None",
+    )
+    return pd.DataFrame({
+        "Ticker": tickers,
+        "Price": prices,
+        "Trend": np.where(ups, "UP", "DOWN"),
+        "38.2% Dist": dist["38.2%"],
+        "50% Dist": dist["50.0%"],
+        "61.8% Dist": dist["61.8%"],
+        "Zone": zone,
+        "Setup": setup,
+    }, columns=columns)
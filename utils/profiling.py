@@ -0,0 +1,325 @@
+"""
+Profiling Helpers for Money Talks
+
+Provides opt-in timing instrumentation for the utils functions notebooks
+spend their time in. When enabled, every instrumented call records its wall
+time plus counters (rows returned, bytes fetched, cache hits/misses) in an
+in-process registry that can be shown as a summary table or saved as a
+Chrome trace (open in chrome://tracing or https://ui.perfetto.dev).
+
+Profiling is off by default; a disabled hook costs one flag check. Turn it
+on per block with ``with profiling():``, for the session with ``enable()``,
+or for every kernel with ``MONEY_TALKS_PROFILE=1``.
+
+Example:
+    >>> from utils.profiling import profiling
+    >>> with profiling() as prof:
+    ...     df = fetch_stock_data("AAPL")
+    ...     fig = plot_with_indicator(df, "rsi")
+    >>> print(prof.summary())
+    >>> prof.to_chrome_trace("notebook_trace.json")
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+
+_enabled = os.environ.get("MONEY_TALKS_PROFILE", "").lower() in ("1", "true", "yes")
+
+
+@dataclass
+class Span:
+    """One timed call: name, start/duration in seconds, thread and counters."""
+    name: str
+    start: float
+    duration: float = 0.0
+    thread: int = 0
+    depth: int = 0
+    counters: dict = field(default_factory=dict)
+
+    def add(self, **counters) -> None:
+        """Add to (or set) counters on this span."""
+        for key, value in counters.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                self.counters[key] = self.counters.get(key, 0) + value
+            else:
+                self.counters[key] = value
+
+
+class _NullSpan:
+    """Stand-in yielded while profiling is disabled."""
+    __slots__ = ()
+
+    def add(self, **counters) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Profiler:
+    """
+    Registry of recorded spans.
+
+    Thread-safe: fetch_multiple's worker threads each keep their own stack
+    of open spans and append finished ones under a lock.
+    """
+
+    def __init__(self):
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+
+    def _stack(self) -> list[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, name: str, **counters):
+        stack = self._stack()
+        current = Span(name, time.perf_counter(), thread=threading.get_ident(),
+                       depth=len(stack), counters=dict(counters))
+        stack.append(current)
+        try:
+            yield current
+        finally:
+            current.duration = time.perf_counter() - current.start
+            stack.pop()
+            with self._lock:
+                self.spans.append(current)
+
+    def current(self) -> Optional[Span]:
+        """Innermost open span on this thread."""
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def reset(self) -> None:
+        with self._lock:
+            self.spans.clear()
+        self._origin = time.perf_counter()
+
+    def summary(self, sort: str = "Total (s)"):
+        """
+        Per-function totals.
+
+        Self time excludes time spent in instrumented calls made from inside
+        (e.g. fetch_stock_data -> yfinance.history), so it shows where time
+        actually goes. Calls on worker threads are not subtracted from the
+        caller that waits for them, so fetch_multiple's self time is mostly
+        waiting. Numeric counters are summed per function.
+
+        Returns:
+            DataFrame indexed by name with Calls, Total (s), Self (s),
+            Mean (ms), Max (ms), % of Time and one column per counter
+        """
+        import pandas as pd
+
+        with self._lock:
+            spans = list(self.spans)
+        if not spans:
+            return pd.DataFrame()
+
+        # Child time per parent, matched by thread and nesting
+        child_time = [0.0] * len(spans)
+        order = sorted(range(len(spans)), key=lambda i: (spans[i].thread, spans[i].start))
+        open_spans: dict[int, list[int]] = {}
+        for i in order:
+            s = spans[i]
+            stack = open_spans.setdefault(s.thread, [])
+            while stack and spans[stack[-1]].start + spans[stack[-1]].duration <= s.start:
+                stack.pop()
+            if stack and spans[stack[-1]].depth < s.depth:
+                child_time[stack[-1]] += s.duration
+            stack.append(i)
+
+        rows = {}
+        for s, children in zip(spans, child_time):
+            row = rows.setdefault(s.name, {"Calls": 0, "Total (s)": 0.0, "Self (s)": 0.0, "Max (ms)": 0.0})
+            row["Calls"] += 1
+            row["Total (s)"] += s.duration
+            row["Self (s)"] += s.duration - children
+            row["Max (ms)"] = max(row["Max (ms)"], s.duration * 1000)
+            for key, value in s.counters.items():
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    row[key] = row.get(key, 0) + value
+
+        table = pd.DataFrame.from_dict(rows, orient="index")
+        table.insert(3, "Mean (ms)", table["Total (s)"] / table["Calls"] * 1000)
+        self_total = table["Self (s)"].sum()
+        table.insert(5, "% of Time", table["Self (s)"] / self_total * 100 if self_total else 0.0)
+        table.index.name = "Function"
+        return table.sort_values(sort, ascending=False)
+
+    def to_chrome_trace(self, path: Union[str, Path]) -> Path:
+        """
+        Save spans in the Chrome trace event format.
+
+        Args:
+            path: Output .json file
+
+        Returns:
+            Path written
+        """
+        with self._lock:
+            spans = list(self.spans)
+        pid = os.getpid()
+        events = [
+            {
+                "name": s.name,
+                "ph": "X",
+                "ts": (s.start - self._origin) * 1e6,
+                "dur": s.duration * 1e6,
+                "pid": pid,
+                "tid": s.thread,
+                "args": {k: v if isinstance(v, (int, float, str, bool)) else str(v)
+                         for k, v in s.counters.items()},
+            }
+            for s in sorted(spans, key=lambda s: s.start)
+        ]
+        path = Path(path)
+        path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+        return path
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def __repr__(self) -> str:
+        return f"Profiler({len(self.spans)} spans, enabled={_enabled})"
+
+
+_profiler = Profiler()
+
+
+def get_profiler() -> Profiler:
+    """Return the shared registry."""
+    return _profiler
+
+
+def enable() -> Profiler:
+    """Start recording for the rest of the session."""
+    global _enabled
+    _enabled = True
+    return _profiler
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+@contextmanager
+def profiling(reset: bool = True):
+    """
+    Record everything instrumented inside the block.
+
+    Args:
+        reset: Clear earlier spans first
+
+    Yields:
+        The shared Profiler
+    """
+    global _enabled
+    previous = _enabled
+    if reset:
+        _profiler.reset()
+    _enabled = True
+    try:
+        yield _profiler
+    finally:
+        _enabled = previous
+
+
+def timed(name: str, **counters):
+    """
+    Context manager timing a block as one span.
+
+    Example:
+        >>> with timed("backtest", tickers=len(panel.tickers)) as span:
+        ...     result = backtest_signals(close, entries, exits)
+        ...     span.add(rows=len(close))
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _profiler.span(name, **counters)
+
+
+def record(**counters) -> None:
+    """
+    Add counters to the innermost open span (no-op when disabled).
+
+    Example:
+        >>> record(cache_hits=1)
+    """
+    if _enabled:
+        current = _profiler.current()
+        if current is not None:
+            current.add(**counters)
+
+
+def _size(result) -> dict:
+    """Rows and in-memory bytes of a function's result, when it has them."""
+    if hasattr(result, "shape") and hasattr(result, "memory_usage"):
+        usage = result.memory_usage(index=True)       # Series for frames, int for series
+        return {"rows": result.shape[0], "bytes": int(usage.sum() if hasattr(usage, "sum") else usage)}
+    if hasattr(result, "nbytes") and hasattr(result, "shape"):
+        return {"rows": result.shape[0] if result.shape else 1, "bytes": int(result.nbytes)}
+    if isinstance(result, dict) and result and all(hasattr(v, "shape") for v in result.values()):
+        sizes = [_size(v) for v in result.values()]
+        return {"rows": sum(s["rows"] for s in sizes), "bytes": sum(s["bytes"] for s in sizes)}
+    return {}
+
+
+def instrument(fn: Optional[Callable] = None, *, name: Optional[str] = None, size: bool = True):
+    """
+    Decorator recording each call of a function as a span.
+
+    Rows and bytes of DataFrame, Series, array and dict-of-DataFrame results
+    are counted automatically (size=False to skip, e.g. for figures).
+
+    Args:
+        fn: Function to wrap (when used as @instrument)
+        name: Span name (default: module.function)
+        size: Count rows/bytes of the return value
+
+    Example:
+        >>> @instrument
+        ... def fetch_stock_data(ticker, ...): ...
+
+        >>> @instrument(name="charts.rsi", size=False)
+        ... def plot_rsi(df): ...
+    """
+    def decorate(func: Callable) -> Callable:
+        label = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _profiler.span(label) as span:
+                result = func(*args, **kwargs)
+                if size:
+                    span.add(**_size(result))
+                return result
+        return wrapper
+
+    return decorate(fn) if fn is not None else decorate
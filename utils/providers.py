@@ -0,0 +1,438 @@
+"""
+Market Data Providers for Money Talks
+
+Provides a small pluggable interface for where price history comes from:
+
+- yfinance: Live data from Yahoo Finance (the default)
+- local: CSV/Parquet files in a directory, no network needed
+- synthetic: Deterministic, seeded OHLCV generated from a GBM or jump model
+
+Pick a backend per call (``fetch_stock_data("AAPL", provider="synthetic")``),
+for the whole session (``set_provider("local", directory="data/prices")``),
+or with the ``MONEY_TALKS_PROVIDER`` environment variable.
+"""
+
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .cache import INTRADAY_INTERVALS, period_start
+from .profiling import instrument
+
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume", "Dividends", "Stock Splits"]
+
+SYMBOLS_PATH = Path(__file__).parent.parent / "data" / "sp500_symbols.csv"
+
+
+class DataProvider:
+    """
+    Base class for market data backends.
+
+    Subclasses implement ``history`` and optionally ``info``. Only network
+    sources should set ``cacheable = True``; ``fetch_stock_data`` then stores
+    their results in the shared on-disk cache under ``data/cache/``.
+    """
+
+    name = "base"
+    cacheable = False
+
+    def history(
+        self,
+        ticker: str,
+        interval: str = "1d",
+        period: Optional[str] = None,
+        start=None,
+    ) -> pd.DataFrame:
+        """
+        Get OHLCV history for a ticker.
+
+        Args:
+            ticker: Stock symbol
+            interval: Data interval (1m, 5m, 1h, 1d, 1wk, ...)
+            period: Time period (1mo, 1y, max, ...), used when start is None
+            start: Earliest date to return
+
+        Returns:
+            DataFrame with DatetimeIndex and Open, High, Low, Close, Volume columns
+        """
+        raise NotImplementedError
+
+    def info(self, ticker: str) -> dict:
+        """Get descriptive information (name, sector, marketCap, ...) for a ticker."""
+        return {"symbol": ticker}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+_PROVIDERS: dict[str, type] = {}
+_default_provider: Optional[DataProvider] = None
+
+
+def register_provider(name: str):
+    """
+    Class decorator registering a DataProvider under a name.
+
+    Example:
+        >>> @register_provider("my_feed")
+        ... class MyFeed(DataProvider):
+        ...     def history(self, ticker, interval="1d", period=None, start=None):
+        ...         ...
+    """
+    def decorator(cls: type) -> type:
+        cls.name = name
+        _PROVIDERS[name] = cls
+        return cls
+    return decorator
+
+
+def available_providers() -> list[str]:
+    """Names of all registered providers."""
+    return sorted(_PROVIDERS)
+
+
+def get_provider(
+    provider: Union[str, DataProvider, None] = None, **kwargs
+) -> DataProvider:
+    """
+    Resolve a provider name or instance.
+
+    Args:
+        provider: Registered name, a DataProvider instance, or None for the
+            session default
+        **kwargs: Constructor arguments when provider is a name
+
+    Returns:
+        DataProvider instance
+
+    Example:
+        >>> synthetic = get_provider("synthetic", seed=42)
+        >>> df = synthetic.history("AAPL", period="1y")
+    """
+    global _default_provider
+    if isinstance(provider, DataProvider):
+        return provider
+    if provider is None:
+        if _default_provider is None:
+            _default_provider = get_provider(
+                os.environ.get("MONEY_TALKS_PROVIDER", "yfinance")
+            )
+        return _default_provider
+    if provider not in _PROVIDERS:
+        raise ValueError(
+            f"Unknown provider: {provider}. Use one of: {', '.join(available_providers())}"
+        )
+    return _PROVIDERS[provider](**kwargs)
+
+
+def set_provider(provider: Union[str, DataProvider], **kwargs) -> DataProvider:
+    """
+    Set the provider used by default for the rest of the session.
+
+    Example:
+        >>> set_provider("synthetic", seed=7)  # run notebooks with no network
+    """
+    global _default_provider
+    _default_provider = get_provider(provider, **kwargs)
+    return _default_provider
+
+
+def _slice_history(df: pd.DataFrame, period: Optional[str], start) -> pd.DataFrame:
+    """Trim a full history to a start date or a period ending at its last bar."""
+    if df.empty:
+        return df
+    if start is not None:
+        start = pd.Timestamp(start)
+        if df.index.tz is not None and start.tz is None:
+            start = start.tz_localize(df.index.tz)
+        return df[df.index >= start]
+    first = period_start(period or "1y", df.index[-1])
+    return df if first is None else df[df.index >= first]
+
+
+# ----------------------------------------------------------------------
+# yfinance
+# ----------------------------------------------------------------------
+
+
+@register_provider("yfinance")
+class YFinanceProvider(DataProvider):
+    """Live data from Yahoo Finance via yfinance."""
+
+    cacheable = True
+
+    @instrument(name="yfinance.history")
+    def history(self, ticker, interval="1d", period=None, start=None):
+        import yfinance as yf
+
+        stock = yf.Ticker(ticker)
+        if start is not None:
+            return stock.history(start=start, interval=interval)
+        return stock.history(period=period or "1y", interval=interval)
+
+    @instrument(name="yfinance.info", size=False)
+    def info(self, ticker):
+        import yfinance as yf
+
+        return yf.Ticker(ticker).info
+
+    @instrument(name="yfinance.download_many")
+    def download_many(
+        self, tickers: list[str], period: str, interval: str
+    ) -> dict[str, pd.DataFrame]:
+        """Download several tickers in a single round trip with yf.download."""
+        import yfinance as yf
+
+        raw = yf.download(
+            tickers,
+            period=period,
+            interval=interval,
+            group_by="ticker",
+            actions=True,
+            auto_adjust=True,
+            threads=False,
+            progress=False,
+            ignore_tz=False,    # keep exchange tz, like Ticker.history, for cache merges
+        )
+        frames = {}
+        for ticker in tickers:
+            if ticker not in raw.columns.get_level_values(0):
+                continue
+            df = raw[ticker].dropna(how="all")
+            if not df.empty:
+                df.columns.name = None
+                frames[ticker] = df
+        return frames
+
+
+# ----------------------------------------------------------------------
+# Local files
+# ----------------------------------------------------------------------
+
+
+@register_provider("local")
+class LocalProvider(DataProvider):
+    """
+    Read price history from files in a directory.
+
+    Files are looked up as ``{TICKER}_{interval}.parquet``, ``.csv`` or
+    ``.pkl``, falling back to ``{TICKER}.csv`` etc. for daily data. CSV files
+    need a date column first (as written by ``df.to_csv()``). Optional
+    ``info.json`` maps tickers to info dicts.
+
+    Example:
+        >>> provider = LocalProvider("data/prices")
+        >>> df = provider.history("AAPL", period="6mo")
+    """
+
+    suffixes = (".parquet", ".csv", ".pkl")
+
+    def __init__(self, directory: Union[str, Path] = "data/prices"):
+        self.directory = Path(directory)
+        self._info: Optional[dict] = None
+
+    def _find(self, ticker: str, interval: str) -> Optional[Path]:
+        stems = [f"{ticker}_{interval}"]
+        if interval == "1d":
+            stems.append(ticker)
+        for stem in stems:
+            for suffix in self.suffixes:
+                path = self.directory / f"{stem}{suffix}"
+                if path.exists():
+                    return path
+        return None
+
+    def history(self, ticker, interval="1d", period=None, start=None):
+        path = self._find(ticker.upper(), interval)
+        if path is None:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+        if path.suffix == ".parquet":
+            df = pd.read_parquet(path)
+        elif path.suffix == ".pkl":
+            df = pd.read_pickle(path)
+        else:
+            df = pd.read_csv(path, index_col=0)
+            df.index = pd.to_datetime(df.index, utc=True).tz_convert("America/New_York")
+        return _slice_history(df.sort_index(), period, start)
+
+    def info(self, ticker):
+        if self._info is None:
+            path = self.directory / "info.json"
+            self._info = json.loads(path.read_text()) if path.exists() else {}
+        return self._info.get(ticker.upper(), {"symbol": ticker})
+
+    def __repr__(self) -> str:
+        return f"LocalProvider({str(self.directory)!r})"
+
+
+# ----------------------------------------------------------------------
+# Synthetic data
+# ----------------------------------------------------------------------
+
+# Bars per regular session (9:30-16:00 ET) for intraday intervals
+_INTRADAY_MINUTES = {
+    "1m": 1, "2m": 2, "5m": 5, "15m": 15, "30m": 30, "60m": 60, "90m": 90, "1h": 60,
+}
+_BARS_PER_YEAR = {"1d": 252, "5d": 252 / 5, "1wk": 52, "1mo": 12, "3mo": 4}
+
+
+@register_provider("synthetic")
+class SyntheticProvider(DataProvider):
+    """
+    Deterministic synthetic OHLCV for offline lessons and benchmarks.
+
+    Each ticker gets its own reproducible random path derived from ``seed``
+    and the symbol. Paths are generated backwards from a fixed ``end`` date,
+    so '1y' is always the last year of the '5y' series. Generation is fully
+    vectorized, so millions of bars take well under a second.
+
+    Args:
+        seed: Base random seed
+        model: 'gbm' for geometric Brownian motion, 'jump' to add
+            Merton-style Poisson jumps
+        end: Last date of every series
+        mu: Annual drift
+        sigma: Annual volatility, or None to draw one per ticker (15-45%)
+        jump_intensity: Expected jumps per year ('jump' model)
+        jump_mean: Mean log jump size
+        jump_std: Standard deviation of log jump size
+
+    Example:
+        >>> provider = SyntheticProvider(seed=42, model="jump")
+        >>> df = provider.history("AAPL", interval="1m", period="5d")
+        >>> len(df)
+        1560
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        model: str = "gbm",
+        end: Union[str, pd.Timestamp] = "2024-12-31",
+        mu: float = 0.08,
+        sigma: Optional[float] = None,
+        jump_intensity: float = 3.0,
+        jump_mean: float = -0.02,
+        jump_std: float = 0.05,
+    ):
+        if model not in ("gbm", "jump"):
+            raise ValueError(f"Unknown model: {model}. Use 'gbm' or 'jump'.")
+        self.seed = seed
+        self.model = model
+        self.end = pd.Timestamp(end).normalize()
+        self.mu = mu
+        self.sigma = sigma
+        self.jump_intensity = jump_intensity
+        self.jump_mean = jump_mean
+        self.jump_std = jump_std
+        self._symbols: Optional[pd.DataFrame] = None
+
+    def _rng(self, ticker: str, stream: int = 0) -> np.random.Generator:
+        return np.random.default_rng([self.seed, zlib.crc32(ticker.upper().encode()), stream])
+
+    def _index(self, interval: str, period: Optional[str], start) -> pd.DatetimeIndex:
+        """Bar timestamps from the period/start through self.end, newest last."""
+        tz = "America/New_York"
+        end = self.end.tz_localize(tz)
+        if start is not None:
+            first = pd.Timestamp(start)
+            first = first.tz_localize(tz) if first.tz is None else first.tz_convert(tz)
+        else:
+            default = "1mo" if interval in INTRADAY_INTERVALS else "20y"
+            period = default if (period or "1y") == "max" else (period or "1y")
+            first = period_start(period, end)
+
+        if interval in _INTRADAY_MINUTES:
+            step = _INTRADAY_MINUTES[interval]
+            sessions = pd.bdate_range(first.normalize(), end, tz=tz)
+            offsets = pd.to_timedelta(np.arange(0, 390, step) + 570, unit="min")
+            index = sessions.repeat(len(offsets)) + np.tile(
+                offsets.values, len(sessions)
+            )
+            return index[index >= first]
+
+        freq = {"1d": "B", "5d": "5B", "1wk": "W-FRI", "1mo": "BME", "3mo": "BQE"}.get(interval)
+        if freq is None:
+            raise ValueError(f"Unsupported interval for synthetic data: {interval}")
+        return pd.date_range(end=end, start=first, freq=freq, tz=tz)
+
+    def history(self, ticker, interval="1d", period=None, start=None):
+        index = self._index(interval, period, start)
+        n = len(index)
+        if n == 0:
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+        if interval in _INTRADAY_MINUTES:
+            bars_per_year = 252 * 390 / _INTRADAY_MINUTES[interval]
+        else:
+            bars_per_year = _BARS_PER_YEAR[interval]
+        dt = 1.0 / bars_per_year
+
+        # Per-ticker characteristics come from their own stream so they don't
+        # depend on how many bars are requested
+        traits = self._rng(ticker, stream=1)
+        sigma = self.sigma if self.sigma is not None else traits.uniform(0.15, 0.45)
+        last_close = float(np.exp(traits.uniform(np.log(20), np.log(500))))
+        daily_volume = float(np.exp(traits.uniform(np.log(1e6), np.log(5e7))))
+        bar_volume = daily_volume * 252 / bars_per_year
+
+        # Each component has its own stream, drawn newest-first, so shorter
+        # requests are an exact suffix of longer ones
+        z = [self._rng(ticker, stream=10 + k).standard_normal(n) for k in range(4)]
+        log_ret = (self.mu - 0.5 * sigma ** 2) * dt + sigma * np.sqrt(dt) * z[0]
+        if self.model == "jump":
+            jumps = self._rng(ticker, stream=20).poisson(self.jump_intensity * dt, n)
+            log_ret += jumps * self.jump_mean + np.sqrt(jumps) * self.jump_std * z[1]
+
+        # close[newest] = last_close; walk backwards through the returns
+        log_close = np.log(last_close) - np.concatenate(([0.0], np.cumsum(log_ret[:-1])))
+        close = np.exp(log_close)[::-1]
+        ret = log_ret[::-1]
+
+        bar_sigma = sigma * np.sqrt(dt)
+        open_ = close * np.exp(-ret + 0.2 * bar_sigma * z[1][::-1])
+        spread = np.abs(z[2][::-1]) * 0.5 * bar_sigma
+        high = np.maximum(open_, close) * np.exp(spread)
+        low = np.minimum(open_, close) * np.exp(-np.abs(z[3][::-1]) * 0.5 * bar_sigma)
+        volume = bar_volume * np.exp(0.3 * z[2][::-1] + 5 * np.abs(ret))
+
+        df = pd.DataFrame(
+            {
+                "Open": open_,
+                "High": high,
+                "Low": low,
+                "Close": close,
+                "Volume": volume.astype(np.int64),
+                "Dividends": 0.0,
+                "Stock Splits": 0.0,
+            },
+            index=index,
+        )
+        df.index.name = "Datetime" if interval in _INTRADAY_MINUTES else "Date"
+        return df
+
+    def info(self, ticker):
+        if self._symbols is None:
+            self._symbols = (
+                pd.read_csv(SYMBOLS_PATH).set_index("Symbol")
+                if SYMBOLS_PATH.exists() else pd.DataFrame()
+            )
+        ticker = ticker.upper()
+        row = self._symbols.loc[ticker] if ticker in self._symbols.index else None
+        traits = self._rng(ticker, stream=2)
+        return {
+            "symbol": ticker,
+            "longName": row["Name"] if row is not None else f"{ticker} Synthetic Corp.",
+            "sector": row["Sector"] if row is not None else "Synthetic",
+            "exchange": row["Exchange"] if row is not None else "SYN",
+            "marketCap": int(np.exp(traits.uniform(np.log(1e8), np.log(3e12)))),
+        }
+
+    def __repr__(self) -> str:
+        return f"SyntheticProvider(seed={self.seed}, model={self.model!r})"
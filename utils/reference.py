@@ -0,0 +1,470 @@
+"""
+Reference Data Helpers for Money Talks
+
+Provides a local, indexed store of ticker reference data: name, sector and
+exchange from ``data/sp500_symbols.csv``, plus ``info`` fields (market cap,
+P/E, book value, ...) fetched from the data provider and cached on disk
+with a time-to-live.
+
+Screening notebooks can filter hundreds of names by sector or market-cap
+tier without an ``.info`` round trip per ticker, and refresh the stale
+ones in bulk on a thread pool.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+import pandas as pd
+
+from .cache import DEFAULT_CACHE_DIR
+from .providers import SYMBOLS_PATH, DataProvider, get_provider
+
+
+# Lower bound of each tier, largest first
+MARKET_CAP_TIERS = [
+    (200_000_000_000, "Mega Cap"),   # $200B+
+    (10_000_000_000, "Large Cap"),   # $10B+
+    (2_000_000_000, "Mid Cap"),      # $2B+
+    (300_000_000, "Small Cap"),      # $300M+
+    (0, "Micro Cap"),
+]
+TIER_NAMES = [name for _, name in MARKET_CAP_TIERS]
+
+# Fields used by the value and growth screens
+FUNDAMENTAL_FIELDS = [
+    "shortName", "sector", "currentPrice", "marketCap", "trailingPE", "forwardPE",
+    "priceToBook", "priceToSalesTrailing12Months", "trailingEps", "bookValue",
+    "debtToEquity", "currentRatio", "returnOnEquity", "dividendYield",
+    "profitMargins", "revenueGrowth", "earningsGrowth", "pegRatio",
+]
+
+
+def market_cap_tier(market_cap: Optional[float]) -> str:
+    """
+    Classify a market capitalization into a tier.
+
+    Args:
+        market_cap: Market cap in dollars (None counts as 0)
+
+    Returns:
+        One of: 'Mega Cap', 'Large Cap', 'Mid Cap', 'Small Cap', 'Micro Cap'
+
+    Example:
+        >>> market_cap_tier(3e12)
+        'Mega Cap'
+    """
+    market_cap = market_cap or 0
+    for floor, name in MARKET_CAP_TIERS:
+        if market_cap >= floor:
+            return name
+    return MARKET_CAP_TIERS[-1][1]
+
+
+def _scalars(info: dict) -> dict:
+    """Keep the JSON-friendly scalar fields of a provider info dict."""
+    return {
+        k: v for k, v in info.items()
+        if v is None or isinstance(v, (str, int, float, bool))
+    }
+
+
+class ReferenceData:
+    """
+    Memoized symbol table plus a TTL cache of provider ``info`` fields.
+
+    The symbol CSV is read once and indexed by sector. Info dicts are kept
+    per provider in ``<cache_dir>/reference_<provider>.json`` and only
+    re-fetched once older than ``ttl``. In offline mode stale entries are
+    served as-is and missing ones raise LookupError.
+
+    Bulk refreshes save in one write. Entries fetched one at a time by
+    ``info()`` are saved at most every ``save_interval`` seconds and on
+    ``flush()`` (the shared store also flushes at interpreter exit), so
+    looking up N tickers in a loop does not rewrite the file N times.
+
+    Example:
+        >>> ref = ReferenceData()
+        >>> ref.refresh(ref.by_sector("Technology"))
+        >>> ref.by_tier("Mega Cap", sector="Technology")
+        ['AAPL', 'MSFT', 'NVDA', ...]
+    """
+
+    def __init__(
+        self,
+        symbols_path: Union[str, Path, None] = None,
+        cache_dir: Union[str, Path, None] = None,
+        ttl: timedelta = timedelta(days=1),
+        offline: bool = False,
+        save_interval: float = 5.0,
+    ):
+        self.symbols_path = Path(symbols_path or SYMBOLS_PATH)
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.ttl = ttl
+        self.offline = offline
+        self._symbols: Optional[pd.DataFrame] = None
+        self._sectors: Optional[dict[str, list[str]]] = None
+        self._info: dict[str, dict[str, dict]] = {}   # provider -> symbol -> entry
+        self._lock = threading.Lock()
+        # Single-ticker misses are written at most every save_interval seconds
+        self.save_interval = save_interval
+        self._dirty: set[str] = set()
+        self._saved_at: dict[str, float] = {}
+
+    # ------------------------------------------------------------------
+    # Symbol table
+    # ------------------------------------------------------------------
+
+    @property
+    def symbols(self) -> pd.DataFrame:
+        """Symbol table indexed by Symbol with Name, Sector and Exchange columns."""
+        if self._symbols is None:
+            if self.symbols_path.exists():
+                df = pd.read_csv(self.symbols_path).set_index("Symbol")
+            else:
+                df = pd.DataFrame(columns=["Name", "Sector", "Exchange"])
+                df.index.name = "Symbol"
+            self._symbols = df
+            self._sectors = {
+                sector: list(group) for sector, group in df.groupby("Sector").groups.items()
+            }
+        return self._symbols
+
+    def tickers(self) -> list[str]:
+        """All symbols in the table, in file order."""
+        return self.symbols.index.tolist()
+
+    def sectors(self) -> list[str]:
+        """Sector names, sorted."""
+        self.symbols
+        return sorted(self._sectors)
+
+    def by_sector(self, sector: str) -> list[str]:
+        """
+        Symbols in a sector (from the symbol table, no network).
+
+        Args:
+            sector: Sector name as in sectors()
+
+        Returns:
+            List of ticker symbols
+        """
+        self.symbols
+        if sector not in self._sectors:
+            raise ValueError(f"Unknown sector: {sector}. Use one of: {', '.join(self.sectors())}")
+        return list(self._sectors[sector])
+
+    def lookup(self, ticker: str, provider: Union[str, DataProvider, None] = None) -> dict:
+        """
+        Name, sector and exchange for a ticker, plus any cached info fields.
+
+        Never touches the network.
+        """
+        ticker = ticker.upper()
+        entry = self._entries(get_provider(provider).name).get(ticker)
+        record = {"symbol": ticker, **(entry["info"] if entry else {})}
+        if ticker in self.symbols.index:
+            row = self.symbols.loc[ticker]
+            record.update(longName=row["Name"], sector=row["Sector"], exchange=row["Exchange"])
+        return record
+
+    # ------------------------------------------------------------------
+    # Info cache
+    # ------------------------------------------------------------------
+
+    def _path(self, provider_name: str) -> Path:
+        return self.cache_dir / f"reference_{provider_name}.json"
+
+    def _entries(self, provider_name: str) -> dict[str, dict]:
+        """Cached entries for one provider, loaded from disk on first use."""
+        if provider_name not in self._info:
+            path = self._path(provider_name)
+            self._info[provider_name] = json.loads(path.read_text()) if path.exists() else {}
+        return self._info[provider_name]
+
+    def _save(self, provider_name: str) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(provider_name)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}")
+        with self._lock:
+            tmp.write_text(json.dumps(self._entries(provider_name)))
+            self._dirty.discard(provider_name)
+            self._saved_at[provider_name] = time.monotonic()
+        os.replace(tmp, path)
+
+    def flush(self) -> None:
+        """Write any info fetched by info() that is not on disk yet."""
+        for provider_name in list(self._dirty):
+            self._save(provider_name)
+
+    def _fresh(self, entry: Optional[dict]) -> bool:
+        if entry is None:
+            return False
+        return self.offline or time.time() - entry["updated"] < self.ttl.total_seconds()
+
+    def stale(
+        self,
+        tickers: Optional[Iterable[str]] = None,
+        provider: Union[str, DataProvider, None] = None,
+    ) -> list[str]:
+        """Tickers whose cached info is missing or older than the TTL."""
+        entries = self._entries(get_provider(provider).name)
+        tickers = self.tickers() if tickers is None else tickers
+        return [t.upper() for t in tickers if not self._fresh(entries.get(t.upper()))]
+
+    def info(
+        self,
+        ticker: str,
+        provider: Union[str, DataProvider, None] = None,
+        refresh: bool = False,
+    ) -> dict:
+        """
+        Provider info for a ticker, served from the cache while fresh.
+
+        Args:
+            ticker: Stock symbol
+            provider: Data source (see utils.providers); defaults to the session provider
+            refresh: Ignore the cache and re-fetch
+
+        Returns:
+            Dictionary of scalar info fields (name, sector, marketCap, ...)
+        """
+        source = get_provider(provider)
+        ticker = ticker.upper()
+        entries = self._entries(source.name)
+        entry = entries.get(ticker)
+        if not refresh and self._fresh(entry):
+            return dict(entry["info"])
+        if self.offline:
+            if entry is not None:
+                return dict(entry["info"])
+            raise LookupError(f"No cached info for {ticker} (offline mode)")
+
+        info = _scalars(source.info(ticker))
+        with self._lock:
+            entries[ticker] = {"info": info, "updated": time.time()}
+            self._dirty.add(source.name)
+        if time.monotonic() - self._saved_at.get(source.name, float("-inf")) >= self.save_interval:
+            self._save(source.name)
+        return dict(info)
+
+    def refresh(
+        self,
+        tickers: Optional[Iterable[str]] = None,
+        provider: Union[str, DataProvider, None] = None,
+        force: bool = False,
+        max_workers: int = 8,
+        timeout: Optional[float] = 30.0,
+        retries: int = 2,
+        backoff: float = 1.0,
+        rate_limit: Optional[float] = None,
+    ):
+        """
+        Fetch info for many tickers in parallel and save it in one write.
+
+        Only stale tickers are fetched unless ``force`` is set.
+
+        Args:
+            tickers: Symbols to refresh (default: the whole symbol table)
+            provider: Data source; defaults to the session provider
+            force: Re-fetch even fresh entries
+            max_workers: Maximum concurrent requests
+            timeout: Seconds to wait for each request (None waits forever)
+            retries: Extra attempts per ticker after a failure
+            backoff: Base delay in seconds for exponential backoff
+            rate_limit: Maximum requests started per second (None = unlimited)
+
+        Returns:
+            FetchReport listing refreshed and failed tickers
+
+        Example:
+            >>> report = get_reference().refresh(rate_limit=5)
+            >>> print(report)
+        """
+        from .data_helpers import FetchReport, _run_tasks
+
+        source = get_provider(provider)
+        start = time.perf_counter()
+        tickers = self.tickers() if tickers is None else [t.upper() for t in tickers]
+        if self.offline:
+            raise LookupError("Cannot refresh reference data in offline mode")
+        todo = tickers if force else self.stale(tickers, source)
+
+        tasks = {t: (lambda t=t: _scalars(source.info(t))) for t in todo}
+        results, failures = _run_tasks(tasks, max_workers, timeout, retries, backoff, rate_limit)
+
+        entries = self._entries(source.name)
+        now = time.time()
+        with self._lock:
+            for ticker, info in results.items():
+                entries[ticker] = {"info": info, "updated": now}
+        if results:
+            self._save(source.name)
+        return FetchReport(
+            succeeded=[t for t in todo if t in results],
+            failures=failures,
+            elapsed=time.perf_counter() - start,
+        )
+
+    def clear(self, provider: Union[str, DataProvider, None] = None) -> None:
+        """Forget cached info for one provider, or all providers when None."""
+        if provider is None:
+            paths = list(self.cache_dir.glob("reference_*.json")) if self.cache_dir.exists() else []
+            self._info.clear()
+            self._dirty.clear()
+        else:
+            name = get_provider(provider).name
+            paths = [self._path(name)]
+            self._info.pop(name, None)
+            self._dirty.discard(name)
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    # ------------------------------------------------------------------
+    # Derived lookups
+    # ------------------------------------------------------------------
+
+    def market_cap(
+        self, ticker: str, provider: Union[str, DataProvider, None] = None
+    ) -> float:
+        """Market cap in dollars from the cached info (0 when unknown)."""
+        return self.info(ticker, provider).get("marketCap") or 0
+
+    def tier(self, ticker: str, provider: Union[str, DataProvider, None] = None) -> str:
+        """Market-cap tier of a ticker (see market_cap_tier)."""
+        return market_cap_tier(self.market_cap(ticker, provider))
+
+    def by_tier(
+        self,
+        tier: str,
+        sector: Optional[str] = None,
+        provider: Union[str, DataProvider, None] = None,
+    ) -> list[str]:
+        """
+        Symbols in a market-cap tier, using cached info only.
+
+        Tickers without cached info are left out; call refresh() first to
+        cover the whole table.
+
+        Args:
+            tier: Tier name, e.g. 'Large Cap'
+            sector: Optionally restrict to one sector
+            provider: Data source whose cached info to use
+
+        Returns:
+            List of ticker symbols
+        """
+        if tier not in TIER_NAMES:
+            raise ValueError(f"Unknown tier: {tier}. Use one of: {', '.join(TIER_NAMES)}")
+        entries = self._entries(get_provider(provider).name)
+        candidates = self.by_sector(sector) if sector is not None else self.tickers()
+        return [
+            t for t in candidates
+            if t in entries and market_cap_tier(entries[t]["info"].get("marketCap")) == tier
+        ]
+
+    def fundamentals(
+        self,
+        tickers: Optional[Iterable[str]] = None,
+        fields: Optional[list[str]] = None,
+        provider: Union[str, DataProvider, None] = None,
+        refresh: bool = True,
+        **refresh_kwargs,
+    ) -> pd.DataFrame:
+        """
+        One row per ticker of cached info fields, ready for screening.
+
+        Args:
+            tickers: Symbols (default: the whole symbol table)
+            fields: Info keys to include (default: FUNDAMENTAL_FIELDS)
+            provider: Data source; defaults to the session provider
+            refresh: Bulk-refresh stale tickers first
+            **refresh_kwargs: Passed to refresh() (max_workers, rate_limit, ...)
+
+        Returns:
+            DataFrame indexed by Ticker with Name, Sector, Tier and the
+            requested fields (NaN where a provider has no value)
+
+        Example:
+            >>> df = get_reference().fundamentals(["JPM", "KO", "NVDA"])
+            >>> df[df["trailingPE"] < 15]
+        """
+        source = get_provider(provider)
+        tickers = self.tickers() if tickers is None else [t.upper() for t in tickers]
+        fields = FUNDAMENTAL_FIELDS if fields is None else fields
+        if refresh and not self.offline:
+            report = self.refresh(tickers, source, **refresh_kwargs)
+            if report.failures:
+                names = ", ".join(f.ticker for f in report.failures)
+                print(f"Warning: Could not fetch info for {len(report.failures)} ticker(s): {names}")
+
+        entries = self._entries(source.name)
+        rows = {}
+        for t in tickers:
+            info = entries[t]["info"] if t in entries else {}
+            known = self.symbols.loc[t] if t in self.symbols.index else None
+            row = {
+                "Name": known["Name"] if known is not None else info.get("longName"),
+                "Sector": known["Sector"] if known is not None else info.get("sector"),
+                "Tier": market_cap_tier(info.get("marketCap")) if "marketCap" in info else None,
+            }
+            row.update({f: info.get(f) for f in fields})
+            rows[t] = row
+        df = pd.DataFrame.from_dict(rows, orient="index", columns=["Name", "Sector", "Tier", *fields])
+        df.index.name = "Ticker"
+        # Numeric fields become float columns so screens can compare them directly
+        for col in fields:
+            values = df[col].dropna()
+            if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+                df[col] = df[col].astype(float)
+        return df
+
+    def __repr__(self) -> str:
+        return f"ReferenceData({str(self.symbols_path)!r}, ttl={self.ttl})"
+
+
+_default_reference: Optional[ReferenceData] = None
+
+
+@atexit.register
+def _flush_default() -> None:
+    """Save lookups the shared store has not written yet."""
+    if _default_reference is not None:
+        _default_reference.flush()
+
+
+def get_reference() -> ReferenceData:
+    """
+    Get the shared reference-data store used by ``get_sp500_tickers``.
+
+    Honors ``MONEY_TALKS_OFFLINE=1`` like the price cache.
+    """
+    global _default_reference
+    if _default_reference is None:
+        _default_reference = ReferenceData(offline=os.environ.get("MONEY_TALKS_OFFLINE") == "1")
+    return _default_reference
+
+
+def configure_reference(**kwargs) -> ReferenceData:
+    """
+    Replace the shared reference-data store with one built from the given settings.
+
+    Args:
+        **kwargs: Arguments for ReferenceData (symbols_path, cache_dir, ttl, offline, save_interval)
+
+    Returns:
+        The new shared ReferenceData
+
+    Example:
+        >>> configure_reference(ttl=timedelta(days=7))
+    """
+    global _default_reference
+    if _default_reference is not None:
+        _default_reference.flush()
+    _default_reference = ReferenceData(**kwargs)
+    return _default_reference
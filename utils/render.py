@@ -0,0 +1,328 @@
+"""
+Batch Rendering Helpers for Money Talks
+
+Provides headless chart rendering for whole universes (e.g. one report
+chart per S&P 500 ticker).
+
+The interactive helpers in chart_helpers create a new pyplot figure per
+call, which is right for a notebook but leaks memory in a loop. Here each
+worker process builds one figure template with the Agg canvas (no pyplot,
+no GUI), then for every ticker updates the existing artists' data in place
+and writes the file. Memory stays at one figure per worker no matter how
+many charts are rendered.
+
+Example:
+    >>> paths = render_charts(get_sp500_tickers(), "charts/rsi", kind="rsi")
+    >>> paths["AAPL"]
+    PosixPath('charts/rsi/AAPL.png')
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from . import indicators
+from .downsample import decimate, points_for_width, resample_ohlc
+
+
+KINDS = ("line", "volume", "sma", "ema", "bb", "rsi")
+FORMATS = ("png", "svg", "pdf")
+
+# Worker-process template set up by _init_worker
+_worker: dict = {}
+
+
+def _finite_limits(*arrays: np.ndarray, pad: float = 0.05) -> tuple[float, float]:
+    """Axis limits covering the finite values of all arrays, with padding."""
+    values = np.concatenate([np.asarray(a, dtype=np.float64).ravel() for a in arrays])
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        return 0.0, 1.0
+    lo, hi = values.min(), values.max()
+    margin = (hi - lo) * pad or abs(hi) * pad or 1.0
+    return lo - margin, hi + margin
+
+
+class ChartTemplate:
+    """
+    A reusable figure for one kind of chart.
+
+    The figure, axes, lines and collections are created once; update()
+    swaps in a new ticker's data and save() writes it out. Indicator
+    settings are fixed per template.
+
+    Example:
+        >>> template = ChartTemplate("bb", window=20, num_std=2.0)
+        >>> for ticker, df in data.items():
+        ...     template.update(df, title=ticker).save(f"charts/{ticker}.png")
+        >>> template.close()
+    """
+
+    def __init__(
+        self,
+        kind: str = "line",
+        figsize: tuple = (12, 8),
+        dpi: int = 100,
+        max_points: Optional[int] = None,
+        **indicator_params,
+    ):
+        """
+        Args:
+            kind: One of 'line', 'volume', 'sma', 'ema', 'bb', 'rsi'
+            figsize: Figure size in inches
+            dpi: Output resolution
+            max_points: Points per line (default: two per pixel column, 0 = all)
+            **indicator_params: window / num_std / smoothing for the indicator
+        """
+        import matplotlib
+        import matplotlib.dates as mdates
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.collections import PolyCollection
+        from matplotlib.figure import Figure
+
+        from .chart_helpers import STYLE
+
+        kind = kind.lower()
+        if kind not in KINDS:
+            raise ValueError(f"Unknown chart kind: {kind}. Use {', '.join(KINDS)}")
+        self.kind = kind
+        self.params = indicator_params
+        self.max_points = points_for_width(figsize[0], dpi) if max_points is None else max_points
+
+        # Style is applied only while building, so global rcParams stay untouched
+        with matplotlib.rc_context(STYLE):
+            self.fig = Figure(figsize=figsize, dpi=dpi)
+            FigureCanvasAgg(self.fig)
+            if kind in ("volume", "rsi"):
+                ratios = [3, 1] if kind == "volume" else [2, 1]
+                self.ax, self.lower_ax = self.fig.subplots(
+                    2, 1, sharex=True, gridspec_kw={"height_ratios": ratios}
+                )
+            else:
+                self.ax = self.fig.subplots()
+                self.lower_ax = None
+
+            self.price_line, = self.ax.plot([], [], color="#2E86AB", linewidth=1.5, label="Close")
+            self.ax.set_ylabel("Price ($)")
+            self.title = self.ax.set_title("", fontsize=14, fontweight="bold")
+
+            if kind in ("sma", "ema", "bb"):
+                window = indicator_params.get("window", 20)
+                label = f"{kind.upper()}({window})" if kind != "bb" else f"SMA({window})"
+                self.ma_line, = self.ax.plot([], [], color="#E74C3C",
+                                             linewidth=1 if kind == "bb" else 1.5, label=label)
+            if kind == "bb":
+                self.band = PolyCollection([], alpha=0.2, facecolor="#E74C3C", label="Bollinger Bands")
+                self.ax.add_collection(self.band)
+            if kind in ("sma", "ema", "bb"):
+                self.ax.legend(loc="upper left")
+
+            if kind == "volume":
+                self.bars = PolyCollection([], alpha=0.7)
+                self.lower_ax.add_collection(self.bars)
+                self.lower_ax.set_ylabel("Volume")
+            elif kind == "rsi":
+                self.rsi_line, = self.lower_ax.plot([], [], color="#9B59B6", linewidth=1.5)
+                self.lower_ax.axhline(70, color="#E74C3C", linestyle="--", alpha=0.7, label="Overbought (70)")
+                self.lower_ax.axhline(30, color="#27AE60", linestyle="--", alpha=0.7, label="Oversold (30)")
+                self.lower_ax.axhspan(70, 100, alpha=0.1, color="#E74C3C")
+                self.lower_ax.axhspan(0, 30, alpha=0.1, color="#27AE60")
+                self.lower_ax.set_ylim(0, 100)
+                self.lower_ax.set_ylabel("RSI")
+                self.lower_ax.legend(loc="upper right")
+
+            bottom = self.lower_ax or self.ax
+            locator = mdates.AutoDateLocator()
+            bottom.xaxis.set_major_locator(locator)
+            bottom.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+            # Lay out once with placeholder text so titles have room later
+            self.title.set_text("Placeholder")
+            self.fig.tight_layout()
+            self.title.set_text("")
+
+    def _thin(self, data, column: Optional[str] = None):
+        return decimate(data, self.max_points, column=column) if self.max_points else data
+
+    def update(self, df: pd.DataFrame, title: str = "") -> "ChartTemplate":
+        """Replace the chart's data with a new OHLCV DataFrame (in place) and return self."""
+        import matplotlib.dates as mdates
+
+        def x(index: pd.Index) -> np.ndarray:
+            return mdates.date2num(index)
+
+        close = df["Close"]
+        frame = pd.DataFrame({"Close": close})
+        window = self.params.get("window", 20)
+        if self.kind == "sma":
+            frame["MA"] = indicators.sma(close, window)
+        elif self.kind == "ema":
+            frame["MA"] = indicators.ema(close, window)
+        elif self.kind == "bb":
+            frame["MA"], frame["Upper"], frame["Lower"] = indicators.bollinger_bands(
+                close, window, self.params.get("num_std", 2.0)
+            )
+        frame = self._thin(frame, "Close")
+        xs = x(frame.index)
+        limits = [frame["Close"].to_numpy()]
+
+        self.price_line.set_data(xs, frame["Close"].to_numpy())
+        if "MA" in frame:
+            self.ma_line.set_data(xs, frame["MA"].to_numpy())
+        if self.kind == "bb":
+            valid = frame["Upper"].notna().to_numpy()
+            upper, lower = frame["Upper"].to_numpy()[valid], frame["Lower"].to_numpy()[valid]
+            band_x = xs[valid]
+            polygon = np.column_stack([np.concatenate([band_x, band_x[::-1]]),
+                                       np.concatenate([upper, lower[::-1]])])
+            self.band.set_verts([polygon] if len(polygon) else [])
+            limits += [upper, lower]
+
+        if self.kind == "volume":
+            bars = df[["Open", "Close", "Volume"]]
+            if self.max_points:
+                bars = resample_ohlc(bars, self.max_points // 4)
+            bx = x(bars.index)
+            half = 0.4 * (np.median(np.diff(bx)) if len(bx) > 1 else 1.0)
+            height = bars["Volume"].to_numpy(dtype=np.float64)
+            # One rectangle per bar: (n, 4 corners, xy)
+            verts = np.stack([
+                np.column_stack([bx - half, np.zeros_like(height)]),
+                np.column_stack([bx - half, height]),
+                np.column_stack([bx + half, height]),
+                np.column_stack([bx + half, np.zeros_like(height)]),
+            ], axis=1)
+            self.bars.set_verts(verts)
+            self.bars.set_facecolor(np.where(
+                bars["Close"].to_numpy() >= bars["Open"].to_numpy(), "#27AE60", "#E74C3C"
+            ))
+            self.lower_ax.set_ylim(0, max(np.nanmax(height), 1.0) * 1.05 if len(height) else 1.0)
+        elif self.kind == "rsi":
+            rsi = self._thin(indicators.rsi(close, self.params.get("window", 14),
+                                            smoothing=self.params.get("smoothing", "sma")))
+            self.rsi_line.set_data(x(rsi.index), rsi.to_numpy())
+
+        if len(xs):
+            self.ax.set_xlim(xs[0], xs[-1] if xs[-1] > xs[0] else xs[0] + 1)
+        self.ax.set_ylim(*_finite_limits(*limits))
+        self.title.set_text(title)
+        return self
+
+    def save(self, path: Union[str, Path], fmt: Optional[str] = None) -> Path:
+        """Write the current chart to a file; the format defaults to the suffix."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.fig.savefig(path, format=fmt or path.suffix.lstrip(".") or "png")
+        return path
+
+    def close(self):
+        """Release the figure's artists."""
+        self.fig.clear()
+
+    def __enter__(self) -> "ChartTemplate":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _init_worker(template_kwargs: dict, fetch_kwargs: dict):
+    # No matplotlib.use(): the template draws on its own Agg canvas, and this
+    # also runs in the caller's process, where it must not switch the backend
+    _worker["template"] = ChartTemplate(**template_kwargs)
+    _worker["fetch"] = fetch_kwargs
+
+
+def _render_one(ticker: str, df: Optional[pd.DataFrame], path: str) -> str:
+    if df is None:
+        from .data_helpers import fetch_stock_data
+        df = fetch_stock_data(ticker, **_worker["fetch"])
+    if df.empty:
+        raise ValueError(f"No data for {ticker}")
+    _worker["template"].update(df, title=ticker).save(path)
+    return path
+
+
+def render_charts(
+    data: Union[dict[str, pd.DataFrame], list[str]],
+    out_dir: Union[str, Path] = "charts",
+    kind: str = "line",
+    fmt: str = "png",
+    processes: Optional[int] = None,
+    figsize: tuple = (12, 8),
+    dpi: int = 100,
+    max_points: Optional[int] = None,
+    period: str = "1y",
+    interval: str = "1d",
+    provider: Optional[str] = None,
+    **indicator_params,
+) -> dict[str, Path]:
+    """
+    Render one chart per ticker to image files using all cores.
+
+    Args:
+        data: Dictionary mapping ticker to OHLCV DataFrame, or a list of
+            tickers to fetch inside the workers (through the price cache)
+        out_dir: Directory for the files, named ``{TICKER}.{fmt}``
+        kind: One of 'line', 'volume', 'sma', 'ema', 'bb', 'rsi'
+        fmt: 'png', 'svg' or 'pdf'
+        processes: Worker processes (default: all cores; 1 renders in-process)
+        figsize: Figure size in inches
+        dpi: Output resolution
+        max_points: Points per line (default: two per pixel column, 0 = all)
+        period: Period to fetch when data is a list of tickers
+        interval: Interval to fetch when data is a list of tickers
+        provider: Data provider name when data is a list of tickers
+        **indicator_params: window / num_std / smoothing for the indicator
+
+    Returns:
+        Dictionary mapping ticker to the written file, in input order
+
+    Example:
+        >>> data = fetch_multiple(tickers, period="2y")
+        >>> render_charts(data, "reports/bb", kind="bb", window=20)
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}. Use {', '.join(FORMATS)}")
+    template_kwargs = dict(kind=kind, figsize=figsize, dpi=dpi, max_points=max_points, **indicator_params)
+    fetch_kwargs = dict(period=period, interval=interval, provider=provider)
+    if kind.lower() not in KINDS:
+        raise ValueError(f"Unknown chart kind: {kind}. Use {', '.join(KINDS)}")
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    items = data.items() if isinstance(data, dict) else ((t, None) for t in data)
+    tasks = [(t, df, str(out_dir / f"{t}.{fmt}")) for t, df in items]
+
+    written: dict[str, Path] = {}
+    failures: dict[str, str] = {}
+    workers = processes or os.cpu_count() or 1
+
+    if workers == 1 or len(tasks) <= 1:
+        _init_worker(template_kwargs, fetch_kwargs)
+        try:
+            for ticker, df, path in tasks:
+                try:
+                    written[ticker] = Path(_render_one(ticker, df, path))
+                except Exception as e:
+                    failures[ticker] = f"{type(e).__name__}: {e}"
+        finally:
+            _worker.pop("template").close()
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(template_kwargs, fetch_kwargs)
+        ) as pool:
+            futures = {pool.submit(_render_one, *task): task[0] for task in tasks}
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    written[ticker] = Path(future.result())
+                except Exception as e:
+                    failures[ticker] = f"{type(e).__name__}: {e}"
+
+    if failures:
+        print(f"Warning: Could not render {len(failures)} chart(s): {', '.join(failures)}")
+    return {t: written[t] for t, _, _ in tasks if t in written}
@@ -0,0 +1,468 @@
+"""
+Replay Helpers for Money Talks
+
+Provides a market replay engine that streams stored historical bars as if
+they were arriving live, for exercising intraday strategies, VWAP lessons
+and dashboards without a network connection.
+
+Bars come from the local column store (``MarketStore``), the OHLCV cache,
+a Panel or a fetch_multiple dict. They are replayed one timestamp at a time
+as ``BarBatch`` objects (every ticker's bar for that minute) at real-time
+speed, N times faster, or as fast as consumers can take them.
+
+Each subscriber gets a bounded asyncio queue. By default a full queue makes
+the replay wait (backpressure: the slowest consumer sets the pace); a
+subscriber can instead drop its oldest batches to always see fresh data.
+
+Example:
+    >>> replay = Replay.from_store(["AAPL", "MSFT"], "1m", start="2024-03-04", speed=60)
+    >>> async def strategy(batch):
+    ...     for ticker, bar in batch.items():
+    ...         signal = vwaps[ticker].update(bar)
+    >>> stats = await replay.run(strategy)            # in a notebook cell
+
+    >>> async for batch in Replay(panel).stream():    # or iterate directly
+    ...     print(batch.time, batch["AAPL"]["Close"])
+"""
+
+import asyncio
+import inspect
+import time
+from typing import Callable, Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .panel import FIELDS, Panel
+from .store import _utc_nanos
+
+
+POLICIES = ("block", "drop_oldest")
+
+# Batches published between forced yields to the event loop when unpaced
+_YIELD_EVERY = 64
+
+
+class BarBatch:
+    """
+    Every ticker's bar at one timestamp.
+
+    Arrays span the whole replay universe (NaN where a ticker has no bar);
+    ``items()``, ``len()`` and ``in`` only see tickers with a bar. A bar is
+    a dict with Open/High/Low/Close/Volume keys, which is what the streaming
+    indicators' ``update()`` accepts.
+    """
+
+    __slots__ = ("timestamp", "tz", "tickers", "positions", "arrays", "_present")
+
+    def __init__(self, timestamp: int, tz, tickers: np.ndarray, positions: dict, arrays: dict):
+        self.timestamp = timestamp          # int64 UTC nanoseconds
+        self.tz = tz
+        self.tickers = tickers
+        self.positions = positions
+        self.arrays = arrays
+        self._present = None
+
+    @property
+    def time(self) -> pd.Timestamp:
+        """Timestamp of the bars, in the source's timezone."""
+        stamp = pd.Timestamp(self.timestamp, tz="UTC")
+        return stamp.tz_convert(self.tz) if self.tz is not None else stamp.tz_localize(None)
+
+    @property
+    def present(self) -> np.ndarray:
+        """Column positions of the tickers that have a bar."""
+        if self._present is None:
+            self._present = np.flatnonzero(~np.isnan(self.arrays["Close"]))
+        return self._present
+
+    def __getitem__(self, ticker: str) -> dict:
+        j = self.positions[ticker]
+        return {f: float(values[j]) for f, values in self.arrays.items()}
+
+    def __contains__(self, ticker: str) -> bool:
+        j = self.positions.get(ticker)
+        return j is not None and not np.isnan(self.arrays["Close"][j])
+
+    def __len__(self) -> int:
+        return len(self.present)
+
+    def items(self):
+        """Yield (ticker, bar) for every ticker with a bar."""
+        for j in self.present:
+            yield self.tickers[j], {f: float(values[j]) for f, values in self.arrays.items()}
+
+    def to_frame(self) -> pd.DataFrame:
+        """Bars as a DataFrame indexed by ticker."""
+        rows = self.present
+        return pd.DataFrame(
+            {f: values[rows] for f, values in self.arrays.items()},
+            index=pd.Index(self.tickers[rows], name="Ticker"),
+        )
+
+    def __repr__(self) -> str:
+        return f"BarBatch({self.time}, {len(self)} bars)"
+
+
+class Subscription:
+    """
+    A consumer's bounded queue of batches; iterate it with ``async for``.
+
+    Args:
+        maxsize: Queue capacity in batches
+        policy: 'block' (replay waits for this consumer) or 'drop_oldest'
+            (discard the oldest queued batch, counted in ``dropped``)
+        columns: Column positions of the tickers to deliver (None = all)
+    """
+
+    def __init__(self, maxsize: int = 256, policy: str = "block", columns: Optional[np.ndarray] = None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy: {policy}. Use {' or '.join(POLICIES)}")
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize)
+        self.policy = policy
+        self.columns = columns
+        self.received = 0
+        self.dropped = 0
+        self.closed = False
+
+    async def put(self, batch: Optional[BarBatch]) -> None:
+        if self.policy == "drop_oldest" and self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        await self.queue.put(batch)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> BarBatch:
+        batch = await self.queue.get()
+        if batch is None:
+            raise StopAsyncIteration
+        self.received += 1
+        return batch
+
+    def __repr__(self) -> str:
+        return f"Subscription({self.policy}, received={self.received}, dropped={self.dropped})"
+
+
+class Replay:
+    """
+    Streams a Panel's bars in timestamp order at a chosen speed.
+
+    Args:
+        data: Panel, or the dict returned by fetch_multiple
+        speed: Simulated seconds per wall-clock second (1 = real time,
+            60 = a minute per second); None replays as fast as possible
+        compress_gaps: Treat overnight and weekend gaps as one bar interval
+            so paced replays don't sit idle between sessions
+        start: First timestamp to replay
+        end: Last timestamp to replay
+
+    Example:
+        >>> replay = Replay(fetch_panel(tickers, period="5d", interval="1m"), speed=None)
+        >>> sub = replay.subscribe(["AAPL"], maxsize=10, policy="drop_oldest")
+    """
+
+    def __init__(
+        self,
+        data: Union[Panel, dict[str, pd.DataFrame]],
+        speed: Optional[float] = 1.0,
+        compress_gaps: bool = True,
+        start=None,
+        end=None,
+    ):
+        panel = data if isinstance(data, Panel) else Panel.from_frames(data)
+        index = panel.index
+        if start is not None or end is not None:
+            mask = np.ones(len(index), dtype=bool)
+            if start is not None:
+                mask &= index >= _localize(start, index.tz)
+            if end is not None:
+                mask &= index <= _localize(end, index.tz)
+            index = index[mask]
+            panel = Panel({f: m.loc[mask] for f, m in panel.fields.items()})
+        if speed is not None and speed <= 0:
+            raise ValueError(f"speed must be positive or None, got {speed}")
+
+        self.speed = speed
+        self.tz = index.tz
+        self.tickers = np.array(panel.tickers, dtype=object)
+        self.positions = {t: j for j, t in enumerate(panel.tickers)}
+        self.timestamps = _utc_nanos(index)
+        # C-contiguous (dates x tickers) so each timestamp's row is a view
+        self.fields = {
+            f: np.ascontiguousarray(panel.fields[f].to_numpy(dtype=np.float64))
+            for f in FIELDS if f in panel.fields
+        }
+
+        steps = np.diff(self.timestamps)
+        self.bar_ns = int(np.median(steps)) if len(steps) else 0
+        self.offsets = np.concatenate([[0], np.cumsum(np.minimum(steps, self.bar_ns) if compress_gaps else steps)])
+
+        self.subscriptions: list[Subscription] = []
+        self.position = 0
+        self.published = 0
+        self.elapsed = 0.0
+        self._resume = asyncio.Event()
+        self._resume.set()
+        self._stopped = False
+
+    # -- sources ---------------------------------------------------------
+
+    @classmethod
+    def from_store(
+        cls,
+        tickers: Optional[Iterable[str]] = None,
+        interval: str = "1m",
+        start=None,
+        end=None,
+        store=None,
+        **kwargs,
+    ) -> "Replay":
+        """
+        Replay bars from the local column store (memory-mapped, no network).
+
+        Args:
+            tickers: Symbols (default: every stored ticker at this interval)
+            interval: Bar interval
+            start: First timestamp to replay
+            end: Last timestamp to replay
+            store: MarketStore (default: the one at DEFAULT_STORE_DIR)
+            **kwargs: Passed to Replay (speed, compress_gaps)
+        """
+        from .store import MarketStore
+
+        store = store or MarketStore()
+        return cls(Panel({
+            f: store.panel(tickers, interval, f, start, end) for f in FIELDS
+        }), **kwargs)
+
+    @classmethod
+    def from_cache(
+        cls,
+        tickers: Iterable[str],
+        interval: str = "1m",
+        cache=None,
+        **kwargs,
+    ) -> "Replay":
+        """
+        Replay whatever the OHLCV cache holds for the tickers (no network).
+
+        Args:
+            tickers: Symbols to replay; ones not in the cache are skipped
+            interval: Bar interval
+            cache: OHLCVCache (default: the shared cache)
+            **kwargs: Passed to Replay (speed, compress_gaps, start, end)
+        """
+        from .cache import get_cache
+
+        cache = cache or get_cache()
+        frames = {}
+        for ticker in tickers:
+            df = cache.read(ticker, interval)
+            if df is None or df.empty:
+                print(f"Warning: No cached {interval} data for {ticker}")
+            else:
+                frames[ticker] = df
+        return cls(frames, **kwargs)
+
+    # -- subscribers -----------------------------------------------------
+
+    def subscribe(
+        self,
+        tickers: Optional[Iterable[str]] = None,
+        maxsize: int = 256,
+        policy: str = "block",
+    ) -> Subscription:
+        """
+        Add a consumer queue. Subscribe before the replay starts.
+
+        Args:
+            tickers: Only deliver these tickers (default: all)
+            maxsize: Queue capacity in batches
+            policy: 'block' applies backpressure; 'drop_oldest' never
+                slows the replay down
+
+        Returns:
+            Subscription to iterate with ``async for``
+        """
+        columns = None
+        if tickers is not None:
+            columns = np.array([self.positions[t] for t in tickers], dtype=np.intp)
+        sub = Subscription(maxsize, policy, columns)
+        self.subscriptions.append(sub)
+        return sub
+
+    def _batch(self, row: int, columns: Optional[np.ndarray] = None) -> BarBatch:
+        if columns is None:
+            arrays = {f: m[row] for f, m in self.fields.items()}
+            return BarBatch(int(self.timestamps[row]), self.tz, self.tickers, self.positions, arrays)
+        tickers = self.tickers[columns]
+        arrays = {f: m[row, columns] for f, m in self.fields.items()}
+        return BarBatch(int(self.timestamps[row]), self.tz, tickers,
+                        {t: j for j, t in enumerate(tickers)}, arrays)
+
+    # -- control ---------------------------------------------------------
+
+    def pause(self) -> None:
+        self._resume.clear()
+
+    def resume(self) -> None:
+        self._resume.set()
+
+    def stop(self) -> None:
+        """End the replay after the current batch."""
+        self._stopped = True
+        self._resume.set()
+
+    @property
+    def now(self) -> Optional[pd.Timestamp]:
+        """Simulated time: the timestamp of the last published batch."""
+        if self.position == 0:
+            return None
+        stamp = pd.Timestamp(int(self.timestamps[self.position - 1]), tz="UTC")
+        return stamp.tz_convert(self.tz) if self.tz is not None else stamp.tz_localize(None)
+
+    # -- streaming -------------------------------------------------------
+
+    async def stream(self):
+        """
+        Async generator of batches, paced by ``speed``.
+
+        Resumes from where a stopped or partial replay left off.
+        """
+        loop = asyncio.get_running_loop()
+        self._stopped = False
+        first = self.position
+        origin = loop.time()
+        started = time.perf_counter()
+        try:
+            for row in range(first, len(self.timestamps)):
+                if self._stopped:
+                    break
+                if not self._resume.is_set():
+                    paused = loop.time()
+                    await self._resume.wait()
+                    origin += loop.time() - paused
+                if self.speed is not None:
+                    delay = origin + (self.offsets[row] - self.offsets[first]) / 1e9 / self.speed - loop.time()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                elif (row - first) % _YIELD_EVERY == _YIELD_EVERY - 1:
+                    await asyncio.sleep(0)
+                self.position = row + 1
+                yield self._batch(row)
+        finally:
+            self.elapsed += time.perf_counter() - started
+
+    async def publish(self) -> None:
+        """
+        Feed every open subscription, then send each one end-of-stream.
+
+        Subscriptions already ended by an earlier publish() are skipped;
+        subscribe again to receive the rest of a resumed replay.
+        """
+        subscriptions = [sub for sub in self.subscriptions if not sub.closed]
+        stream = self.stream()
+        try:
+            async for batch in stream:
+                for sub in subscriptions:
+                    item = batch if sub.columns is None else self._batch(self.position - 1, sub.columns)
+                    await sub.put(item)
+                    self.published += 1
+        except BaseException:
+            # Cancelled or failed: end every queue that has room, never block
+            for sub in subscriptions:
+                self._end(sub)
+            raise
+        finally:
+            await stream.aclose()
+        for sub in subscriptions:
+            self._end(sub)
+            if sub.queue.full():
+                await sub.queue.put(None)
+
+    @staticmethod
+    def _end(sub: Subscription) -> None:
+        """Close a subscription and queue end-of-stream if there is room."""
+        sub.closed = True
+        if sub.policy == "drop_oldest" and sub.queue.full():
+            sub.queue.get_nowait()
+            sub.dropped += 1
+        if not sub.queue.full():
+            sub.queue.put_nowait(None)
+
+    async def run(self, *handlers: Callable, maxsize: int = 256, policy: str = "block") -> dict:
+        """
+        Replay to handler functions until the data (or stop()) ends.
+
+        Each handler gets its own subscription for this run and is called
+        with every batch; it may be a plain function or a coroutine
+        function. After stop(), calling run() again resumes the replay. If a
+        handler raises, the replay and the other handlers are cancelled and
+        the error propagates.
+
+        Args:
+            *handlers: Callables taking a BarBatch
+            maxsize: Queue capacity per handler
+            policy: Queue policy per handler ('block' or 'drop_oldest')
+
+        Returns:
+            stats() after the replay
+
+        Example:
+            >>> await Replay(panel, speed=None).run(dashboard.update, strategy.on_bar)
+        """
+        async def consume(fn: Callable, sub: Subscription) -> None:
+            is_async = inspect.iscoroutinefunction(fn)
+            async for batch in sub:
+                result = fn(batch)
+                if is_async:
+                    await result
+
+        subs = [self.subscribe(maxsize=maxsize, policy=policy) for _ in handlers]
+        tasks = [asyncio.ensure_future(self.publish())]
+        tasks += [asyncio.ensure_future(consume(fn, sub)) for fn, sub in zip(handlers, subs)]
+        try:
+            await asyncio.gather(*tasks)
+            return self.stats()
+        except BaseException:
+            # A handler failed (or run() was cancelled): stop the publisher and
+            # the other handlers instead of leaving them blocked on full queues
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            # Drop this run's queues so a resumed run() doesn't wait on them
+            self.subscriptions = [sub for sub in self.subscriptions if sub not in subs]
+
+    def stats(self) -> dict:
+        """Batches and bars replayed, batches delivered, throughput and per-subscriber drops."""
+        batches = self.position
+        bars = int(np.count_nonzero(~np.isnan(self.fields["Close"][:batches])))
+        return {
+            "batches": batches,
+            "bars": bars,
+            "delivered": self.published,
+            "elapsed": self.elapsed,
+            "bars_per_second": bars / self.elapsed if self.elapsed else float("nan"),
+            "dropped": [sub.dropped for sub in self.subscriptions],
+        }
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __repr__(self) -> str:
+        speed = "max" if self.speed is None else f"{self.speed:g}x"
+        return f"Replay({len(self.tickers)} tickers, {len(self)} timestamps, speed={speed})"
+
+
+def _localize(when, tz) -> pd.Timestamp:
+    when = pd.Timestamp(when)
+    if tz is not None and when.tzinfo is None:
+        return when.tz_localize(tz)
+    if tz is None and when.tzinfo is not None:
+        return when.tz_convert(None)
+    return when
+
@@ -0,0 +1,444 @@
+"""
+Risk Helpers for Money Talks
+
+Provides returns and risk statistics for whole universes at once: simple and
+log returns, rolling volatility, drawdowns, Sharpe and Sortino ratios,
+rolling beta against a benchmark and rolling correlation matrices.
+
+Inputs are a prices Series (one ticker), a dates x tickers DataFrame, a
+Panel, or the dict returned by fetch_multiple. Rolling windows are computed
+from running sums, so each statistic costs one pass over the data no matter
+how long the window is. Values are de-meaned per ticker first, which keeps
+the running sums accurate over long histories.
+"""
+
+import math
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+PriceLike = Union[pd.Series, pd.DataFrame, dict, "Panel"]
+
+
+def _prices(data: PriceLike, column: str = "Close") -> Union[pd.Series, pd.DataFrame]:
+    """Turn a Series, wide DataFrame, Panel or fetch_multiple dict into prices."""
+    from .panel import Panel
+
+    if isinstance(data, dict):
+        data = Panel.from_frames(data, fields=(column,))
+    if isinstance(data, Panel):
+        return data[column]
+    if isinstance(data, pd.DataFrame) and column in data.columns:
+        return data[column]
+    return data
+
+
+def _matrix(x: Union[pd.Series, pd.DataFrame]) -> np.ndarray:
+    """Values as a 2-D float64 array with time down the rows."""
+    values = np.asarray(x, dtype=np.float64)
+    return values[:, None] if values.ndim == 1 else values
+
+
+def _unmatrix(values: np.ndarray, like: Union[pd.Series, pd.DataFrame]):
+    """Wrap a 2-D result back into the container type of ``like``."""
+    if isinstance(like, pd.Series):
+        return pd.Series(values[:, 0], index=like.index, name=like.name)
+    return pd.DataFrame(values, index=like.index, columns=like.columns, copy=False)
+
+
+def _window_sum(a: np.ndarray, window: int) -> np.ndarray:
+    """Trailing sum over ``window`` rows via a cumulative sum (a has no NaN)."""
+    total = np.cumsum(a, axis=0)
+    out = np.empty_like(total)
+    out[:window] = total[:window]
+    np.subtract(total[window:], total[:-window], out=out[window:])
+    return out
+
+
+def _centered(a: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """De-meaned values with NaN set to 0, the NaN mask and the column means."""
+    missing = np.isnan(a)
+    if not missing.any():
+        mean = a.mean(axis=0)
+        return a - mean, missing, mean
+    filled = np.where(missing, 0.0, a)
+    counts = (~missing).sum(axis=0)
+    mean = filled.sum(axis=0) / np.maximum(counts, 1)
+    filled -= mean
+    filled[missing] = 0.0
+    return filled, missing, mean
+
+
+def _complete(missing: np.ndarray, window: int) -> np.ndarray:
+    """True where the trailing window has no missing values."""
+    if not missing.any():
+        complete = np.ones(missing.shape, dtype=bool)
+    else:
+        complete = _window_sum(missing.astype(np.int32), window) == 0
+    complete[: window - 1] = False
+    return complete
+
+
+def _rolling_moments(a: np.ndarray, window: int) -> tuple[np.ndarray, np.ndarray]:
+    """Rolling mean and sample variance of each column; NaN unless the window is full."""
+    x, missing, center = _centered(a)
+    incomplete = ~_complete(missing, window)
+    sx = _window_sum(x, window)
+    np.square(x, out=x)
+    var = _window_sum(x, window)
+    # var = (sum(x^2) - sum(x)^2 / n) / (n - 1), computed in place
+    var -= sx * sx / window
+    np.maximum(var, 0.0, out=var)
+    var /= window - 1
+    var[incomplete] = np.nan
+    sx /= window
+    sx += center
+    sx[incomplete] = np.nan
+    return sx, var
+
+
+def _pair_sums(x, x_missing, y, y_missing):
+    """Zero out rows where either side is missing so sums only cover joint rows."""
+    return np.where(y_missing, 0.0, x), np.where(x_missing, 0.0, y), x_missing | y_missing
+
+
+# ----------------------------------------------------------------------
+# Returns and drawdowns
+# ----------------------------------------------------------------------
+
+
+def returns(data: PriceLike, method: str = "simple", column: str = "Close"):
+    """
+    Period returns for one ticker or a whole universe.
+
+    Args:
+        data: Prices Series, dates x tickers DataFrame, OHLCV DataFrame,
+            Panel or fetch_multiple dict
+        method: 'simple' for percentage returns, 'log' for log returns
+        column: Price column used for OHLCV DataFrames, Panels and dicts
+
+    Returns:
+        Series or dates x tickers DataFrame of returns (NaN on each
+        ticker's first bar)
+
+    Example:
+        >>> r = returns(fetch_multiple(["AAPL", "MSFT", "SPY"]), method="log")
+    """
+    prices = _prices(data, column)
+    values = _matrix(prices)
+    prev = np.full_like(values, np.nan)
+    prev[1:] = values[:-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if method == "simple":
+            out = values / prev - 1
+        elif method == "log":
+            out = np.log(values / prev)
+        else:
+            raise ValueError(f"Unknown method: {method}. Use 'simple' or 'log'.")
+    return _unmatrix(out, prices)
+
+
+def rolling_volatility(
+    returns: Union[pd.Series, pd.DataFrame],
+    window: int = 20,
+    periods_per_year: int = 252,
+    annualize: bool = True,
+):
+    """
+    Rolling standard deviation of returns, annualized by default.
+
+    Args:
+        returns: Returns Series or dates x tickers DataFrame
+        window: Bars per window
+        periods_per_year: Bars per year for annualizing
+        annualize: Scale by sqrt(periods_per_year)
+
+    Returns:
+        Same shape as returns; NaN until a full window of valid returns
+    """
+    _, var = _rolling_moments(_matrix(returns), window)
+    vol = np.sqrt(var) * (math.sqrt(periods_per_year) if annualize else 1.0)
+    return _unmatrix(vol, returns)
+
+
+def drawdown(data: PriceLike, column: str = "Close"):
+    """
+    Fractional drop from the running peak (0 at new highs, -0.25 = 25% below).
+
+    Args:
+        data: Prices (any form accepted by returns())
+        column: Price column for OHLCV DataFrames, Panels and dicts
+
+    Returns:
+        Series or dates x tickers DataFrame of drawdowns
+    """
+    prices = _prices(data, column)
+    values = _matrix(prices)
+    with np.errstate(invalid="ignore"):
+        out = values / np.fmax.accumulate(values, axis=0) - 1
+    return _unmatrix(out, prices)
+
+
+def max_drawdown(data: PriceLike, column: str = "Close"):
+    """Worst drawdown of each ticker as a negative fraction (float for a Series)."""
+    dd = drawdown(data, column)
+    return dd.min() if isinstance(dd, pd.DataFrame) else float(dd.min())
+
+
+def sharpe_ratio(
+    returns: Union[pd.Series, pd.DataFrame],
+    risk_free: float = 0.0,
+    periods_per_year: int = 252,
+):
+    """
+    Annualized Sharpe ratio of period returns.
+
+    Args:
+        returns: Returns Series or dates x tickers DataFrame
+        risk_free: Annual risk-free rate as a decimal
+        periods_per_year: Bars per year
+
+    Returns:
+        Float for a Series, Series per ticker for a DataFrame
+    """
+    excess = returns - risk_free / periods_per_year
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return excess.mean() / returns.std() * math.sqrt(periods_per_year)
+
+
+def sortino_ratio(
+    returns: Union[pd.Series, pd.DataFrame],
+    risk_free: float = 0.0,
+    periods_per_year: int = 252,
+):
+    """
+    Annualized Sortino ratio: like Sharpe, but only downside moves count as risk.
+
+    Downside deviation is the root mean square of excess returns below zero.
+
+    Args:
+        returns: Returns Series or dates x tickers DataFrame
+        risk_free: Annual risk-free rate as a decimal
+        periods_per_year: Bars per year
+
+    Returns:
+        Float for a Series, Series per ticker for a DataFrame
+    """
+    excess = returns - risk_free / periods_per_year
+    downside = np.sqrt((excess.clip(upper=0) ** 2).mean())
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return excess.mean() / downside * math.sqrt(periods_per_year)
+
+
+# ----------------------------------------------------------------------
+# Rolling co-movement
+# ----------------------------------------------------------------------
+
+
+def rolling_beta(
+    returns: Union[pd.Series, pd.DataFrame],
+    benchmark: pd.Series,
+    window: int = 60,
+):
+    """
+    Rolling beta of each ticker against a benchmark's returns.
+
+    beta = cov(ticker, benchmark) / var(benchmark) over each window, from
+    running sums of x, y, x*y and y*y.
+
+    Args:
+        returns: Returns Series or dates x tickers DataFrame
+        benchmark: Benchmark returns (aligned to returns' index)
+        window: Bars per window
+
+    Returns:
+        Same shape as returns; NaN unless both have a full window
+
+    Example:
+        >>> r = returns(fetch_multiple(get_sp500_tickers()[:50] + ["SPY"]))
+        >>> beta = rolling_beta(r, r["SPY"], window=60)
+    """
+    x, x_missing, _ = _centered(_matrix(returns))
+    y, y_missing, _ = _centered(_matrix(benchmark.reindex(returns.index)))
+    x, y, missing = _pair_sums(x, x_missing, y, y_missing)
+    complete = _complete(missing, window)
+    sx, sy = _window_sum(x, window), _window_sum(y, window)
+    sxy, syy = _window_sum(x * y, window), _window_sum(y * y, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        beta = (sxy - sx * sy / window) / (syy - sy * sy / window)
+    return _unmatrix(np.where(complete, beta, np.nan), returns)
+
+
+def rolling_correlation(
+    returns: pd.DataFrame,
+    window: int = 60,
+    step: int = 1,
+) -> pd.DataFrame:
+    """
+    Rolling correlation matrix of every pair of tickers.
+
+    The cross-product matrix X'X is updated as the window slides (add the
+    new rows, drop the old ones) instead of being rebuilt for every date,
+    and rebuilt from scratch once per window length to keep rounding from
+    accumulating. Pairs with a missing return inside the window are NaN.
+
+    Args:
+        returns: dates x tickers DataFrame of returns
+        window: Bars per window
+        step: Only compute every ``step``-th window; the output holds
+            (dates / step) x tickers x tickers values, so use e.g. step=21
+            (monthly) for hundreds of names
+
+    Returns:
+        DataFrame indexed by (date, ticker) with one column per ticker,
+        the same layout as ``returns.rolling(window).corr()``
+
+    Example:
+        >>> corr = rolling_correlation(r, window=63, step=21)
+        >>> corr.loc[corr.index.levels[0][-1]]     # latest matrix
+    """
+    x, missing, _ = _centered(_matrix(returns))
+    n_rows, n = x.shape
+    ends = np.arange(window - 1, n_rows, max(1, step))
+    gaps = _window_sum(missing.astype(np.float64), window)
+
+    out = np.empty((len(ends), n, n))
+    cross, total, prev_end, rebuilt = None, None, None, None
+    for k, end in enumerate(ends):
+        lo = end - window + 1
+        if cross is None or end - rebuilt >= window:
+            block = x[lo:end + 1]
+            cross, total, rebuilt = block.T @ block, block.sum(axis=0), end
+        else:
+            add, drop = x[prev_end + 1:end + 1], x[prev_end - window + 1:lo]
+            cross += add.T @ add - drop.T @ drop
+            total += add.sum(axis=0) - drop.sum(axis=0)
+        prev_end = end
+
+        cov = cross - np.outer(total, total) / window
+        scale = np.sqrt(np.maximum(np.diag(cov), 0.0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = np.clip(cov / np.outer(scale, scale), -1.0, 1.0)
+        bad = gaps[end] > 0
+        corr[bad, :] = np.nan
+        corr[:, bad] = np.nan
+        out[k] = corr
+
+    index = pd.MultiIndex.from_product(
+        [returns.index[ends], returns.columns], names=[returns.index.name, None]
+    )
+    return pd.DataFrame(out.reshape(-1, n), index=index, columns=returns.columns, copy=False)
+
+
+# ----------------------------------------------------------------------
+# Everything at once
+# ----------------------------------------------------------------------
+
+
+class RiskAnalysis:
+    """
+    Returns and risk statistics for a universe, computed in one go.
+
+    Attributes:
+        prices: dates x tickers prices
+        returns: Simple returns
+        log_returns: Log returns
+        volatility: Rolling annualized volatility
+        drawdown: Drawdown from the running peak
+        beta: Rolling beta against the benchmark (None without one)
+
+    Example:
+        >>> risk = RiskAnalysis(fetch_panel(get_sp500_tickers()), benchmark="SPY")
+        >>> risk.summary().sort_values("Sharpe").tail(10)
+        >>> risk.correlation(step=21)
+    """
+
+    def __init__(
+        self,
+        data: PriceLike,
+        benchmark: Union[str, pd.Series, None] = None,
+        window: int = 63,
+        risk_free: float = 0.0,
+        periods_per_year: int = 252,
+        column: str = "Close",
+    ):
+        """
+        Args:
+            data: Prices (Series, dates x tickers DataFrame, Panel or fetch_multiple dict)
+            benchmark: Benchmark ticker in the data, or a benchmark price Series
+            window: Bars per rolling window for volatility and beta
+            risk_free: Annual risk-free rate as a decimal, for Sharpe and Sortino
+            periods_per_year: Bars per year (252 daily, 52 weekly, ...)
+            column: Price column for OHLCV DataFrames, Panels and dicts
+        """
+        prices = _prices(data, column)
+        self.prices = prices.to_frame() if isinstance(prices, pd.Series) else prices
+        self.window = window
+        self.risk_free = risk_free
+        self.periods_per_year = periods_per_year
+
+        self.returns = returns(self.prices)
+        self.log_returns = np.log1p(self.returns)
+        self.volatility = rolling_volatility(self.returns, window, periods_per_year)
+        self.drawdown = drawdown(self.prices)
+
+        if isinstance(benchmark, str):
+            benchmark = self.prices[benchmark]
+        self.benchmark = benchmark
+        self.beta = None
+        if benchmark is not None:
+            bench_returns = returns(benchmark.reindex(self.prices.index))
+            self.beta = rolling_beta(self.returns, bench_returns, window)
+            self._bench_returns = bench_returns
+
+    def summary(self) -> pd.DataFrame:
+        """
+        One row of statistics per ticker.
+
+        Returns:
+            DataFrame with Total Return %, CAGR %, Volatility %, Sharpe,
+            Sortino, Max Drawdown % and (with a benchmark) Beta columns
+        """
+        r = self.returns
+        values = self.prices.to_numpy(dtype=np.float64)
+        valid = ~np.isnan(values)
+        cols = np.arange(values.shape[1])
+        first = values[np.argmax(valid, axis=0), cols]
+        last = values[len(values) - 1 - np.argmax(valid[::-1], axis=0), cols]
+        years = valid.sum(axis=0) / self.periods_per_year
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cagr = (last / first) ** (1 / years) - 1
+
+        table = pd.DataFrame(
+            {
+                "Total Return %": (last / first - 1) * 100,
+                "CAGR %": cagr * 100,
+                "Volatility %": r.std().to_numpy() * math.sqrt(self.periods_per_year) * 100,
+                "Sharpe": sharpe_ratio(r, self.risk_free, self.periods_per_year).to_numpy(),
+                "Sortino": sortino_ratio(r, self.risk_free, self.periods_per_year).to_numpy(),
+                "Max Drawdown %": self.drawdown.min().to_numpy() * 100,
+            },
+            index=self.prices.columns,
+        )
+        if self.benchmark is not None:
+            # Full-period beta over the bars each ticker shares with the benchmark
+            x, x_missing, _ = _centered(r.to_numpy(dtype=np.float64))
+            y, y_missing, _ = _centered(_matrix(self._bench_returns))
+            x, y, missing = _pair_sums(x, x_missing, y, y_missing)
+            n = (~missing).sum(axis=0)
+            sx, sy = x.sum(axis=0), y.sum(axis=0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                table["Beta"] = ((x * y).sum(axis=0) - sx * sy / n) / ((y * y).sum(axis=0) - sy * sy / n)
+        return table
+
+    def correlation(self, window: Optional[int] = None, step: int = 1) -> pd.DataFrame:
+        """Rolling correlation matrices (see rolling_correlation)."""
+        return rolling_correlation(self.returns, window or self.window, step)
+
+    def __repr__(self) -> str:
+        return (
+            f"RiskAnalysis({len(self.prices)} dates x {self.prices.shape[1]} tickers, "
+            f"window={self.window})"
+        )
@@ -0,0 +1,607 @@
+"""
+Scanner Helpers for Money Talks
+
+Provides a declarative stock scanner. A scan is a list of conditions over
+named indicators, written with ordinary operators:
+
+    >>> from utils.scanner import F, Scan, run_scans
+    >>> oversold = Scan("oversold", F.rsi() < 30, F.close > F.sma(200))
+    >>> breakout = Scan("breakout", F.close >= F.highest("high", 20),
+    ...                 F.rel_volume() > 1.5, columns={"RSI": F.rsi()})
+    >>> results = run_scans(panel, [oversold, breakout])
+
+The engine works on Panel matrices (dates x tickers) and:
+
+- computes each indicator once per ticker, however many conditions and
+  scans use it (``F.rsi()`` and ``F.rsi(14)`` are the same indicator)
+- evaluates the cheapest remaining condition first and only computes later
+  indicators for tickers that are still in the running
+- splits large indicator computations across threads (``max_workers``)
+
+so running five scans over the S&P 500 costs about the same as one.
+Conditions are evaluated on each ticker's latest bar; use ``.shift(n)`` or
+``crosses_above``/``crosses_below`` to look back.
+"""
+
+import inspect
+import operator
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from . import indicators
+from .panel import Panel
+
+
+FIELDS = ("open", "high", "low", "close", "volume")
+
+# Columns per thread when max_workers > 1
+_CHUNK = 64
+
+
+# ----------------------------------------------------------------------
+# Indicator registry
+# ----------------------------------------------------------------------
+
+
+@dataclass
+class IndicatorSpec:
+    """How to compute a named indicator and roughly how expensive it is."""
+    fn: Callable
+    cost: float
+    outputs: tuple = ()
+
+
+INDICATORS: dict[str, IndicatorSpec] = {}
+
+
+def register_indicator(name: str, cost: float = 1.0, outputs: tuple = ()):
+    """
+    Decorator adding an indicator to the scanner.
+
+    The function's first argument is ``get``: call ``get("close")`` for a
+    price field or ``get(F.sma(50))`` for another indicator, each as a
+    (dates x tickers) array for the tickers being computed. Multi-output
+    indicators return a tuple and list the output names.
+
+    Example:
+        >>> @register_indicator("dollar_volume", cost=1)
+        ... def dollar_volume(get, window=20):
+        ...     return indicators.sma(get("close") * get("volume"), window)
+    """
+    def decorate(fn: Callable) -> Callable:
+        INDICATORS[name] = IndicatorSpec(fn, cost, outputs)
+        return fn
+    return decorate
+
+
+@register_indicator("sma")
+def _sma(get, window=20, source="close"):
+    return indicators.sma(get(source), window)
+
+
+@register_indicator("ema")
+def _ema(get, span=20, source="close"):
+    return indicators.ema(get(source), span)
+
+
+@register_indicator("roc")
+def _roc(get, period=14, source="close"):
+    return indicators.roc(get(source), period)
+
+
+@register_indicator("rsi", cost=2)
+def _rsi(get, period=14, smoothing="wilder"):
+    return indicators.rsi(get("close"), period, smoothing)
+
+
+@register_indicator("macd", cost=2, outputs=("line", "signal", "hist"))
+def _macd(get, fast=12, slow=26, signal=9):
+    return indicators.macd(get("close"), fast, slow, signal)
+
+
+@register_indicator("bollinger", cost=2, outputs=("middle", "upper", "lower"))
+def _bollinger(get, window=20, num_std=2.0):
+    return indicators.bollinger_bands(get("close"), window, num_std)
+
+
+@register_indicator("bb_width", cost=0.5)
+def _bb_width(get, window=20, num_std=2.0):
+    upper = get(F.bollinger(window, num_std, output="upper"))
+    lower = get(F.bollinger(window, num_std, output="lower"))
+    return (upper - lower) / get(F.bollinger(window, num_std))
+
+
+@register_indicator("bb_percent", cost=0.5)
+def _bb_percent(get, window=20, num_std=2.0):
+    upper = get(F.bollinger(window, num_std, output="upper"))
+    lower = get(F.bollinger(window, num_std, output="lower"))
+    return (get("close") - lower) / (upper - lower)
+
+
+@register_indicator("atr", cost=2)
+def _atr(get, period=14, smoothing="wilder"):
+    return indicators.atr(get("high"), get("low"), get("close"), period, smoothing)
+
+
+@register_indicator("adx", cost=3, outputs=("adx", "plus_di", "minus_di"))
+def _adx(get, period=14):
+    plus_di, minus_di, adx = indicators.adx(get("high"), get("low"), get("close"), period)
+    return adx, plus_di, minus_di
+
+
+@register_indicator("stochastic", cost=3, outputs=("k", "d"))
+def _stochastic(get, k_period=14, d_period=3, slow=True):
+    return indicators.stochastic(get("high"), get("low"), get("close"), k_period, d_period, slow)
+
+
+@register_indicator("cci", cost=3)
+def _cci(get, period=20):
+    return indicators.cci(get("high"), get("low"), get("close"), period)
+
+
+@register_indicator("obv")
+def _obv(get):
+    return indicators.obv(get("close"), get("volume"))
+
+
+@register_indicator("rel_volume")
+def _rel_volume(get, window=20):
+    return get("volume") / get(F.sma(window, "volume"))
+
+
+@register_indicator("highest")
+def _highest(get, source="high", window=20):
+    from .patterns import rolling_extreme
+
+    return rolling_extreme(get(source), window, "high")
+
+
+@register_indicator("lowest")
+def _lowest(get, source="low", window=20):
+    from .patterns import rolling_extreme
+
+    return rolling_extreme(get(source), window, "low")
+
+
+@register_indicator("percentile", cost=3)
+def _percentile(get, source="close", window=120):
+    """Percent of the last `window` values below the current one."""
+    ranks = pd.DataFrame(get(source), copy=False).rolling(window, min_periods=window).rank(pct=True)
+    return ranks.to_numpy() * 100
+
+
+# ----------------------------------------------------------------------
+# Expressions
+# ----------------------------------------------------------------------
+
+
+class Expr:
+    """
+    A per-ticker value at the latest bar: an indicator, a constant or
+    arithmetic/comparison/boolean combinations of them.
+    """
+
+    def evaluate(self, scanner: "Scanner", cols: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def indicators(self) -> dict:
+        """Indicator computations this expression needs, keyed by cache key."""
+        return {}
+
+    def shift(self, periods: int = 1) -> "Expr":
+        """The same expression evaluated `periods` bars earlier."""
+        return self
+
+    def crosses_above(self, other) -> "Expr":
+        other = _expr(other)
+        return (self > other) & (self.shift(1) <= other.shift(1))
+
+    def crosses_below(self, other) -> "Expr":
+        other = _expr(other)
+        return (self < other) & (self.shift(1) >= other.shift(1))
+
+    def __abs__(self) -> "Expr":
+        return _Apply(np.abs, self)
+
+    def __neg__(self) -> "Expr":
+        return _Apply(np.negative, self)
+
+    def __invert__(self) -> "Expr":
+        return _Apply(np.logical_not, self)
+
+    def __bool__(self):
+        raise TypeError("Scan conditions can't be used as bools; combine them with & and |")
+
+    __hash__ = None
+
+
+def _binary(op: Callable, reflected: bool = False):
+    def method(self, other):
+        left, right = (_expr(other), self) if reflected else (self, _expr(other))
+        return _Binary(op, left, right)
+    return method
+
+
+for _name, _op in {
+    "add": operator.add, "sub": operator.sub, "mul": operator.mul, "truediv": np.divide,
+    "lt": operator.lt, "le": operator.le, "gt": operator.gt, "ge": operator.ge,
+    "eq": operator.eq, "ne": operator.ne, "and": np.logical_and, "or": np.logical_or,
+}.items():
+    setattr(Expr, f"__{_name}__", _binary(_op))
+    if _name in ("add", "sub", "mul", "truediv", "and", "or"):
+        setattr(Expr, f"__r{_name}__", _binary(_op, reflected=True))
+
+
+class _Const(Expr):
+    def __init__(self, value):
+        self.value = value
+
+    def evaluate(self, scanner, cols):
+        return np.full(len(cols), self.value, dtype=np.float64)
+
+    def __repr__(self) -> str:
+        return repr(self.value)
+
+
+class _Apply(Expr):
+    def __init__(self, fn: Callable, arg: Expr):
+        self.fn, self.arg = fn, arg
+
+    def evaluate(self, scanner, cols):
+        return self.fn(self.arg.evaluate(scanner, cols))
+
+    def indicators(self) -> dict:
+        return self.arg.indicators()
+
+    def shift(self, periods: int = 1) -> Expr:
+        return _Apply(self.fn, self.arg.shift(periods))
+
+    def __repr__(self) -> str:
+        return f"{self.fn.__name__}({self.arg!r})"
+
+
+class _Binary(Expr):
+    def __init__(self, op: Callable, left: Expr, right: Expr):
+        self.op, self.left, self.right = op, left, right
+
+    def evaluate(self, scanner, cols):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.op(self.left.evaluate(scanner, cols), self.right.evaluate(scanner, cols))
+
+    def indicators(self) -> dict:
+        return {**self.left.indicators(), **self.right.indicators()}
+
+    def shift(self, periods: int = 1) -> Expr:
+        return _Binary(self.op, self.left.shift(periods), self.right.shift(periods))
+
+    def __repr__(self) -> str:
+        return f"({self.left!r} {self.op.__name__} {self.right!r})"
+
+
+class Indicator(Expr):
+    """
+    Reference to an indicator (or price field) with normalized parameters.
+
+    Two references with the same name, parameters and output share one
+    computation, whatever scan they appear in.
+    """
+
+    def __init__(self, name: str, params: tuple = (), output: Optional[str] = None, lag: int = 0):
+        self.name, self.params, self.output, self.lag = name, params, output, lag
+
+    @property
+    def key(self) -> tuple:
+        """Cache key of the computation (all outputs of it)."""
+        return (self.name,) + tuple(
+            (k, v.key if isinstance(v, Indicator) else v) for k, v in self.params
+        )
+
+    def cost(self) -> float:
+        if self.name in FIELDS:
+            return 0.0
+        nested = sum(v.cost() for _, v in self.params if isinstance(v, Indicator))
+        return INDICATORS[self.name].cost + nested
+
+    def evaluate(self, scanner, cols):
+        values = scanner.values(self, cols)
+        row = values.shape[0] - 1 - self.lag
+        return values[row] if row >= 0 else np.full(len(cols), np.nan)
+
+    def indicators(self) -> dict:
+        return {self.key: self}
+
+    def shift(self, periods: int = 1) -> Expr:
+        return self.with_lag(self.lag + periods)
+
+    def with_lag(self, lag: int) -> "Indicator":
+        return Indicator(self.name, self.params, self.output, lag)
+
+    def __repr__(self) -> str:
+        args = ", ".join(f"{k}={v!r}" for k, v in self.params)
+        out = f".{self.output}" if self.output else ""
+        lag = f".shift({self.lag})" if self.lag else ""
+        return f"{self.name}({args}){out}{lag}"
+
+
+def _expr(value) -> Expr:
+    if isinstance(value, Expr):
+        return value
+    if isinstance(value, str):
+        return getattr(F, value)
+    return _Const(value)
+
+
+class _Factory:
+    """
+    Builds Indicator references: ``F.close``, ``F.rsi(14)``,
+    ``F.macd(output="signal")``, ``F.highest("high", 20)``.
+    """
+
+    def __getattr__(self, name: str):
+        if name in FIELDS:
+            return Indicator(name)
+        if name not in INDICATORS:
+            raise AttributeError(
+                f"Unknown indicator: {name}. Use one of: {', '.join(list(FIELDS) + sorted(INDICATORS))}"
+            )
+        spec = INDICATORS[name]
+        signature = inspect.signature(spec.fn)
+
+        def build(*args, output: Optional[str] = None, **kwargs) -> Indicator:
+            bound = signature.bind(None, *args, **kwargs)
+            bound.apply_defaults()
+            params = tuple(
+                (k, getattr(F, v) if isinstance(v, str) and k == "source" else v)
+                for k, v in list(bound.arguments.items())[1:]
+            )
+            if spec.outputs:
+                output = output or spec.outputs[0]
+                if output not in spec.outputs:
+                    raise ValueError(f"Unknown output: {output}. Use one of: {', '.join(spec.outputs)}")
+            elif output is not None:
+                raise ValueError(f"{name} has a single output")
+            return Indicator(name, params, output)
+        build.__name__ = name
+        build.__doc__ = spec.fn.__doc__
+        return build
+
+
+F = _Factory()
+
+
+# ----------------------------------------------------------------------
+# Scans and the engine
+# ----------------------------------------------------------------------
+
+
+class Scan:
+    """
+    A named set of conditions (all must hold) plus columns to report.
+
+    Args:
+        name: Scan name (key in run_scans results)
+        *conditions: Boolean expressions
+        columns: Report columns, name -> expression (Close is always included)
+        sort_by: Column to sort matches by
+        ascending: Sort order
+        limit: Keep only the first N matches after sorting
+
+    Example:
+        >>> squeeze = Scan("squeeze", F.percentile(F.bb_width(), 120) < 20,
+        ...                columns={"Width": F.bb_width(), "%B": F.bb_percent()},
+        ...                sort_by="Width", ascending=True)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *conditions: Expr,
+        columns: Optional[dict[str, Expr]] = None,
+        sort_by: Optional[str] = None,
+        ascending: bool = False,
+        limit: Optional[int] = None,
+    ):
+        self.name = name
+        self.conditions = list(conditions)
+        self.columns = {"Close": F.close, **(columns or {})}
+        self.sort_by = sort_by
+        self.ascending = ascending
+        self.limit = limit
+
+    def __repr__(self) -> str:
+        return f"Scan({self.name!r}, {len(self.conditions)} conditions)"
+
+
+class Scanner:
+    """
+    Runs scans over one Panel, sharing indicator computations between them.
+
+    Each indicator is stored as a (dates x universe) matrix plus a mask of
+    the tickers already computed, so a later condition or scan that needs
+    it for more tickers computes only the missing columns.
+
+    Args:
+        data: Panel, or the dict returned by fetch_multiple
+        max_workers: Threads for large indicator computations
+
+    Example:
+        >>> scanner = Scanner(fetch_panel(get_sp500_tickers()))
+        >>> results = scanner.run_all(SCANS.values())
+        >>> scanner.computed        # columns computed per indicator
+    """
+
+    def __init__(self, data: Union[Panel, dict[str, pd.DataFrame]], max_workers: int = 1):
+        panel = data if isinstance(data, Panel) else Panel.from_frames(data)
+        self.panel = panel
+        self.tickers = np.array(panel.tickers)
+        self.index = panel.index
+        self.max_workers = max_workers
+        self._fields = {
+            name.lower(): matrix.to_numpy(dtype=np.float64)
+            for name, matrix in panel.fields.items()
+        }
+        self._cache: dict[tuple, tuple[list[np.ndarray], np.ndarray]] = {}
+        self.computed: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    # -- indicator values ------------------------------------------------
+
+    def _missing(self, ref: Indicator, cols: np.ndarray) -> np.ndarray:
+        if ref.name in FIELDS:
+            return cols[:0]
+        entry = self._cache.get(ref.key)
+        return cols if entry is None else cols[~entry[1][cols]]
+
+    def marginal_cost(self, expr: Expr, cols: np.ndarray) -> float:
+        """Estimated work to evaluate expr on cols given what is cached."""
+        return sum(ref.cost() * len(self._missing(ref, cols)) for ref in expr.indicators().values())
+
+    def _compute(self, ref: Indicator, cols: np.ndarray) -> list[np.ndarray]:
+        spec = INDICATORS[ref.name]
+
+        def get(source):
+            if isinstance(source, str):
+                return self._fields[source][:, cols]
+            return self.values(source, cols)
+
+        result = spec.fn(get, **{k: v for k, v in ref.params})
+        return [np.asarray(r, dtype=np.float64) for r in (result if spec.outputs else (result,))]
+
+    def values(self, ref: Indicator, cols: np.ndarray) -> np.ndarray:
+        """(dates x len(cols)) matrix of an indicator, computing missing tickers."""
+        if ref.name in FIELDS:
+            return self._fields[ref.name][:, cols]
+        spec = INDICATORS[ref.name]
+        entry = self._cache.get(ref.key)
+        if entry is None:
+            # setdefault: nested indicators may be first requested from worker threads
+            shape = (len(self.index), len(self.tickers))
+            entry = self._cache.setdefault(ref.key, (
+                [np.full(shape, np.nan) for _ in (spec.outputs or (None,))],
+                np.zeros(len(self.tickers), dtype=bool),
+            ))
+        outputs, done = entry
+
+        missing = cols[~done[cols]]
+        if len(missing):
+            # Nested indicators first, so threads only read the cache
+            for _, param in ref.params:
+                if isinstance(param, Indicator):
+                    self.values(param, missing)
+            if self.max_workers > 1 and len(missing) > _CHUNK:
+                chunks = np.array_split(missing, -(-len(missing) // _CHUNK))
+                with ThreadPoolExecutor(self.max_workers) as pool:
+                    parts = list(pool.map(lambda c: (c, self._compute(ref, c)), chunks))
+            else:
+                parts = [(missing, self._compute(ref, missing))]
+            for chunk, results in parts:
+                for out, res in zip(outputs, results):
+                    out[:, chunk] = res
+            done[missing] = True
+            with self._lock:
+                self.computed[ref.name] = self.computed.get(ref.name, 0) + len(missing)
+
+        position = spec.outputs.index(ref.output) if spec.outputs else 0
+        return outputs[position][:, cols]
+
+    # -- scans -----------------------------------------------------------
+
+    def matches(self, scan: Scan) -> np.ndarray:
+        """Column positions of the tickers passing every condition."""
+        cols = np.arange(len(self.tickers))
+        remaining = list(scan.conditions)
+        while remaining and len(cols):
+            position = min(range(len(remaining)), key=lambda i: self.marginal_cost(remaining[i], cols))
+            cheapest = remaining.pop(position)
+            passed = np.asarray(cheapest.evaluate(self, cols), dtype=bool)
+            cols = cols[passed]
+        return cols
+
+    def run(self, scan: Scan) -> pd.DataFrame:
+        """
+        Tickers passing a scan, with its report columns at the latest bar.
+
+        Returns:
+            DataFrame indexed by Ticker
+        """
+        cols = self.matches(scan)
+        table = pd.DataFrame(
+            {name: _expr(expr).evaluate(self, cols) for name, expr in scan.columns.items()},
+            index=pd.Index(self.tickers[cols], name="Ticker"),
+        )
+        if scan.sort_by:
+            table = table.sort_values(scan.sort_by, ascending=scan.ascending)
+        return table.head(scan.limit) if scan.limit else table
+
+    def run_all(self, scans) -> dict[str, pd.DataFrame]:
+        """Run several scans, sharing indicator work. Returns name -> results."""
+        return {scan.name: self.run(scan) for scan in scans}
+
+    def __repr__(self) -> str:
+        return f"Scanner({len(self.tickers)} tickers, {len(self._cache)} indicators cached)"
+
+
+def run_scans(
+    data: Union[Panel, dict[str, pd.DataFrame], list[str]],
+    scans=None,
+    max_workers: int = 1,
+    **fetch_kwargs,
+) -> dict[str, pd.DataFrame]:
+    """
+    Run scans over a universe, fetching it once if given tickers.
+
+    Args:
+        data: Panel, fetch_multiple dict, or a list of tickers to fetch
+        scans: Scans to run (default: every scan in SCANS)
+        max_workers: Threads for indicator computation
+        **fetch_kwargs: Passed to fetch_panel when data is a ticker list
+
+    Returns:
+        Dictionary mapping scan name to its matches
+
+    Example:
+        >>> results = run_scans(get_sp500_tickers(), period="1y")
+        >>> print(results["macd_bullish_cross"])
+    """
+    if isinstance(data, (list, tuple)):
+        from .panel import fetch_panel
+
+        data = fetch_panel(list(data), **fetch_kwargs)
+    scans = list(SCANS.values()) if scans is None else scans
+    return Scanner(data, max_workers).run_all(scans)
+
+
+# ----------------------------------------------------------------------
+# Scans from the lessons
+# ----------------------------------------------------------------------
+
+
+def _uptrend() -> list[Expr]:
+    return [F.close > F.ema(20), F.close > F.sma(50), F.ema(20) > F.sma(50)]
+
+
+SCANS = {scan.name: scan for scan in [
+    Scan("rsi_oversold_bounce", F.rsi().crosses_above(30),
+         columns={"RSI": F.rsi()}),
+    Scan("macd_bullish_cross", F.macd().crosses_above(F.macd(output="signal")),
+         columns={"MACD": F.macd(), "Signal": F.macd(output="signal")}),
+    Scan("momentum_breakout", F.high >= F.highest("high", 20), F.rel_volume() > 1.5, F.rsi() > 50,
+         columns={"RSI": F.rsi(), "Rel_Vol": F.rel_volume(), "ROC_20": F.roc(20)},
+         sort_by="ROC_20"),
+    Scan("pullback_20ema", *_uptrend(), abs((F.close - F.ema(20)) / F.ema(20) * 100) < 2, F.rsi() < 60,
+         columns={"Dist_20EMA": (F.close - F.ema(20)) / F.ema(20) * 100, "RSI": F.rsi()}),
+    Scan("strong_trend", F.adx() > 25, F.adx(output="plus_di") > F.adx(output="minus_di"),
+         columns={"ADX": F.adx(), "+DI": F.adx(output="plus_di"), "-DI": F.adx(output="minus_di")},
+         sort_by="ADX"),
+    Scan("bb_squeeze", F.percentile(F.bb_width(), 120) < 20,
+         columns={"Width": F.bb_width(), "%B": F.bb_percent()},
+         sort_by="Width", ascending=True),
+    Scan("obv_breakout", F.close >= F.highest("close", 20), F.obv() >= F.highest(F.obv(), 20),
+         F.obv() > F.sma(20, F.obv()),
+         columns={"OBV": F.obv()}),
+]}
@@ -0,0 +1,444 @@
+"""
+Store Helpers for Money Talks
+
+Provides a local columnar store for long price histories. Bars are kept
+under ``data/store/<interval>/`` as one ``.npy`` file per column per ticker
+(float32 prices, int64 volume) aligned to a single calendar of timestamps
+shared by every ticker at that interval.
+
+Reads memory-map the files, so opening ten years of minute bars costs page
+faults rather than a parse, and date-range slices only touch the pages they
+cover. DataFrames built from the store share memory with the maps.
+
+Layout:
+    data/store/1d/calendar.npy      int64 UTC nanoseconds, sorted
+    data/store/1d/meta.json         timezone and per-ticker offsets
+    data/store/1d/AAPL/Close.npy    float32, calendar[start:start + rows]
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .cache import INTRADAY_INTERVALS, period_start
+from .providers import DataProvider, register_provider
+
+
+DEFAULT_STORE_DIR = Path(
+    os.environ.get(
+        "MONEY_TALKS_STORE_DIR",
+        Path(__file__).parent.parent / "data" / "store",
+    )
+)
+
+# Column -> on-disk dtype; prices in float32 keep ~7 significant digits
+COLUMNS = {
+    "Open": np.float32,
+    "High": np.float32,
+    "Low": np.float32,
+    "Close": np.float32,
+    "Volume": np.int64,
+}
+
+
+def _utc_nanos(index: pd.DatetimeIndex) -> np.ndarray:
+    """Timestamps as int64 UTC nanoseconds (naive indexes are taken as-is)."""
+    if index.tz is not None:
+        index = index.tz_convert("UTC")
+    return index.as_unit("ns").asi8
+
+
+class MarketStore:
+    """
+    Memory-mapped columnar store of OHLCV bars.
+
+    Each interval has one sorted calendar; each ticker stores a dense run of
+    bars covering ``calendar[start:start + rows]``. Calendar slots a ticker
+    has no bar for hold NaN prices and zero volume and are dropped on read.
+
+    Example:
+        >>> store = MarketStore()
+        >>> store.write("AAPL", fetch_stock_data("AAPL", period="max"))
+        >>> df = store.read("AAPL", start="2020-01-01", end="2020-12-31")
+    """
+
+    def __init__(self, root: Union[str, Path, None] = None):
+        self.root = Path(root or DEFAULT_STORE_DIR)
+        self._meta: dict[str, dict] = {}
+        self._calendars: dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Paths and raw I/O
+    # ------------------------------------------------------------------
+
+    def _dir(self, interval: str) -> Path:
+        return self.root / interval
+
+    def _column_path(self, ticker: str, interval: str, column: str) -> Path:
+        return self._dir(interval) / ticker.upper().replace("/", "-") / f"{column}.npy"
+
+    def _read_meta(self, interval: str) -> dict:
+        if interval not in self._meta:
+            path = self._dir(interval) / "meta.json"
+            self._meta[interval] = (
+                json.loads(path.read_text()) if path.exists()
+                else {"tz": None, "index_name": None, "tickers": {}}
+            )
+        return self._meta[interval]
+
+    def _write_meta(self, interval: str, meta: dict) -> None:
+        self._meta[interval] = meta
+        _atomic_save(self._dir(interval) / "meta.json", json.dumps(meta, indent=1))
+
+    def _calendar(self, interval: str) -> np.ndarray:
+        """The interval's calendar as a read-only memory map (empty if none)."""
+        if interval not in self._calendars:
+            path = self._dir(interval) / "calendar.npy"
+            self._calendars[interval] = (
+                np.load(path, mmap_mode="r") if path.exists() else np.empty(0, dtype=np.int64)
+            )
+        return self._calendars[interval]
+
+    def _column(self, ticker: str, interval: str, column: str) -> np.ndarray:
+        return np.load(self._column_path(ticker, interval, column), mmap_mode="r")
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def intervals(self) -> list[str]:
+        """Intervals with data in the store."""
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if (p / "meta.json").exists())
+
+    def tickers(self, interval: str = "1d") -> list[str]:
+        """Tickers stored at an interval."""
+        return sorted(self._read_meta(interval)["tickers"])
+
+    def __contains__(self, ticker: str) -> bool:
+        return any(ticker.upper() in self._read_meta(i)["tickers"] for i in self.intervals())
+
+    def calendar(self, interval: str = "1d") -> pd.DatetimeIndex:
+        """The shared timestamp index for an interval."""
+        return self._to_index(self._calendar(interval), self._read_meta(interval))
+
+    @staticmethod
+    def _to_index(nanos: np.ndarray, meta: dict) -> pd.DatetimeIndex:
+        index = pd.DatetimeIndex(np.asarray(nanos).view("M8[ns]"), name=meta["index_name"])
+        if meta["tz"] is not None:
+            index = index.tz_localize("UTC").tz_convert(meta["tz"])
+        return index
+
+    def _bound(self, when, meta: dict) -> int:
+        """Timestamp as int64 nanoseconds in the store's clock."""
+        when = pd.Timestamp(when)
+        if meta["tz"] is not None:
+            when = when.tz_localize(meta["tz"]) if when.tz is None else when
+            when = when.tz_convert("UTC").tz_localize(None)
+        elif when.tz is not None:
+            when = when.tz_localize(None)
+        return when.as_unit("ns").value
+
+    def _span(self, ticker: str, interval: str, start, end) -> tuple[dict, int, int]:
+        """Entry for a ticker plus the row range [lo, hi) covering start..end."""
+        meta = self._read_meta(interval)
+        ticker = ticker.upper()
+        if ticker not in meta["tickers"]:
+            raise KeyError(f"{ticker} is not in the store at interval {interval}")
+        entry = meta["tickers"][ticker]
+        first, rows = entry["start"], entry["rows"]
+        calendar = self._calendar(interval)[first:first + rows]
+        lo = 0 if start is None else int(np.searchsorted(calendar, self._bound(start, meta), "left"))
+        hi = rows if end is None else int(np.searchsorted(calendar, self._bound(end, meta), "right"))
+        return entry, lo, hi
+
+    def arrays(
+        self,
+        ticker: str,
+        interval: str = "1d",
+        start=None,
+        end=None,
+        columns: Optional[Iterable[str]] = None,
+    ) -> dict[str, np.ndarray]:
+        """
+        Zero-copy column slices for a date range, including empty calendar slots.
+
+        Args:
+            ticker: Stock symbol
+            interval: Data interval
+            start: First timestamp to include (None = from the beginning)
+            end: Last timestamp to include (None = through the end)
+            columns: Columns to map (default: all of Open, High, Low, Close, Volume)
+
+        Returns:
+            Dict with an int64 "timestamp" array (UTC ns) and one
+            read-only memory-mapped array per column
+        """
+        entry, lo, hi = self._span(ticker, interval, start, end)
+        first = entry["start"]
+        out = {"timestamp": self._calendar(interval)[first + lo:first + hi]}
+        for col in COLUMNS if columns is None else columns:
+            out[col] = self._column(ticker, interval, col)[lo:hi]
+        return out
+
+    def read(
+        self,
+        ticker: str,
+        interval: str = "1d",
+        start=None,
+        end=None,
+        columns: Optional[Iterable[str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Load a ticker's bars between two dates as a DataFrame.
+
+        Only the pages covering the range are read from disk. When the
+        ticker has a bar in every calendar slot of the range the columns are
+        views of the memory maps; otherwise the empty slots are dropped,
+        which copies the slice.
+
+        Args:
+            ticker: Stock symbol
+            interval: Data interval
+            start: First timestamp to include (None = from the beginning)
+            end: Last timestamp to include (None = through the end)
+            columns: Columns to load (default: all)
+
+        Returns:
+            DataFrame with a DatetimeIndex (in the stored timezone) and
+            float32 price / int64 volume columns
+
+        Example:
+            >>> store.read("SPY", "1m", start="2024-03-01", end="2024-03-08")
+        """
+        entry, lo, hi = self._span(ticker, interval, start, end)
+        cols = self.arrays(ticker, interval, start, end, columns)
+        index = self._to_index(cols.pop("timestamp"), self._read_meta(interval))
+        df = pd.DataFrame(cols, index=index, copy=False)
+        if entry["gaps"]:
+            close = cols["Close"] if "Close" in cols else self._column(ticker, interval, "Close")[lo:hi]
+            df = df[~np.isnan(close)]
+        return df
+
+    def panel(
+        self,
+        tickers: Optional[Iterable[str]] = None,
+        interval: str = "1d",
+        field: str = "Close",
+        start=None,
+        end=None,
+    ) -> pd.DataFrame:
+        """
+        One column per ticker for a single field, aligned on the calendar.
+
+        Args:
+            tickers: Symbols (default: every stored ticker)
+            interval: Data interval
+            field: Column to load (e.g. 'Close' or 'Volume')
+            start: First timestamp to include
+            end: Last timestamp to include
+
+        Returns:
+            DataFrame indexed by the shared calendar, NaN where a ticker
+            has no bar
+        """
+        meta = self._read_meta(interval)
+        calendar = self._calendar(interval)
+        lo = 0 if start is None else int(np.searchsorted(calendar, self._bound(start, meta), "left"))
+        hi = len(calendar) if end is None else int(np.searchsorted(calendar, self._bound(end, meta), "right"))
+        tickers = self.tickers(interval) if tickers is None else [t.upper() for t in tickers]
+        dtype = np.float64 if field == "Volume" else COLUMNS.get(field, np.float32)
+
+        out = np.full((hi - lo, len(tickers)), np.nan, dtype=dtype)
+        for j, ticker in enumerate(tickers):
+            entry = meta["tickers"][ticker]
+            a, b = max(lo, entry["start"]), min(hi, entry["start"] + entry["rows"])
+            if a < b:
+                values = self._column(ticker, interval, field)[a - entry["start"]:b - entry["start"]]
+                out[a - lo:b - lo, j] = values
+                if field == "Volume" and entry["gaps"]:
+                    close = self._column(ticker, interval, "Close")[a - entry["start"]:b - entry["start"]]
+                    out[a - lo:b - lo, j][np.isnan(close)] = np.nan
+        return pd.DataFrame(out, index=self._to_index(calendar[lo:hi], meta), columns=tickers)
+
+    def dates(self, ticker: str, interval: str = "1d") -> tuple[pd.Timestamp, pd.Timestamp]:
+        """First and last stored timestamp for a ticker."""
+        stamps = self.arrays(ticker, interval, columns=[])["timestamp"]
+        index = self._to_index(stamps[[0, -1]], self._read_meta(interval))
+        return index[0], index[1]
+
+    def nbytes(self, interval: Optional[str] = None) -> int:
+        """Bytes on disk for one interval, or the whole store."""
+        root = self._dir(interval) if interval else self.root
+        return sum(p.stat().st_size for p in root.rglob("*.npy")) if root.exists() else 0
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def write(self, ticker: str, df: pd.DataFrame, interval: str = "1d") -> None:
+        """
+        Add or update a ticker's bars.
+
+        New bars are merged with what is stored; on overlapping timestamps
+        the new values win. Appending bars after the end of the calendar only
+        rewrites this ticker. Bars that fall between existing calendar slots
+        grow the calendar in the middle, and every ticker is re-aligned.
+
+        Args:
+            ticker: Stock symbol
+            df: DataFrame with a DatetimeIndex and Open, High, Low, Close,
+                Volume columns (other columns are not stored)
+            interval: Data interval
+        """
+        if df.empty:
+            return
+        ticker = ticker.upper()
+        missing = [c for c in COLUMNS if c not in df.columns]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}. Stored columns are {', '.join(COLUMNS)}")
+
+        with self._lock:
+            meta = self._read_meta(interval)
+            if not meta["tickers"]:
+                meta = {
+                    "tz": str(df.index.tz) if df.index.tz is not None else None,
+                    "index_name": df.index.name or ("Datetime" if interval in INTRADAY_INTERVALS else "Date"),
+                    "tickers": {},
+                }
+            df = df[~df.index.duplicated(keep="last")].sort_index()
+            if ticker in meta["tickers"]:
+                stored = self.read(ticker, interval)
+                df = pd.concat([stored[~stored.index.isin(df.index)], df[list(COLUMNS)]]).sort_index()
+
+            old = np.array(self._calendar(interval))
+            stamps = _utc_nanos(pd.DatetimeIndex(df.index))
+            calendar = np.union1d(old, stamps)
+
+            if len(calendar) > len(old) and not np.array_equal(calendar[:len(old)], old):
+                self._realign(interval, meta, old, calendar, skip=ticker)
+
+            positions = np.searchsorted(calendar, stamps)
+            first = int(positions[0])
+            rows = int(positions[-1]) - first + 1
+            slots = positions - first
+            ticker_dir = self._column_path(ticker, interval, "Close").parent
+            ticker_dir.mkdir(parents=True, exist_ok=True)
+            for col, dtype in COLUMNS.items():
+                dense = np.zeros(rows, dtype=dtype) if col == "Volume" else np.full(rows, np.nan, dtype=dtype)
+                values = df[col].to_numpy(dtype=np.float64)
+                dense[slots] = np.nan_to_num(values).astype(dtype) if col == "Volume" else values
+                _atomic_save(ticker_dir / f"{col}.npy", dense)
+                if col == "Close":
+                    gaps = int(np.isnan(dense).sum())
+            meta["tickers"][ticker] = {"start": first, "rows": rows, "gaps": gaps}
+
+            if len(calendar) > len(old):
+                self._dir(interval).mkdir(parents=True, exist_ok=True)
+                _atomic_save(self._dir(interval) / "calendar.npy", calendar)
+                self._calendars.pop(interval, None)
+            self._write_meta(interval, meta)
+
+    def _realign(self, interval: str, meta: dict, old: np.ndarray, calendar: np.ndarray, skip: str) -> None:
+        """Rewrite every ticker (except ``skip``) onto a calendar with new inner slots."""
+        for ticker, entry in meta["tickers"].items():
+            if ticker == skip:
+                continue
+            first, rows = entry["start"], entry["rows"]
+            positions = np.searchsorted(calendar, old[first:first + rows])
+            new_first = int(positions[0])
+            new_rows = int(positions[-1]) - new_first + 1
+            for col, dtype in COLUMNS.items():
+                values = np.array(self._column(ticker, interval, col))
+                dense = np.zeros(new_rows, dtype=dtype) if col == "Volume" else np.full(new_rows, np.nan, dtype=dtype)
+                dense[positions - new_first] = values
+                _atomic_save(self._column_path(ticker, interval, col), dense)
+            entry.update(start=new_first, rows=new_rows, gaps=entry["gaps"] + new_rows - rows)
+
+    def delete(self, ticker: str, interval: str = "1d") -> None:
+        """Remove a ticker from an interval (the calendar is left as-is)."""
+        ticker = ticker.upper()
+        with self._lock:
+            meta = self._read_meta(interval)
+            if meta["tickers"].pop(ticker, None) is None:
+                return
+            for col in COLUMNS:
+                self._column_path(ticker, interval, col).unlink(missing_ok=True)
+            ticker_dir = self._column_path(ticker, interval, "Close").parent
+            if ticker_dir.exists() and not any(ticker_dir.iterdir()):
+                ticker_dir.rmdir()
+            self._write_meta(interval, meta)
+
+    def ingest(
+        self,
+        tickers: list[str],
+        period: str = "max",
+        interval: str = "1d",
+        **fetch_kwargs,
+    ):
+        """
+        Download tickers with fetch_multiple and write them into the store.
+
+        Args:
+            tickers: Stock symbols
+            period: Time period to download
+            interval: Data interval
+            **fetch_kwargs: Passed to fetch_multiple (provider, max_workers, ...)
+
+        Returns:
+            FetchReport from the download
+
+        Example:
+            >>> MarketStore().ingest(get_sp500_tickers(), period="10y")
+        """
+        from .data_helpers import fetch_multiple
+
+        fetch_kwargs["return_report"] = True
+        data, report = fetch_multiple(tickers, period=period, interval=interval, **fetch_kwargs)
+        for ticker, df in data.items():
+            self.write(ticker, df, interval)
+        return report
+
+    def __repr__(self) -> str:
+        return f"MarketStore({str(self.root)!r})"
+
+
+def _atomic_save(path: Path, data: Union[np.ndarray, str]) -> None:
+    """Write an array or text to a temp file and rename it into place."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}")
+    if isinstance(data, str):
+        tmp.write_text(data)
+    else:
+        with open(tmp, "wb") as f:
+            np.save(f, data)
+    os.replace(tmp, path)
+
+
+@register_provider("store")
+class StoreProvider(DataProvider):
+    """
+    Serve price history from a MarketStore.
+
+    Example:
+        >>> df = fetch_stock_data("AAPL", period="5y", provider=StoreProvider())
+    """
+
+    def __init__(self, root: Union[str, Path, None] = None):
+        self.store = MarketStore(root)
+
+    def history(self, ticker, interval="1d", period=None, start=None):
+        if start is None:
+            # Resolve the period against the last bar so only that range is mapped
+            start = period_start(period or "1y", self.store.dates(ticker, interval)[1])
+        return self.store.read(ticker, interval, start=start)
+
+    def __repr__(self) -> str:
+        return f"StoreProvider({str(self.store.root)!r})"
@@ -0,0 +1,276 @@
+"""
+Streaming Indicators for Money Talks
+
+Provides stateful indicators that update in O(1) per new bar, for intraday
+scanners and bar-by-bar simulations where recomputing the whole history on
+every bar would be quadratic.
+
+Each indicator's ``update(bar)`` returns the same value the batch version in
+utils.indicators gives for that bar (NaN while warming up). ``bar`` can be a
+dict or DataFrame row with Open/High/Low/Close/Volume keys, or a plain number
+for close-only indicators. ``snapshot()`` / ``restore()`` save and resume state.
+
+Example:
+    >>> rsi = RSI(14)
+    >>> for _, bar in df.iterrows():
+    ...     value = rsi.update(bar)
+    >>> saved = rsi.snapshot()
+    >>> later = RSI(14).restore(saved)
+"""
+
+import copy
+import math
+from collections import deque
+from typing import Optional
+
+
+NAN = math.nan
+
+
+def _field(bar, name: str) -> float:
+    """Read a field from a bar, treating plain numbers as the close price."""
+    if isinstance(bar, (int, float)):
+        return float(bar)
+    return float(bar[name])
+
+
+class StreamingIndicator:
+    """Base class: subclasses implement update() and keep state in attributes."""
+
+    def __init__(self):
+        self.value = NAN
+
+    def update(self, bar) -> float:
+        raise NotImplementedError
+
+    @property
+    def ready(self) -> bool:
+        """True once the indicator has produced a non-NaN value."""
+        return not math.isnan(self.value)
+
+    def snapshot(self) -> dict:
+        """Return a copy of the indicator's state."""
+        return copy.deepcopy(self.__dict__)
+
+    def restore(self, state: dict) -> "StreamingIndicator":
+        """Replace this indicator's state with a snapshot and return self."""
+        self.__dict__.update(copy.deepcopy(state))
+        return self
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(value={self.value:.4f})"
+
+
+class EMA(StreamingIndicator):
+    """Exponential moving average, matching indicators.ema."""
+
+    def __init__(self, span: int = 20, field: str = "Close"):
+        super().__init__()
+        self.alpha = 2.0 / (span + 1)
+        self.field = field
+
+    def update(self, bar) -> float:
+        x = _field(bar, self.field)
+        if math.isnan(self.value):
+            self.value = x
+        else:
+            self.value += self.alpha * (x - self.value)
+        return self.value
+
+
+class SMA(StreamingIndicator):
+    """Simple moving average over a fixed window, matching indicators.sma."""
+
+    def __init__(self, window: int = 20, field: str = "Close"):
+        super().__init__()
+        self.window = window
+        self.field = field
+        self._values: deque = deque()
+        self._sum = 0.0
+
+    def update(self, bar) -> float:
+        x = _field(bar, self.field)
+        self._values.append(x)
+        self._sum += x
+        if len(self._values) > self.window:
+            self._sum -= self._values.popleft()
+        self.value = self._sum / self.window if len(self._values) == self.window else NAN
+        return self.value
+
+
+class RollingStats(StreamingIndicator):
+    """
+    Rolling mean and sample standard deviation using a windowed Welford update.
+
+    ``value`` is the mean; ``std`` is the standard deviation (ddof=1), the
+    same as ``Series.rolling(window).std()``. Use it for Bollinger Bands.
+    """
+
+    def __init__(self, window: int = 20, field: str = "Close"):
+        super().__init__()
+        self.window = window
+        self.field = field
+        self.std = NAN
+        self._values: deque = deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, bar) -> float:
+        x = _field(bar, self.field)
+        self._values.append(x)
+        if len(self._values) <= self.window:
+            n = len(self._values)
+            delta = x - self._mean
+            self._mean += delta / n
+            self._m2 += delta * (x - self._mean)
+        else:
+            old = self._values.popleft()
+            previous = self._mean
+            self._mean += (x - old) / self.window
+            self._m2 += (x - old) * (x - self._mean + old - previous)
+
+        if len(self._values) == self.window:
+            self.value = self._mean
+            self.std = math.sqrt(max(self._m2, 0.0) / (self.window - 1))
+        return self.value
+
+    def bands(self, num_std: float = 2.0) -> tuple[float, float, float]:
+        """Current Bollinger Bands as (middle, upper, lower)."""
+        return self.value, self.value + num_std * self.std, self.value - num_std * self.std
+
+
+class RSI(StreamingIndicator):
+    """Relative Strength Index with Wilder's smoothing, matching indicators.rsi."""
+
+    def __init__(self, period: int = 14, field: str = "Close"):
+        super().__init__()
+        self.period = period
+        self.field = field
+        self._prev: Optional[float] = None
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+        self._count = 0
+
+    def update(self, bar) -> float:
+        x = _field(bar, self.field)
+        # The first bar has no change; the batch version counts it as 0
+        delta = 0.0 if self._prev is None else x - self._prev
+        self._prev = x
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+
+        if self._count == 0:
+            self._avg_gain, self._avg_loss = gain, loss
+        else:
+            alpha = 1.0 / self.period
+            self._avg_gain += alpha * (gain - self._avg_gain)
+            self._avg_loss += alpha * (loss - self._avg_loss)
+        self._count += 1
+
+        if self._count < self.period:
+            self.value = NAN
+        elif self._avg_loss == 0:
+            self.value = NAN if self._avg_gain == 0 else 100.0
+        else:
+            self.value = 100 - 100 / (1 + self._avg_gain / self._avg_loss)
+        return self.value
+
+
+class ATR(StreamingIndicator):
+    """Average True Range with Wilder's smoothing, matching indicators.atr."""
+
+    def __init__(self, period: int = 14):
+        super().__init__()
+        self.period = period
+        self._prev_close: Optional[float] = None
+        self._avg = 0.0
+        self._count = 0
+
+    def update(self, bar) -> float:
+        high, low, close = _field(bar, "High"), _field(bar, "Low"), _field(bar, "Close")
+        prev, self._prev_close = self._prev_close, close
+        if prev is None:
+            # True range needs a prior close
+            return self.value
+
+        tr = max(high - low, abs(high - prev), abs(low - prev))
+        if self._count == 0:
+            self._avg = tr
+        else:
+            self._avg += (tr - self._avg) / self.period
+        self._count += 1
+        self.value = self._avg if self._count >= self.period else NAN
+        return self.value
+
+
+class VWAP(StreamingIndicator):
+    """
+    Volume-weighted average price of the typical price, matching indicators.vwap.
+
+    Pass ``session`` to update() (e.g. the bar's date) to restart the running
+    totals at each new session.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._session = None
+        self._pv = 0.0
+        self._volume = 0.0
+
+    def update(self, bar, session=None) -> float:
+        if session is not None and session != self._session:
+            self._session = session
+            self._pv = self._volume = 0.0
+        typical = (_field(bar, "High") + _field(bar, "Low") + _field(bar, "Close")) / 3
+        volume = _field(bar, "Volume")
+        self._pv += typical * volume
+        self._volume += volume
+        self.value = self._pv / self._volume if self._volume else NAN
+        return self.value
+
+
+class OBV(StreamingIndicator):
+    """On-Balance Volume starting from 0, matching indicators.obv."""
+
+    def __init__(self):
+        super().__init__()
+        self._prev: Optional[float] = None
+
+    def update(self, bar) -> float:
+        close, volume = _field(bar, "Close"), _field(bar, "Volume")
+        if self._prev is None:
+            self.value = 0.0
+        elif close > self._prev:
+            self.value += volume
+        elif close < self._prev:
+            self.value -= volume
+        self._prev = close
+        return self.value
+
+
+class IndicatorSet:
+    """
+    Several named streaming indicators updated together.
+
+    Example:
+        >>> live = IndicatorSet(rsi=RSI(14), ema=EMA(20), atr=ATR(14))
+        >>> for bar in bars:
+        ...     values = live.update(bar)   # {'rsi': ..., 'ema': ..., 'atr': ...}
+    """
+
+    def __init__(self, **indicators: StreamingIndicator):
+        self.indicators = indicators
+
+    def update(self, bar) -> dict[str, float]:
+        return {name: ind.update(bar) for name, ind in self.indicators.items()}
+
+    @property
+    def values(self) -> dict[str, float]:
+        return {name: ind.value for name, ind in self.indicators.items()}
+
+    def snapshot(self) -> dict:
+        return {name: ind.snapshot() for name, ind in self.indicators.items()}
+
+    def restore(self, state: dict) -> "IndicatorSet":
+        for name, ind_state in state.items():
+            self.indicators[name].restore(ind_state)
+        return self
@@ -0,0 +1,447 @@
+"""
+Tax Lot Helpers for Money Talks
+
+Provides a lot-level ledger for cost basis and realized gains: FIFO, LIFO,
+HIFO and specific-identification lot matching, with wash-sale detection
+and basis adjustment.
+
+Lots live in flat NumPy arrays, one entry per purchase. Each ticker keeps
+its lots sorted by date, so the 61-day wash-sale window around a loss is a
+binary search rather than a scan of the whole history.
+
+Example:
+    >>> ledger = TaxLedger.from_trades(trades, method="fifo")
+    >>> ledger.realized()          # one row per lot disposal
+    >>> ledger.summary()           # short/long-term totals per year
+    >>> ledger.open_lots()
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+METHODS = ("fifo", "lifo", "hifo", "specid")
+TRADE_COLUMNS = ["date", "ticker", "type", "shares", "price"]
+WASH_WINDOW_DAYS = 30
+LONG_TERM_DAYS = 365
+EPS = 1e-9
+
+
+class TaxLedger:
+    """
+    Cost-basis ledger built from a trade history.
+
+    Trades are a DataFrame with ``date``, ``ticker``, ``type`` ('BUY' or
+    'SELL'), ``shares`` and ``price`` columns, plus optional ``commission``
+    and ``lot`` columns. ``lot`` on a SELL row names the BUY row (by index
+    label) to sell from when using specific identification.
+
+    Wash sales: when shares are sold at a loss and the same ticker is bought
+    within 30 days before or after, the loss is disallowed up to the number
+    of replacement shares. The disallowed amount is added to the replacement
+    shares' basis and their holding period includes the sold shares' holding
+    period. Replacement purchases are used in the order they were made,
+    and each share can be a replacement only once.
+
+    Example:
+        >>> ledger = TaxLedger(method="hifo")
+        >>> ledger.buy("2024-01-02", "AAPL", 100, 185.0)
+        >>> ledger.sell("2024-06-03", "AAPL", 40, 192.5)
+        >>> ledger.realized()
+    """
+
+    def __init__(self, trades: Optional[pd.DataFrame] = None, method: str = "fifo"):
+        method = method.lower()
+        if method not in METHODS:
+            raise ValueError(f"Unknown lot method: {method}. Use {', '.join(METHODS)}")
+        self.method = method
+        self._frames: list[pd.DataFrame] = []
+        self._pending: list[dict] = []
+        self._processed = False
+        if trades is not None:
+            self.add_trades(trades)
+
+    @classmethod
+    def from_trades(cls, trades: pd.DataFrame, method: str = "fifo") -> "TaxLedger":
+        """Build a ledger from a DataFrame of trades (see class docstring)."""
+        return cls(trades, method)
+
+    # ------------------------------------------------------------------
+    # Recording trades
+    # ------------------------------------------------------------------
+
+    def add_trades(self, trades: pd.DataFrame) -> "TaxLedger":
+        """Append a batch of trades; the ledger is recomputed on the next report."""
+        columns = {c: c.lower() for c in trades.columns}
+        trades = trades.rename(columns=columns)
+        missing = [c for c in TRADE_COLUMNS if c not in trades.columns]
+        if missing:
+            raise ValueError(f"Trades are missing columns: {missing}")
+        self._flush_pending()
+        self._frames.append(trades)
+        self._processed = False
+        return self
+
+    def buy(self, date, ticker: str, shares: float, price: float, commission: float = 0.0):
+        """Record a purchase."""
+        self._pending.append({"date": date, "ticker": ticker, "type": "BUY",
+                              "shares": shares, "price": price, "commission": commission})
+        self._processed = False
+
+    def sell(self, date, ticker: str, shares: float, price: float, commission: float = 0.0, lot=None):
+        """Record a sale; ``lot`` picks the BUY to sell from when method='specid'."""
+        self._pending.append({"date": date, "ticker": ticker, "type": "SELL",
+                              "shares": shares, "price": price, "commission": commission, "lot": lot})
+        self._processed = False
+
+    def _flush_pending(self):
+        if self._pending:
+            start = sum(len(f) for f in self._frames)
+            frame = pd.DataFrame(self._pending)
+            frame.index = range(start, start + len(frame))
+            self._frames.append(frame)
+            self._pending = []
+
+    @property
+    def trades(self) -> pd.DataFrame:
+        """All recorded trades in the order they were added."""
+        self._flush_pending()
+        if not self._frames:
+            return pd.DataFrame(columns=TRADE_COLUMNS)
+        return pd.concat(self._frames)
+
+    # ------------------------------------------------------------------
+    # Processing
+    # ------------------------------------------------------------------
+
+    def _ensure(self):
+        if not self._processed:
+            self._process(self.trades)
+            self._processed = True
+
+    def _process(self, trades: pd.DataFrame):
+        n = len(trades)
+        days = pd.to_datetime(trades["date"]).to_numpy().astype("datetime64[D]").astype(np.int64)
+        order = np.argsort(days, kind="stable")
+        is_buy = trades["type"].astype(str).str.upper().to_numpy() == "BUY"
+        shares = trades["shares"].to_numpy(dtype=np.float64)
+        price = trades["price"].to_numpy(dtype=np.float64)
+        commission = (trades["commission"].fillna(0).to_numpy(dtype=np.float64)
+                      if "commission" in trades else np.zeros(n))
+        codes, tickers = pd.factorize(trades["ticker"])
+        labels = trades.index.to_numpy()
+
+        # Lot arrays: one lot per BUY, ordered by (ticker, date, input order)
+        buys = order[is_buy[order]]
+        buys = buys[np.lexsort((days[buys], codes[buys]))]
+        self._tickers = np.asarray(tickers)
+        self.lot_ticker = codes[buys]
+        self.lot_date = days[buys]
+        self.lot_shares = shares[buys]
+        self.lot_cost = price[buys] + commission[buys] / shares[buys]
+        self.lot_label = labels[buys]
+        self.lot_remaining = self.lot_shares.copy()
+
+        # Per-ticker slices into the lot arrays
+        bounds = np.searchsorted(self.lot_ticker, np.arange(len(tickers) + 1))
+        label_to_lot = {label: i for i, label in enumerate(self.lot_label.tolist())}
+
+        # Plain lists are much faster than NumPy scalars in the matching loop
+        lot_date = self.lot_date.tolist()
+        lot_cost = self.lot_cost.tolist()
+        remaining = self.lot_remaining.tolist()
+        date_lists = [lot_date[bounds[t]:bounds[t + 1]] for t in range(len(tickers))]
+        # Wash-sale adjustments: lot -> list of [shares, adj_per_share, holding_start]
+        washed: dict[int, list[list[float]]] = {}
+        washed_shares = [0.0] * len(lot_date)
+        washed_adj = [0.0] * len(lot_date)
+        skip = list(range(len(lot_date) + 1))
+
+        head = bounds[:-1].tolist()            # FIFO: first lot with shares left
+        available = bounds[:-1].tolist()       # first lot not yet acquired
+        stacks: list[list] = [[] for _ in tickers]   # LIFO stack / HIFO heap
+        held = [0.0] * len(tickers)
+        spec_lots = trades["lot"].tolist() if self.method == "specid" and "lot" in trades else None
+        lifo, hifo = self.method == "lifo", self.method == "hifo"
+
+        realized = []
+        wash_events = []
+
+        def capacity(lot: int) -> float:
+            return remaining[lot] - washed_shares[lot]
+
+        def next_candidate(i: int, end: int) -> int:
+            # First lot at or after i that can still be a replacement
+            if i >= end or (skip[i] == i and remaining[i] - washed_shares[i] > EPS):
+                return i
+            path = []
+            while i < end and (skip[i] != i or capacity(i) <= EPS):
+                if skip[i] == i:
+                    skip[i] = i + 1
+                path.append(i)
+                i = skip[i]
+            for p in path:
+                skip[p] = i
+            return i
+
+        def hifo_key(lot: int) -> float:
+            return -(lot_cost[lot] + washed_adj[lot] / remaining[lot])
+
+        def take(lot: int, qty: float, sale_day: int, sale_price: float, sell_fee: float):
+            """Dispose of qty shares from a lot; washed shares go first."""
+            pieces = washed.get(lot)
+            if pieces is None:
+                remaining[lot] -= qty
+                return [[lot, sale_day, qty, qty * (sale_price - sell_fee), qty * lot_cost[lot],
+                         0.0, lot_date[lot]]]
+
+            # Shares with the same term are reported as one row per lot
+            parts: dict[bool, list] = {}
+            while qty > EPS:
+                if pieces:
+                    w = pieces[0]
+                    q = min(qty, w[0])
+                    adj, hold_start = q * w[1], w[2]
+                    w[0] -= q
+                    washed_shares[lot] -= q
+                    washed_adj[lot] -= adj
+                    if w[0] <= EPS:
+                        pieces.pop(0)
+                else:
+                    q, adj, hold_start = qty, 0.0, lot_date[lot]
+                qty -= q
+                part = parts.get(sale_day - hold_start > LONG_TERM_DAYS)
+                if part is None:
+                    parts[sale_day - hold_start > LONG_TERM_DAYS] = [q, adj, hold_start]
+                else:
+                    part[0] += q
+                    part[1] += adj
+                    # Keep the shortest holding period to tack onto replacements
+                    part[2] = max(part[2], hold_start)
+            if not pieces:
+                del washed[lot]
+
+            rows = []
+            for q, adj, hold_start in parts.values():
+                remaining[lot] -= q
+                rows.append([lot, sale_day, q, q * (sale_price - sell_fee), q * lot_cost[lot] + adj,
+                             0.0, hold_start])
+            return rows
+
+        sells = order[~is_buy[order]]
+        for k, t, day, qty, sale_price, fee in zip(
+            sells.tolist(), codes[sells].tolist(), days[sells].tolist(),
+            shares[sells].tolist(), price[sells].tolist(), commission[sells].tolist(),
+        ):
+            sell_fee = fee / qty
+            start, end = bounds[t], bounds[t + 1]
+            dates = date_lists[t]
+
+            # Make newly acquired lots available for LIFO/HIFO
+            new_available = start + bisect_right(dates, day)
+            for lot in range(available[t], new_available):
+                held[t] += remaining[lot]
+                if lifo:
+                    stacks[t].append(lot)
+                elif hifo:
+                    heapq.heappush(stacks[t], (-lot_cost[lot], lot))
+            available[t] = max(available[t], new_available)
+
+            if qty > held[t] + EPS:
+                raise ValueError(
+                    f"Cannot sell {qty:g} {tickers[t]} on {np.datetime64(day, 'D')}: "
+                    f"only {held[t]:g} shares held"
+                )
+            held[t] -= qty
+
+            rows = []
+            spec = spec_lots[k] if spec_lots is not None else None
+            if spec is not None and not pd.isna(spec):
+                lot = label_to_lot.get(spec)
+                if lot is None or lot_date[lot] > day or self.lot_ticker[lot] != t:
+                    raise ValueError(f"Unknown lot {spec!r} for {tickers[t]} sale on {np.datetime64(day, 'D')}")
+                if remaining[lot] + EPS < qty:
+                    raise ValueError(f"Lot {spec!r} has only {remaining[lot]:g} shares left")
+                rows += take(lot, qty, day, sale_price, sell_fee)
+                qty = 0.0
+
+            while qty > EPS:
+                if lifo:
+                    lot = stacks[t][-1]
+                    if remaining[lot] <= EPS:
+                        stacks[t].pop()
+                        continue
+                elif hifo:
+                    key, lot = stacks[t][0]
+                    if remaining[lot] <= EPS:
+                        heapq.heappop(stacks[t])
+                        continue
+                    current = hifo_key(lot)
+                    if current != key:
+                        heapq.heapreplace(stacks[t], (current, lot))
+                        continue
+                else:
+                    lot = head[t]
+                    if remaining[lot] <= EPS:
+                        head[t] += 1
+                        continue
+                q = min(qty, remaining[lot])
+                if lot in washed:
+                    rows += take(lot, q, day, sale_price, sell_fee)
+                else:
+                    remaining[lot] -= q
+                    rows.append([lot, day, q, q * (sale_price - sell_fee), q * lot_cost[lot],
+                                 0.0, lot_date[lot]])
+                qty -= q
+
+            realized.extend(rows)
+            losses = [row for row in rows if row[4] - row[3] > EPS]
+            if not losses:
+                continue
+
+            # Wash sales: match loss shares to purchases within +/- 30 days
+            sold_lots = {r[0] for r in rows}
+            lo = start + bisect_left(dates, day - WASH_WINDOW_DAYS)
+            hi = start + bisect_right(dates, day + WASH_WINDOW_DAYS)
+            for row in losses:
+                lot, _, q, proceeds, basis, _, hold_start = row
+                loss = basis - proceeds
+                per_share = loss / q
+                unmatched = q
+                i = next_candidate(lo, hi)
+                while unmatched > EPS and i < hi:
+                    if i in sold_lots:
+                        i = next_candidate(i + 1, hi)
+                        continue
+                    r = min(unmatched, capacity(i))
+                    # Replacement keeps the sold shares' holding period
+                    washed.setdefault(i, []).append([r, per_share, lot_date[i] - (day - hold_start)])
+                    washed_shares[i] += r
+                    washed_adj[i] += r * per_share
+                    unmatched -= r
+                    row[5] += r * per_share
+                    wash_events.append((lot, i, day, r, r * per_share))
+                    if hifo and i < available[t]:
+                        heapq.heappush(stacks[t], (hifo_key(i), i))
+                    i = next_candidate(i, hi)
+
+        self.lot_remaining = np.asarray(remaining)
+        self._washed = washed
+        self._realized = realized
+        self._wash_events = wash_events
+
+    # ------------------------------------------------------------------
+    # Reports
+    # ------------------------------------------------------------------
+
+    def _ticker_column(self, lots: np.ndarray) -> pd.Categorical:
+        return pd.Categorical.from_codes(self.lot_ticker[lots], categories=self._tickers)
+
+    def _dates(self, days) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(np.asarray(days, dtype=np.int64).astype("datetime64[D]"))
+
+    def realized(self) -> pd.DataFrame:
+        """
+        Realized gains, one row per lot (and holding term) sold from.
+
+        Returns:
+            DataFrame with Ticker, Lot, Acquired, Sold, Shares, Proceeds,
+            Cost Basis, Wash Sale Adj, Gain and Term ('ST' or 'LT').
+            Gain = Proceeds - Cost Basis + Wash Sale Adj (disallowed loss).
+        """
+        self._ensure()
+        if not self._realized:
+            return pd.DataFrame(columns=["Ticker", "Lot", "Acquired", "Sold", "Shares", "Proceeds",
+                                         "Cost Basis", "Wash Sale Adj", "Gain", "Term"])
+        lot, sold, shares, proceeds, basis, wash, hold = map(np.asarray, zip(*self._realized))
+        lot = lot.astype(np.int64)
+        held_days = sold - hold
+        return pd.DataFrame({
+            "Ticker": self._ticker_column(lot),
+            "Lot": self.lot_label[lot],
+            "Acquired": self._dates(self.lot_date[lot]),
+            "Sold": self._dates(sold),
+            "Shares": shares,
+            "Proceeds": proceeds,
+            "Cost Basis": basis,
+            "Wash Sale Adj": wash,
+            "Gain": proceeds - basis + wash,
+            "Term": np.where(held_days > LONG_TERM_DAYS, "LT", "ST"),
+        })
+
+    def wash_sales(self) -> pd.DataFrame:
+        """
+        Wash-sale adjustments made.
+
+        Returns:
+            DataFrame with Ticker, Sold Lot, Replacement Lot, Sale Date,
+            Shares and Disallowed Loss
+        """
+        self._ensure()
+        columns = ["Ticker", "Sold Lot", "Replacement Lot", "Sale Date", "Shares", "Disallowed Loss"]
+        if not self._wash_events:
+            return pd.DataFrame(columns=columns)
+        sold, replacement, day, shares, amount = map(np.asarray, zip(*self._wash_events))
+        return pd.DataFrame(dict(zip(columns, [
+            self._ticker_column(sold),
+            self.lot_label[sold],
+            self.lot_label[replacement],
+            self._dates(day),
+            shares,
+            amount,
+        ])))
+
+    def open_lots(self, prices: Optional[Union[dict, pd.Series]] = None) -> pd.DataFrame:
+        """
+        Lots still held.
+
+        Args:
+            prices: Optional current price per ticker, to add Market Value
+                and Unrealized Gain columns
+
+        Returns:
+            DataFrame with Ticker, Lot, Acquired, Shares, Cost/Share
+            (including wash-sale adjustments) and Cost Basis
+        """
+        self._ensure()
+        lots = np.flatnonzero(self.lot_remaining > EPS)
+        remaining = self.lot_remaining[lots]
+        adj = np.array([sum(w[0] * w[1] for w in self._washed.get(i, ())) for i in lots.tolist()])
+        basis = remaining * self.lot_cost[lots] + adj
+        df = pd.DataFrame({
+            "Ticker": self._ticker_column(lots),
+            "Lot": self.lot_label[lots],
+            "Acquired": self._dates(self.lot_date[lots]),
+            "Shares": remaining,
+            "Cost/Share": basis / remaining if len(lots) else basis,
+            "Cost Basis": basis,
+        })
+        if prices is not None:
+            df["Market Value"] = df["Ticker"].map(pd.Series(prices)) * df["Shares"]
+            df["Unrealized Gain"] = df["Market Value"] - df["Cost Basis"]
+        return df
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Realized gains per tax year.
+
+        Returns:
+            DataFrame indexed by year with Short-Term, Long-Term,
+            Disallowed Loss and Net columns
+        """
+        df = self.realized()
+        if df.empty:
+            return pd.DataFrame(columns=["Short-Term", "Long-Term", "Disallowed Loss", "Net"])
+        year = df["Sold"].dt.year.rename("Year")
+        gains = df.pivot_table(index=year, columns="Term", values="Gain", aggfunc="sum", fill_value=0.0)
+        out = pd.DataFrame({
+            "Short-Term": gains.get("ST", 0.0),
+            "Long-Term": gains.get("LT", 0.0),
+            "Disallowed Loss": df.groupby(year)["Wash Sale Adj"].sum(),
+        })
+        out["Net"] = out["Short-Term"] + out["Long-Term"]
+        return out
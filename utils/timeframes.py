@@ -0,0 +1,348 @@
+"""
+Timeframe Helpers for Money Talks
+
+Provides multi-timeframe bars derived from a single base series. Fetch the
+finest interval once (say 5m), then ask for 15m, 1h, 1d or 1wk bars without
+another network call.
+
+Bars are aggregated the way the exchange (and Yahoo) builds them: first
+Open, highest High, lowest Low, last Close and summed Volume. Intraday bars
+are aligned to the session open (9:30 ET), so hourly bars run 9:30-10:30,
+..., 15:30-16:00 and never straddle two sessions. Daily bars are one
+session, weekly bars start on Monday and monthly bars on the 1st.
+
+MultiTimeframe memoizes each derived timeframe and, when new base bars
+arrive, recomputes only the derived bars they touch.
+"""
+
+from typing import Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+
+# Minutes per bar for intraday intervals
+INTRADAY_MINUTES = {
+    "1m": 1, "2m": 2, "5m": 5, "15m": 15, "30m": 30, "60m": 60, "90m": 90, "1h": 60,
+}
+# Calendar intervals, finest first
+CALENDAR_INTERVALS = ("1d", "1wk", "1mo")
+
+SESSION_TZ = "America/New_York"
+SESSION_OPEN = "09:30"
+
+_DAY_NS = 86_400 * 10**9
+_MINUTE_NS = 60 * 10**9
+# Offset so pre-market bins (negative minutes from the open) sort before the session
+_BIN_OFFSET = 10_000
+
+
+def _rank(interval: str) -> float:
+    """Sort key: bar length in minutes (calendar intervals after all intraday ones)."""
+    if interval in INTRADAY_MINUTES:
+        return INTRADAY_MINUTES[interval]
+    if interval in CALENDAR_INTERVALS:
+        return 10**6 + CALENDAR_INTERVALS.index(interval)
+    raise ValueError(
+        f"Unknown interval: {interval}. Use one of: "
+        f"{', '.join(list(INTRADAY_MINUTES) + list(CALENDAR_INTERVALS))}"
+    )
+
+
+def can_derive(target: str, base: str) -> bool:
+    """True if ``target`` bars can be built exactly from ``base`` bars."""
+    if _rank(target) < _rank(base):
+        return False
+    if target in INTRADAY_MINUTES:
+        return INTRADAY_MINUTES[target] % INTRADAY_MINUTES[base] == 0
+    if target == "1mo" and base == "1wk":
+        return False            # weeks straddle month ends
+    return True
+
+
+def _wall_ns(index: pd.DatetimeIndex) -> np.ndarray:
+    """Local wall-clock time of each bar as int64 nanoseconds since 1970-01-01."""
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.as_unit("ns").asi8
+
+
+def _open_ns(session_open: str) -> int:
+    hours, minutes = (int(part) for part in session_open.split(":"))
+    return (hours * 60 + minutes) * _MINUTE_NS
+
+
+def _keys(wall: np.ndarray, interval: str, session_open: str) -> np.ndarray:
+    """Non-decreasing int64 group key of each bar for the target interval."""
+    day = wall // _DAY_NS
+    if interval in INTRADAY_MINUTES:
+        step = INTRADAY_MINUTES[interval] * _MINUTE_NS
+        minute_bin = (wall - day * _DAY_NS - _open_ns(session_open)) // step
+        return day * (2 * _BIN_OFFSET) + minute_bin + _BIN_OFFSET
+    if interval == "1d":
+        return day
+    if interval == "1wk":
+        return (day + 3) // 7           # 1970-01-01 was a Thursday; weeks start Monday
+    return wall.astype("M8[ns]").astype("M8[M]").astype(np.int64)
+
+
+def _labels(keys: np.ndarray, interval: str, session_open: str) -> np.ndarray:
+    """Wall-clock start time (int64 ns) of each group key."""
+    if interval in INTRADAY_MINUTES:
+        day, minute_bin = np.divmod(keys, 2 * _BIN_OFFSET)
+        step = INTRADAY_MINUTES[interval] * _MINUTE_NS
+        return day * _DAY_NS + _open_ns(session_open) + (minute_bin - _BIN_OFFSET) * step
+    if interval == "1d":
+        return keys * _DAY_NS
+    if interval == "1wk":
+        return (keys * 7 - 3) * _DAY_NS
+    return keys.astype("M8[M]").astype("M8[ns]").astype(np.int64)
+
+
+def _aggregate(df: pd.DataFrame, keys: np.ndarray) -> tuple[dict, np.ndarray]:
+    """Aggregate runs of equal keys; returns column arrays and the key of each run."""
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.array([], dtype=np.int64)
+    ends = np.append(starts[1:], len(keys)) - 1
+    out = {}
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if not len(starts):
+            out[col] = values[:0]
+        elif col == "Open":
+            out[col] = values[starts]
+        elif col == "High":
+            out[col] = np.fmax.reduceat(values.astype(np.float64), starts)
+        elif col == "Low":
+            out[col] = np.fmin.reduceat(values.astype(np.float64), starts)
+        elif col in ("Volume", "Dividends"):
+            out[col] = np.add.reduceat(np.nan_to_num(values.astype(np.float64)), starts)
+        elif col == "Stock Splits":
+            out[col] = np.fmax.reduceat(values.astype(np.float64), starts)
+        else:
+            out[col] = values[ends]
+    return out, keys[starts]
+
+
+def _frame(columns: dict, labels: np.ndarray, like: pd.DataFrame, interval: str) -> pd.DataFrame:
+    index = pd.DatetimeIndex(labels.astype("M8[ns]"))
+    if like.index.tz is not None:
+        index = index.tz_localize(like.index.tz, ambiguous="NaT", nonexistent="shift_forward")
+    index.name = "Datetime" if interval in INTRADAY_MINUTES else "Date"
+    return pd.DataFrame(columns, index=index)
+
+
+def resample_bars(
+    df: pd.DataFrame,
+    interval: str,
+    session_open: str = SESSION_OPEN,
+) -> pd.DataFrame:
+    """
+    Aggregate OHLCV bars to a coarser, session-aligned interval.
+
+    Timestamps are read as local exchange time (the index's own timezone,
+    or as-is for naive indexes), so this works on yfinance data and on the
+    tz-stripped frames the notebooks build.
+
+    Args:
+        df: OHLCV DataFrame sorted by time
+        interval: Target interval: 2m, 5m, 15m, 30m, 60m/1h, 90m, 1d, 1wk, 1mo
+        session_open: Local time intraday bins are aligned to
+
+    Returns:
+        OHLCV DataFrame at the target interval, labelled by bar start
+
+    Example:
+        >>> five = fetch_stock_data("SPY", period="60d", interval="5m")
+        >>> hourly = resample_bars(five, "1h")
+        >>> daily = resample_bars(five, "1d")
+    """
+    _rank(interval)
+    keys = _keys(_wall_ns(df.index), interval, session_open)
+    columns, group_keys = _aggregate(df, keys)
+    return _frame(columns, _labels(group_keys, interval, session_open), df, interval)
+
+
+class MultiTimeframe:
+    """
+    One base series plus memoized coarser timeframes derived from it.
+
+    Derived frames are built on first access and kept. ``update`` appends
+    new base bars and rebuilds only the derived bars from the first one the
+    new data touches, so streaming in a new 5m bar re-aggregates one hourly
+    and one daily bar, not the whole history.
+
+    Example:
+        >>> mtf = MultiTimeframe.fetch("AAPL", base_interval="5m", period="60d")
+        >>> hourly, daily = mtf["1h"], mtf["1d"]
+        >>> mtf.update(latest_bars)       # hourly/daily tails refresh lazily
+    """
+
+    def __init__(
+        self,
+        base: pd.DataFrame,
+        base_interval: str = "1m",
+        session_open: str = SESSION_OPEN,
+    ):
+        _rank(base_interval)
+        self.base_interval = base_interval
+        self.session_open = session_open
+        self._base = base.sort_index()
+        self._wall = _wall_ns(self._base.index)
+        # interval -> (derived frame, group key per derived row)
+        self._derived: dict[str, tuple[pd.DataFrame, np.ndarray]] = {}
+        # interval -> first base position whose derived bars are out of date
+        self._dirty: dict[str, int] = {}
+
+    @classmethod
+    def fetch(
+        cls,
+        ticker: str,
+        base_interval: str = "5m",
+        period: str = "60d",
+        **fetch_kwargs,
+    ) -> "MultiTimeframe":
+        """
+        Fetch the base series once with fetch_stock_data.
+
+        Yahoo serves 1m bars for the last 7 days and 2m-90m bars for the
+        last 60 days; use a daily base for longer histories.
+
+        Args:
+            ticker: Stock symbol
+            base_interval: Finest interval needed
+            period: History to fetch
+            **fetch_kwargs: Passed to fetch_stock_data (provider, use_cache, ...)
+        """
+        from .data_helpers import fetch_stock_data
+
+        df = fetch_stock_data(ticker, period=period, interval=base_interval, **fetch_kwargs)
+        return cls(df, base_interval)
+
+    @property
+    def base(self) -> pd.DataFrame:
+        """The base series."""
+        return self._base
+
+    def intervals(self) -> list[str]:
+        """Intervals that can be derived from the base interval."""
+        candidates = [i for i in INTRADAY_MINUTES if i != "1h"] + list(CALENDAR_INTERVALS)
+        return [i for i in candidates if can_derive(i, self.base_interval)]
+
+    def get(self, interval: str) -> pd.DataFrame:
+        """
+        Bars at an interval, built from the base series on first use.
+
+        Args:
+            interval: Target interval (the base interval returns the base)
+
+        Returns:
+            OHLCV DataFrame
+        """
+        if interval == self.base_interval or (
+            INTRADAY_MINUTES.get(interval, 0) == INTRADAY_MINUTES.get(self.base_interval, -1)
+        ):
+            return self._base
+        if not can_derive(interval, self.base_interval):
+            raise ValueError(
+                f"Cannot build {interval} bars from {self.base_interval} bars. "
+                f"Use one of: {', '.join(self.intervals())}"
+            )
+
+        if interval not in self._derived:
+            keys = _keys(self._wall, interval, self.session_open)
+            columns, group_keys = _aggregate(self._base, keys)
+            frame = _frame(columns, _labels(group_keys, interval, self.session_open), self._base, interval)
+            self._derived[interval] = (frame, group_keys)
+        elif interval in self._dirty:
+            self._refresh(interval, self._dirty.pop(interval))
+        self._dirty.pop(interval, None)
+        return self._derived[interval][0]
+
+    __getitem__ = get
+
+    def _refresh(self, interval: str, first_changed: int) -> None:
+        """Rebuild derived bars from the group containing base row ``first_changed``."""
+        frame, group_keys = self._derived[interval]
+        if first_changed >= len(self._base):
+            return
+        key = _keys(self._wall[first_changed:first_changed + 1], interval, self.session_open)[0]
+        keep = int(np.searchsorted(group_keys, key, "left"))
+        # Base rows of the first affected group begin at its label (bar start)
+        first_label = _labels(np.array([key]), interval, self.session_open)[0]
+        start = int(np.searchsorted(self._wall, first_label, "left"))
+        tail = self._base.iloc[start:]
+        keys = _keys(self._wall[start:], interval, self.session_open)
+        columns, new_keys = _aggregate(tail, keys)
+        new_frame = _frame(columns, _labels(new_keys, interval, self.session_open), self._base, interval)
+        self._derived[interval] = (
+            pd.concat([frame.iloc[:keep], new_frame]),
+            np.concatenate([group_keys[:keep], new_keys]),
+        )
+
+    def update(self, bars: pd.DataFrame) -> None:
+        """
+        Add new (or corrected) base bars.
+
+        Bars with timestamps already in the base replace the old ones.
+        Derived timeframes are marked stale from the first changed bar and
+        rebuilt from there on their next access.
+
+        Args:
+            bars: OHLCV DataFrame at the base interval
+        """
+        if bars.empty:
+            return
+        bars = bars.sort_index()
+        first = bars.index[0]
+        position = int(self._base.index.searchsorted(first, "left"))
+        if position == len(self._base):
+            self._base = pd.concat([self._base, bars])
+        else:
+            old = self._base
+            merged = pd.concat([old[~old.index.isin(bars.index)], bars]).sort_index()
+            self._base = merged
+        self._wall = _wall_ns(self._base.index)
+        for interval in self._derived:
+            self._dirty[interval] = min(self._dirty.get(interval, position), position)
+
+    def invalidate(self, intervals: Optional[Iterable[str]] = None) -> None:
+        """Drop memoized frames (all of them by default)."""
+        for interval in list(self._derived if intervals is None else intervals):
+            self._derived.pop(interval, None)
+            self._dirty.pop(interval, None)
+
+    def __repr__(self) -> str:
+        return (
+            f"MultiTimeframe(base={self.base_interval}, {len(self._base)} bars, "
+            f"cached={sorted(self._derived, key=_rank)})"
+        )
+
+
+def fetch_timeframes(
+    ticker: str,
+    intervals: Iterable[str] = ("1d", "1wk"),
+    period: str = "1y",
+    base_interval: Optional[str] = None,
+    **fetch_kwargs,
+) -> dict[str, pd.DataFrame]:
+    """
+    Several timeframes of one ticker from a single fetch.
+
+    Args:
+        ticker: Stock symbol
+        intervals: Timeframes wanted
+        period: History to fetch
+        base_interval: Interval to fetch (default: the finest one requested)
+        **fetch_kwargs: Passed to fetch_stock_data
+
+    Returns:
+        Dictionary mapping interval to OHLCV DataFrame
+
+    Example:
+        >>> tf = fetch_timeframes("AAPL", ["1d", "1wk"], period="1y")
+        >>> get_trend(tf["1d"]) == get_trend(tf["1wk"])
+    """
+    intervals = list(intervals)
+    base_interval = base_interval or min(intervals, key=_rank)
+    mtf = MultiTimeframe.fetch(ticker, base_interval, period, **fetch_kwargs)
+    return {interval: mtf[interval] for interval in intervals}